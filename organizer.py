@@ -8,23 +8,181 @@ Autor: SavioCodes - https://github.com/SavioCodes
 Licença: MIT
 """
 
+import io
 import os
+import sys
+import errno
 import shutil
 import datetime
 from pathlib import Path
 import logging
-from typing import Dict, List, Tuple, Optional, Callable
+from typing import AsyncIterator, Dict, List, Tuple, Optional, Callable
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import threading
 import json
 import hashlib
 import mimetypes
-from dataclasses import dataclass, asdict
+import random
+import re
+import sqlite3
+import stat as stat_module
+import string
+import struct
+import time
+import bisect
+import fnmatch
+from dataclasses import dataclass, fields
 from enum import Enum
 import asyncio
 import concurrent.futures
-from collections import defaultdict
+import zlib
+import heapq
+from abc import ABC, abstractmethod
+import itertools
+import queue
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import psutil  # opcional: prioridade de I/O no modo segundo plano
+except ImportError:
+    psutil = None
+
+
+# Políticas de duplicatas: "hardlink"/"reflink" mantêm a duplicata no destino
+# compartilhando os dados com a cópia já organizada
+DUPLICATE_POLICIES = ["rename", "skip", "replace", "hardlink", "reflink"]
+
+# Durabilidade dos movimentos: "none" não sincroniza nada, "batched" agrupa os
+# fsyncs em checkpoints e "strict" sincroniza cada arquivo antes do próximo
+DURABILITY_MODES = ["none", "batched", "strict"]
+
+# ioctl(FICLONE) do Linux: clone copy-on-write (btrfs, XFS, bcachefs...)
+FICLONE = 0x40049409
+
+# Leitura em blocos de 1 MiB: o hashlib libera o GIL durante o update
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bytes iniciais usados na detecção de tipo por conteúdo
+SNIFF_SIZE = 4096
+
+# Ordem de despacho: "destination" agrupa os arquivos por pasta de destino
+# e "destination_source" também pela pasta de origem; cada lote vai inteiro
+# para um worker
+LOCALITY_MODES = ["none", "destination", "destination_source"]
+LOCALITY_BATCH_SIZE = 32
+
+# Escalonamento por tamanho: "largest_first" despacha primeiro os lotes com
+# mais bytes (arquivos grandes isolados) e reserva uma faixa rápida de
+# workers que consome os lotes menores pelo outro lado da fila
+SCHEDULING_POLICIES = ["fifo", "largest_first"]
+
+# Arquivos a partir deste tamanho têm a leitura feita em uma thread à frente
+# do MD5 (o MD5 é sequencial; o que dá para paralelizar é leitura × hash)
+PIPELINED_HASH_SIZE = 64 * 1024 * 1024
+PIPELINE_DEPTH = 4
+
+# Nice aplicado no modo segundo plano; sem prioridade de I/O explícita o
+# agendador de disco do Linux deriva a dela do nice (19 → a mais baixa)
+BACKGROUND_NICE = 19
+
+# Código de saída da CLI quando operações presas ficaram para trás
+STUCK_EXIT_CODE = 3
+
+# Assinaturas (magic bytes) em ordem de prioridade: (regex no início do arquivo, MIME, categoria)
+MAGIC_SIGNATURES = [
+    (rb'%PDF-', 'application/pdf', 'documentos'),
+    (rb'\{\\rtf', 'application/rtf', 'documentos'),
+    (rb'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/x-ole-storage', 'documentos'),
+    (rb'PK\x03\x04.{26}mimetypeapplication/epub\+zip', 'application/epub+zip', 'ebooks'),
+    (rb'PK\x03\x04.{26}\[Content_Types\]\.xml', 'application/vnd.openxmlformats', 'documentos'),
+    (rb'PK\x03\x04', 'application/zip', 'compactados'),
+    (rb'\x89PNG\r\n\x1a\n', 'image/png', 'imagens'),
+    (rb'\xff\xd8\xff', 'image/jpeg', 'imagens'),
+    (rb'GIF8[79]a', 'image/gif', 'imagens'),
+    (rb'RIFF.{4}WEBP', 'image/webp', 'imagens'),
+    (rb'II\*\x00|MM\x00\*', 'image/tiff', 'imagens'),
+    (rb'BM.{4}\x00\x00\x00\x00', 'image/bmp', 'imagens'),
+    (rb'.{4}ftyp(?:heic|heix|mif1|msf1)', 'image/heic', 'imagens'),
+    (rb'.{4}ftypavif', 'image/avif', 'imagens'),
+    (rb'.{4}ftypM4A ', 'audio/mp4', 'audios'),
+    (rb'.{4}ftypqt  ', 'video/quicktime', 'videos'),
+    (rb'.{4}ftyp', 'video/mp4', 'videos'),
+    (rb'\x1a\x45\xdf\xa3', 'video/x-matroska', 'videos'),
+    (rb'RIFF.{4}AVI ', 'video/x-msvideo', 'videos'),
+    (rb'\x00\x00\x01[\xb3\xba]', 'video/mpeg', 'videos'),
+    (rb'RIFF.{4}WAVE', 'audio/wav', 'audios'),
+    (rb'ID3|\xff[\xfb\xf3\xf2]', 'audio/mpeg', 'audios'),
+    (rb'fLaC', 'audio/flac', 'audios'),
+    (rb'OggS', 'audio/ogg', 'audios'),
+    (rb'Rar!\x1a\x07', 'application/vnd.rar', 'compactados'),
+    (rb"7z\xbc\xaf\x27\x1c", 'application/x-7z-compressed', 'compactados'),
+    (rb'\x1f\x8b', 'application/gzip', 'compactados'),
+    (rb'BZh[1-9]', 'application/x-bzip2', 'compactados'),
+    (rb'\xfd7zXZ\x00', 'application/x-xz', 'compactados'),
+    (rb'\x28\xb5\x2f\xfd', 'application/zstd', 'compactados'),
+    (rb'.{257}ustar', 'application/x-tar', 'compactados'),
+    (rb'!<arch>\ndebian', 'application/vnd.debian.binary-package', 'executaveis'),
+    (rb'\x7fELF', 'application/x-executable', 'executaveis'),
+    (rb'MZ', 'application/x-msdownload', 'executaveis'),
+    (rb'\xcf\xfa\xed\xfe|\xce\xfa\xed\xfe|\xca\xfe\xba\xbe', 'application/x-mach-binary', 'executaveis'),
+    (rb'wOFF|wOF2', 'font/woff', 'fontes'),
+    (rb'\x00\x01\x00\x00\x00|OTTO|true\x00', 'font/ttf', 'fontes'),
+    (rb'#!', 'text/x-script', 'codigo'),
+    (rb'\s*<\?xml', 'application/xml', 'codigo'),
+    (rb'\s*(?i:<!doctype html|<html)', 'text/html', 'codigo'),
+]
+
+# Tabela compilada em uma única regex: cada assinatura vira um grupo nomeado
+# e a primeira alternativa que casar determina o tipo
+_MAGIC_REGEX = re.compile(
+    b"|".join(b"(?P<s%d>%s)" % (i, pattern) for i, (pattern, _, _) in enumerate(MAGIC_SIGNATURES)),
+    re.DOTALL
+)
+
+# Assinaturas curtas demais para contrariar uma extensão: só valem para arquivos sem extensão
+EXTENSIONLESS_ONLY_TYPES = {'application/x-msdownload', 'text/x-script'}
+
+
+def sniff_content_type(head: bytes, extensionless: bool = True) -> Optional[Tuple[str, str]]:
+    """
+    Detecta o tipo de um arquivo pelos bytes iniciais.
+    
+    Args:
+        head: Primeiros bytes do arquivo (até ``SNIFF_SIZE``)
+        extensionless: Se o arquivo não tem extensão; do contrário as
+            assinaturas de ``EXTENSIONLESS_ONLY_TYPES`` são ignoradas
+        
+    Returns:
+        Optional[Tuple[str, str]]: (MIME type, categoria) ou None se desconhecido
+    """
+    if not head:
+        return None
+    
+    match = _MAGIC_REGEX.match(head)
+    if match is not None:
+        _, mime_type, category = MAGIC_SIGNATURES[int(match.lastgroup[1:])]
+        if extensionless or mime_type not in EXTENSIONLESS_ONLY_TYPES:
+            return mime_type, category
+        return None
+    
+    # Sem assinatura: texto puro se não houver bytes nulos e for UTF-8 válido
+    if b"\x00" not in head:
+        try:
+            head.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # O corte em SNIFF_SIZE pode partir um caractere multibyte
+            if e.start < len(head) - 3:
+                return None
+        return 'text/plain', 'documentos'
+    
+    return None
 
 
 class OrganizationMode(Enum):
@@ -35,17 +193,86 @@ class OrganizationMode(Enum):
     BY_SIZE = "por_tamanho"
 
 
-@dataclass
 class FileInfo:
-    """Informações detalhadas de um arquivo."""
-    path: Path
-    size: int
-    created_date: datetime.datetime
-    modified_date: datetime.datetime
-    extension: str
-    mime_type: str
-    hash_md5: Optional[str] = None
-    category: Optional[str] = None
+    """
+    Informações de um arquivo em representação compacta.
+    
+    Guarda apenas valores brutos — caminho como ``str``, tamanho, timestamps
+    em ``float`` e extensão internada — com ``__slots__``, sem ``__dict__``.
+    ``path``, ``created_date``, ``modified_date`` e ``mime_type`` são
+    montados sob demanda a cada acesso, de modo que uma varredura de milhões
+    de arquivos não cria um ``Path``, dois ``datetime`` e uma string MIME por
+    arquivo. O construtor aceita os mesmos argumentos da antiga dataclass.
+    """
+    
+    __slots__ = ('path_str', 'size', 'ctime', 'mtime', 'extension', '_mime_type', 'hash_md5', 'category',
+                 'target_path')
+    
+    def __init__(self, path, size: int, created_date, modified_date, extension: str,
+                 mime_type: Optional[str] = None, hash_md5: Optional[str] = None,
+                 category: Optional[str] = None):
+        self.path_str = os.fspath(path)
+        self.size = size
+        self.ctime = created_date.timestamp() if isinstance(created_date, datetime.datetime) else created_date
+        self.mtime = modified_date.timestamp() if isinstance(modified_date, datetime.datetime) else modified_date
+        self.extension = sys.intern(extension)
+        self._mime_type = mime_type
+        self.hash_md5 = hash_md5
+        self.category = category
+        self.target_path: Optional[Path] = None  # Caminho final no destino, após organizado
+    
+    @classmethod
+    def from_stat(cls, path: str, stat: os.stat_result) -> 'FileInfo':
+        """Cria o registro direto de um ``stat`` (sem ``Path`` nem ``datetime``)."""
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.':  # "arquivo." não tem extensão (mesma regra de Path.suffix)
+            extension = ''
+        return cls(path, stat.st_size, stat.st_ctime, stat.st_mtime, extension)
+    
+    @property
+    def path(self) -> Path:
+        return Path(self.path_str)
+    
+    @path.setter
+    def path(self, value):
+        self.path_str = os.fspath(value)
+    
+    @property
+    def name(self) -> str:
+        """Nome do arquivo (equivale a ``path.name``, sem criar o ``Path``)."""
+        return os.path.basename(self.path_str)
+    
+    @property
+    def created_date(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.ctime)
+    
+    @created_date.setter
+    def created_date(self, value: datetime.datetime):
+        self.ctime = value.timestamp()
+    
+    @property
+    def modified_date(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.mtime)
+    
+    @modified_date.setter
+    def modified_date(self, value: datetime.datetime):
+        self.mtime = value.timestamp()
+    
+    @property
+    def mime_type(self) -> str:
+        """MIME type deduzido do nome (calculado no primeiro uso)."""
+        if self._mime_type is None:
+            mime_type, _ = mimetypes.guess_type(self.path_str)
+            self._mime_type = mime_type or "application/octet-stream"
+        return self._mime_type
+    
+    @mime_type.setter
+    def mime_type(self, value: str):
+        self._mime_type = value
+    
+    def __repr__(self) -> str:
+        return (f"FileInfo(path={self.path_str!r}, size={self.size}, extension={self.extension!r}, "
+                f"hash_md5={self.hash_md5!r}, category={self.category!r})")
 
 
 @dataclass
@@ -59,393 +286,4157 @@ class OrganizationStats:
     total_size: int = 0
     categories: Dict[str, int] = None
     processing_time: float = 0.0
+    pruned_directories: int = 0  # Pastas inalteradas puladas pela varredura incremental
+    retried_files: int = 0  # Novas tentativas de arquivos que pararam de responder
+    stalled_files: List[str] = None  # Arquivos ainda presos no fim da execução
     
     def __post_init__(self):
         if self.categories is None:
             self.categories = defaultdict(int)
+        if self.stalled_files is None:
+            self.stalled_files = []
+    
+    def to_dict(self) -> Dict:
+        """Converte para dict serializável (``asdict`` não suporta defaultdict)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['categories'] = dict(self.categories)
+        return data
 
 
-class SmartFileOrganizer:
+@dataclass
+class ProgressEvent:
+    """Evento de progresso emitido por ``organize_files_async``."""
+    kind: str  # "scan", "file" ou "done"
+    processed: int = 0
+    total: int = 0
+    message: str = ""
+    success: bool = True
+    path: Optional[Path] = None
+    stats: Optional[OrganizationStats] = None
+    
+    @property
+    def progress(self) -> float:
+        """Percentual concluído (0-100)."""
+        if self.kind == "done":
+            return 100.0
+        return self.processed / self.total * 100 if self.total else 0.0
+
+
+@dataclass
+class FileEvent:
+    """Resultado de um arquivo, publicado pelos workers no ``EventRingBuffer``."""
+    name: str
+    category: str
+    size: int
+    duration: float  # segundos gastos em process_single_file
+    success: bool
+    message: str
+    timestamp: float = 0.0  # time.monotonic() ao terminar
+    sequence: int = 0  # atribuído pelo EventRingBuffer
+
+
+class EventRingBuffer:
     """
-    Organizador de arquivos inteligente com recursos avançados.
-    Versão 2025 com melhorias em performance, segurança e usabilidade.
+    Buffer circular limitado de ``FileEvent`` entre os workers e a interface.
+    
+    Os workers só fazem ``append`` em um ``deque(maxlen=...)`` e nunca
+    esperam pelo leitor: se a interface atrasar, os eventos mais antigos são
+    descartados. O leitor esvazia o buffer periodicamente com ``drain``; cada
+    evento leva um número de sequência, de modo que o leitor sabe quantos
+    foram publicados (e quantos se perderam) mesmo com descartes. Numerar e
+    inserir acontecem sob um lock curto, para que o buffer fique sempre em
+    ordem de sequência.
+    """
+    
+    def __init__(self, capacity: int = 8192):
+        self.capacity = capacity
+        self._events: deque = deque(maxlen=capacity)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def append(self, event: FileEvent):
+        """Publica um evento (chamado pelos workers)."""
+        # Cada operação é atômica, mas o par não: sem o lock um evento de
+        # sequência menor poderia entrar depois de um de sequência maior
+        with self._lock:
+            event.sequence = next(self._counter)
+            self._events.append(event)
+    
+    def drain(self, limit: Optional[int] = None) -> List[FileEvent]:
+        """Retira os eventos pendentes (chamado pelo leitor)."""
+        events = []
+        popleft = self._events.popleft
+        while limit is None or len(events) < limit:
+            try:
+                events.append(popleft())
+            except IndexError:
+                break
+        return events
+
+
+class ThroughputMonitor:
+    """
+    Agrega os eventos do ``EventRingBuffer`` para o painel ao vivo.
+    
+    Não depende de Tk: ``poll`` é chamado pelo laço da interface a
+    intervalos fixos e mantém arquivos/s e MB/s em uma janela deslizante,
+    contagem por categoria, as operações mais lentas e os erros recentes.
+    """
+    
+    def __init__(self, buffer: EventRingBuffer, window: float = 5.0,
+                 slowest: int = 5, recent_errors: int = 10):
+        self.buffer = buffer
+        self.window = window
+        self.slowest_limit = slowest
+        self.categories: Dict[str, int] = defaultdict(int)
+        self.errors: deque = deque(maxlen=recent_errors)
+        self.slowest: List[Tuple[float, str]] = []  # heap mínimo com as N mais lentas
+        self.processed = 0
+        self.bytes = 0
+        self.dropped = 0
+        self._seen = 0  # maior sequência já consumida
+        self._samples: deque = deque()  # (instante, arquivos, bytes) por poll
+    
+    def poll(self, now: Optional[float] = None) -> List[FileEvent]:
+        """Consome os eventos pendentes e atualiza os agregados."""
+        now = time.monotonic() if now is None else now
+        events = self.buffer.drain()
+        files = 0
+        if events:
+            last = max(event.sequence for event in events)
+            files = max(0, last - self._seen)
+            self._seen = max(self._seen, last)
+            self.dropped += max(0, files - len(events))
+        
+        size = 0
+        for event in events:
+            size += event.size
+            if event.success:
+                self.categories[event.category] += 1
+            elif "Duplicata" not in event.message:
+                self.errors.append(event.message)
+            entry = (event.duration, event.name)
+            if len(self.slowest) < self.slowest_limit:
+                heapq.heappush(self.slowest, entry)
+            elif entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+        
+        self.processed += files
+        self.bytes += size
+        self._samples.append((now, files, size))
+        while self._samples and self._samples[0][0] < now - self.window:
+            self._samples.popleft()
+        return events
+    
+    def rates(self) -> Tuple[float, float]:
+        """(arquivos/s, bytes/s) na janela deslizante."""
+        if len(self._samples) < 2:
+            return 0.0, 0.0
+        span = self._samples[-1][0] - self._samples[0][0]
+        if span <= 0:
+            return 0.0, 0.0
+        # A primeira amostra marca o início da janela; o que ela trouxe é anterior
+        files = sum(sample[1] for sample in self._samples) - self._samples[0][1]
+        size = sum(sample[2] for sample in self._samples) - self._samples[0][2]
+        return files / span, size / span
+    
+    def slowest_operations(self) -> List[Tuple[float, str]]:
+        """Operações mais lentas vistas até agora, da mais lenta para a mais rápida."""
+        return sorted(self.slowest, reverse=True)
+
+
+class TokenBucket:
+    """
+    Balde de fichas thread-safe que limita uma taxa (bytes/s ou operações/s).
+    
+    ``consume`` retira as fichas na hora, mesmo que o saldo fique negativo,
+    e dorme fora do lock o tempo necessário para pagar a dívida: pedidos
+    maiores que a rajada não travam o balde e a taxa média é respeitada.
     """
     
-    def __init__(self, config_file: Optional[str] = None):
+    def __init__(self, rate: float, burst: Optional[float] = None):
         """
-        Inicializa o organizador com configurações avançadas.
+        Args:
+            rate: Fichas repostas por segundo
+            burst: Saldo máximo acumulado (padrão: um segundo de ``rate``)
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def consume(self, amount: float = 1.0) -> float:
+        """Retira ``amount`` fichas, esperando se preciso; devolve o tempo dormido."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class IOThrottle:
+    """
+    Limites de I/O de uma execução: bytes/s, operações/s e recuo por latência.
+    
+    Leituras de hash e cópias consomem bytes; renomeações, vínculos e
+    aberturas para leitura consomem operações. Com ``latency_threshold``
+    (modo segundo plano) o número de arquivos em andamento é ajustado em
+    AIMD: quando a média móvel da latência observada passa do limite ele
+    cai pela metade, e enquanto fica abaixo volta a subir aos poucos.
+    """
+    
+    BACKOFF_INTERVAL = 1.0  # no máximo um recuo por segundo: a média demora a reagir
+    LATENCY_SMOOTHING = 0.2
+    
+    def __init__(self, bytes_per_second: float = 0, operations_per_second: float = 0,
+                 max_concurrency: int = 32, latency_threshold: Optional[float] = None):
+        """
+        Args:
+            bytes_per_second: Banda máxima de leitura/cópia (0 = sem limite)
+            operations_per_second: Operações de arquivo por segundo (0 = sem limite)
+            max_concurrency: Arquivos simultâneos quando não há recuo
+            latency_threshold: Latência (s) acima da qual a concorrência recua
+        """
+        self.bytes = TokenBucket(bytes_per_second) if bytes_per_second > 0 else None
+        self.operations = TokenBucket(operations_per_second) if operations_per_second > 0 else None
+        self.latency_threshold = latency_threshold
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = float(self.max_concurrency)
+        self.latency = 0.0
+        self.backoffs = 0
+        self._active = 0
+        self._last_backoff = 0.0
+        self._condition = threading.Condition()
+    
+    def operation(self):
+        """Conta uma operação de arquivo no limite de operações/s."""
+        if self.operations is not None:
+            self.operations.consume()
+    
+    def account(self, nbytes: int, seconds: float):
+        """Conta ``nbytes`` transferidos em ``seconds`` no limite de banda e na latência."""
+        if self.bytes is not None:
+            self.bytes.consume(nbytes)
+        # Latência por MiB: um bloco grande não é, por si só, sinal de disco saturado
+        self.observe(seconds * HASH_CHUNK_SIZE / max(nbytes, HASH_CHUNK_SIZE))
+    
+    def chunk_size(self, chunk_size: int) -> int:
+        """Limita o bloco de cópia a ~0,1 s de banda para que o ritmo fique uniforme."""
+        if self.bytes is None:
+            return chunk_size
+        return max(64 * 1024, min(chunk_size, int(self.bytes.rate / 10)))
+    
+    def observe(self, seconds: float):
+        """Registra a latência de uma operação e ajusta a concorrência (AIMD)."""
+        if self.latency_threshold is None:
+            return
+        with self._condition:
+            self.latency += self.LATENCY_SMOOTHING * (seconds - self.latency)
+            if self.latency > self.latency_threshold:
+                now = time.monotonic()
+                if self.concurrency > 1 and now - self._last_backoff >= self.BACKOFF_INTERVAL:
+                    self.concurrency = max(1.0, self.concurrency / 2)
+                    self._last_backoff = now
+                    self.backoffs += 1
+            elif self.concurrency < self.max_concurrency:
+                self.concurrency = min(float(self.max_concurrency),
+                                       self.concurrency + 1 / self.concurrency)
+                self._condition.notify()
+    
+    @contextmanager
+    def slot(self):
+        """Reserva uma vaga de arquivo em andamento (só limita no modo adaptativo)."""
+        if self.latency_threshold is None:
+            yield
+            return
+        with self._condition:
+            while self._active >= int(self.concurrency):
+                self._condition.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify()
+
+
+_background_priority_applied = False
+
+
+def lower_process_priority() -> List[str]:
+    """
+    Baixa a prioridade de CPU e de I/O do processo (uma única vez).
+    
+    O nice vale em qualquer Unix; com ``psutil`` instalado a prioridade de
+    I/O também é rebaixada explicitamente (classe *idle* no Linux, muito
+    baixa no Windows). Processos filhos herdam as duas. A mudança dura até o
+    fim do processo, por isso só é aplicada quando o organizador é o próprio
+    aplicativo (CLI/GUI), nunca no modo embutido.
+    
+    Returns:
+        List[str]: Descrição do que foi aplicado (vazia se nada foi possível)
+    """
+    global _background_priority_applied
+    if _background_priority_applied:
+        return []
+    _background_priority_applied = True
+    
+    applied = []
+    if hasattr(os, "nice"):
+        try:
+            current = os.nice(0)
+            if current < BACKGROUND_NICE:
+                os.nice(BACKGROUND_NICE - current)
+            applied.append(f"nice {BACKGROUND_NICE}")
+        except OSError:
+            pass
+    
+    if psutil is not None:
+        try:
+            process = psutil.Process()
+            if sys.platform.startswith("linux"):
+                process.ionice(psutil.IOPRIO_CLASS_IDLE)
+                applied.append("I/O idle")
+            elif sys.platform == "win32":
+                process.nice(psutil.IDLE_PRIORITY_CLASS)
+                process.ionice(psutil.IOPRIO_VERYLOW)
+                applied.append("CPU/I/O muito baixa")
+        except (psutil.Error, OSError, AttributeError):
+            pass
+    
+    return applied
+
+
+class DurabilityManager:
+    """
+    Agrupa os fsyncs que tornam os movimentos duráveis (modos de ``DURABILITY_MODES``).
+    
+    Um ``rename`` só sobrevive a uma queda de energia depois do fsync dos
+    diretórios envolvidos, e uma cópia entre discos só depois do fsync dos
+    dados. No modo ``strict`` isso é feito a cada arquivo; no ``batched`` os
+    diretórios (de destino e de origem) e os arquivos copiados são marcados
+    como sujos e sincronizados juntos em checkpoints — a cada
+    ``checkpoint_operations`` arquivos, ``checkpoint_seconds`` segundos ou no
+    fim da execução. Nesse modo a remoção da origem de cópias e vínculos é
+    adiada até o checkpoint que tornou o destino durável: uma queda no meio
+    pode deixar o arquivo nos dois lugares, nunca em nenhum.
+    """
+    
+    def __init__(self, mode: str = "batched", checkpoint_operations: int = 512,
+                 checkpoint_seconds: float = 5.0, logger: Optional[logging.Logger] = None):
+        if mode not in DURABILITY_MODES or mode == "none":
+            raise ValueError(f"Modo de durabilidade inválido: {mode}")
+        self.mode = mode
+        self.checkpoint_operations = checkpoint_operations
+        self.checkpoint_seconds = checkpoint_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.fsyncs = 0
+        self.checkpoints = 0
+        self._dirty_dirs: set = set()
+        self._dirty_files: set = set()
+        self._deferred_unlinks: List[Path] = []
+        self._operations = 0
+        self._last_checkpoint = time.monotonic()
+        self._closed = False
+        self._lock = threading.Lock()
+        # Serializa os checkpoints: uma origem só é removida depois que o
+        # checkpoint que contém o seu destino terminou
+        self._checkpoint_lock = threading.Lock()
+    
+    @property
+    def strict(self) -> bool:
+        return self.mode == "strict"
+    
+    def placed(self, target: Path, source: Optional[Path] = None, data_written: bool = False):
+        """
+        Registra um arquivo colocado no destino.
         
         Args:
-            config_file: Arquivo de configuração personalizada (JSON)
+            target: Caminho final no destino
+            source: Origem de um ``rename`` (o diretório dela também muda)
+            data_written: O conteúdo foi gravado (cópia/clone) e não só renomeado
         """
-        self.version = "2.0.0"
-        self.year = 2025
+        directories = {os.path.dirname(os.fspath(target))}
+        if source is not None:
+            directories.add(os.path.dirname(os.fspath(source)))
         
-        # Configurações padrão expandidas para 2025
-        self.file_categories = {
-            'documentos': {
-                'extensions': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', 
-                              '.xlsx', '.ppt', '.pptx', '.csv', '.ods', '.odp', '.pages',
-                              '.numbers', '.key', '.epub', '.mobi'],
-                'icon': '📄',
-                'description': 'Documentos e planilhas'
-            },
-            'imagens': {
-                'extensions': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', 
-                              '.webp', '.ico', '.raw', '.psd', '.ai', '.sketch', '.fig',
-                              '.heic', '.heif', '.avif', '.jxl'],
-                'icon': '🖼️',
-                'description': 'Imagens e gráficos'
-            },
-            'videos': {
-                'extensions': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', 
-                              '.m4v', '.3gp', '.mpg', '.mpeg', '.ogv', '.f4v', '.asf',
-                              '.m2ts', '.mts', '.vob'],
-                'icon': '🎬',
-                'description': 'Vídeos e filmes'
-            },
-            'audios': {
-                'extensions': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', 
-                              '.opus', '.aiff', '.alac', '.ape', '.dsd', '.pcm'],
-                'icon': '🎵',
-                'description': 'Áudios e música'
-            },
-            'compactados': {
-                'extensions': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', 
-                              '.tar.gz', '.tar.bz2', '.tar.xz', '.lzma', '.zst'],
-                'icon': '📦',
-                'description': 'Arquivos compactados'
-            },
-            'executaveis': {
-                'extensions': ['.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg', '.appimage',
-                              '.snap', '.flatpak', '.app', '.run'],
-                'icon': '⚙️',
-                'description': 'Programas executáveis'
-            },
-            'codigo': {
-                'extensions': ['.py', '.js', '.ts', '.html', '.css', '.php', '.java', '.cpp', 
-                              '.c', '.h', '.json', '.xml', '.sql', '.sh', '.bat', '.ps1',
-                              '.go', '.rs', '.swift', '.kt', '.dart', '.vue', '.jsx', '.tsx'],
-                'icon': '💻',
-                'description': 'Código fonte'
-            },
-            'fontes': {
-                'extensions': ['.ttf', '.otf', '.woff', '.woff2', '.eot', '.fon', '.pfb', '.pfm'],
-                'icon': '🔤',
-                'description': 'Arquivos de fonte'
-            },
-            'ebooks': {
-                'extensions': ['.epub', '.mobi', '.azw', '.azw3', '.fb2', '.lit', '.pdb'],
-                'icon': '📚',
-                'description': 'Livros eletrônicos'
-            },
-            'outros': {
-                'extensions': [],
-                'icon': '📋',
-                'description': 'Outros arquivos'
-            }
-        }
+        if not self.strict:
+            with self._lock:
+                closed = self._closed
+                if not closed:
+                    self._dirty_dirs.update(directories)
+                    if data_written:
+                        self._dirty_files.add(os.fspath(target))
+                    self._operations += 1
+            if not closed:
+                self._maybe_checkpoint()
+                return
+            # Depois de ``close`` não há mais checkpoint: sincroniza na hora
+            if data_written:
+                self._fsync_file(os.fspath(target))
         
-        self.organization_mode = OrganizationMode.BY_TYPE_AND_DATE
-        self.duplicate_handling = "rename"  # "rename", "skip", "replace"
-        self.max_workers = min(32, (os.cpu_count() or 1) + 4)
+        # Os dados de cópias estritas já foram sincronizados antes do replace
+        for directory in directories:
+            self._fsync_directory(directory)
+    
+    def remove_source(self, source: Path):
+        """Remove a origem de um arquivo que já foi colocado no destino com ``placed``."""
+        if not self.strict:
+            with self._lock:
+                if not self._closed:
+                    self._deferred_unlinks.append(Path(source))
+                    return
+        os.unlink(source)
+        self._fsync_directory(os.path.dirname(os.fspath(source)))
+    
+    def _maybe_checkpoint(self):
+        with self._lock:
+            due = (self._operations >= self.checkpoint_operations
+                   or time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds)
+        if due:
+            self.checkpoint()
+    
+    def checkpoint(self):
+        """Sincroniza tudo o que está sujo e então remove as origens adiadas."""
+        with self._checkpoint_lock:
+            with self._lock:
+                files, self._dirty_files = self._dirty_files, set()
+                directories, self._dirty_dirs = self._dirty_dirs, set()
+                unlinks, self._deferred_unlinks = self._deferred_unlinks, []
+                self._operations = 0
+                self._last_checkpoint = time.monotonic()
+            if not (files or directories or unlinks):
+                return
+            
+            synced = all([self._fsync_file(path) for path in files] +
+                          [self._fsync_directory(directory) for directory in directories])
+            if not synced and unlinks:
+                # Destino possivelmente não durável: a origem fica (arquivo nos dois lugares)
+                self.logger.warning(f"⚠️ {len(unlinks)} origem(ns) mantida(s): o checkpoint "
+                                    f"não confirmou o destino")
+                unlinks = []
+            
+            source_dirs = set()
+            for source in unlinks:
+                try:
+                    os.unlink(source)
+                    source_dirs.add(os.path.dirname(os.fspath(source)))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    self.logger.warning(f"⚠️ Origem não removida após a cópia: {source} ({e})")
+            for directory in source_dirs:
+                self._fsync_directory(directory)
+            self.checkpoints += 1
+    
+    def close(self):
+        """
+        Checkpoint final da execução.
+        
+        Operações que ainda terminarem depois (threads abandonadas com uma
+        operação presa) são sincronizadas e têm a origem removida na hora,
+        como no modo ``strict``, em vez de esperar por um checkpoint que não
+        virá mais.
+        """
+        with self._lock:
+            self._closed = True
+        self.checkpoint()
+    
+    def sync_descriptor(self, fd: int):
+        """fsync de um arquivo aberto (dados de uma cópia estrita antes do replace)."""
+        os.fsync(fd)
+        with self._lock:
+            self.fsyncs += 1
+    
+    def _fsync_file(self, path: str) -> bool:
+        """fsync dos dados de um arquivo; falhas são registradas, não propagadas."""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return True  # já removido ou substituído por outra operação
+        try:
+            self.sync_descriptor(fd)
+            return True
+        except OSError as e:
+            self.logger.error(f"❌ fsync falhou em {path}: {e}")
+            return False
+        finally:
+            os.close(fd)
+    
+    def _fsync_directory(self, directory: str) -> bool:
+        """
+        fsync de um diretório; falhas são registradas, não propagadas.
+        
+        O movimento que pediu o fsync já aconteceu: relatá-lo como erro faria
+        um arquivo que está no destino aparecer como não organizado.
+        """
+        if os.name == "nt":
+            return True  # o NTFS registra os metadados em journal; diretórios não abrem para fsync
+        try:
+            fd = os.open(directory or ".", os.O_RDONLY)
+        except OSError:
+            return True
+        try:
+            os.fsync(fd)
+            with self._lock:
+                self.fsyncs += 1
+            return True
+        except OSError as e:
+            if e.errno in (errno.EINVAL, errno.EBADF):
+                return True  # sistema de arquivos sem suporte a fsync de diretório
+            self.logger.error(f"❌ fsync falhou na pasta {directory}: {e}")
+            return False
+        finally:
+            os.close(fd)
+
+
+class OperationWatchdog:
+    """
+    Registro das operações de arquivo em andamento, para detectar workers parados.
+    
+    Cada worker registra o arquivo que está processando (``track``) e o lote
+    de onde ele saiu, com a lista de resultados já prontos (``running``), e
+    sinaliza progresso (``heartbeat``) a
+    cada bloco lido ou copiado. Uma operação sem progresso há mais de
+    ``timeout`` segundos — tipicamente uma leitura presa num compartilhamento
+    SMB/NFS que parou de responder — é considerada parada. Uma thread
+    bloqueada no kernel não pode ser interrompida: os laços de despacho
+    apenas deixam de esperar por ela (``StallQuarantine``).
+    """
+    
+    def __init__(self, timeout: float):
+        if timeout <= 0:
+            raise ValueError(f"Tempo limite inválido: {timeout}")
+        self.timeout = timeout
+        self._operations: Dict[int, list] = {}  # thread -> [arquivo, último progresso]
+        self._batches: Dict[int, Tuple[deque, list]] = {}  # thread -> (lote, resultados prontos)
+        self._lock = threading.Lock()
+        self.closed = False  # Execução encerrada: operações que ainda terminarem estão atrasadas
+    
+    @property
+    def poll_interval(self) -> float:
+        """Intervalo de verificação dos laços de despacho."""
+        return max(0.05, min(1.0, self.timeout / 4))
+    
+    @contextmanager
+    def track(self, file_info: FileInfo):
+        """
+        Registra ``file_info`` como a operação em andamento da thread atual.
+        
+        Sem lock: cada thread só escreve a própria chave, e atribuição e
+        ``pop`` de dict são atômicos no CPython.
+        """
+        ident = threading.get_ident()
+        self._operations[ident] = [file_info, time.monotonic()]
+        try:
+            yield
+        finally:
+            self._operations.pop(ident, None)
+    
+    @contextmanager
+    def running(self, batch: deque, results: list):
+        """Registra o lote consumido pela thread atual e a lista onde ela acumula os resultados."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._batches[ident] = (batch, results)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batches.pop(ident, None)
+    
+    def waiting(self, holder: int):
+        """
+        Espera da thread atual por ``holder``: conta como progresso enquanto ele progride.
+        
+        Um arquivo esperando atrás de um hash longo não está parado; atrás de
+        uma operação presa, está.
+        """
+        entry = self._operations.get(holder)
+        if entry is not None and time.monotonic() - entry[1] <= self.timeout:
+            self.heartbeat()
+    
+    def heartbeat(self):
+        """Sinal de progresso da operação da thread atual (sem lock: chamado a cada bloco)."""
+        entry = self._operations.get(threading.get_ident())
+        if entry is not None:
+            entry[1] = time.monotonic()
+    
+    def stalled(self) -> List[Tuple[int, FileInfo, float]]:
+        """Operações sem progresso há mais de ``timeout``: (thread, arquivo, segundos parado)."""
+        now = time.monotonic()
+        return [(ident, entry[0], now - entry[1]) for ident, entry in list(self._operations.items())
+                if now - entry[1] > self.timeout]
+    
+    def take_remaining(self, ident: int) -> Tuple[deque, list]:
+        """
+        Separa o lote da thread ``ident``: itens ainda não começados e resultados já prontos.
+        
+        Os dois são retirados das estruturas da thread; se ela se recuperar,
+        devolve só o resultado do item em que estava presa.
+        """
+        with self._lock:
+            batch, results = self._batches.get(ident, (None, []))
+        remaining = deque()
+        while batch:
+            try:
+                remaining.append(batch.popleft())
+            except IndexError:  # a própria thread pegou o último
+                break
+        # Só remove do início: um resultado anexado agora pela thread fica na lista
+        count = len(results)
+        ready = results[:count]
+        del results[:count]
+        return remaining, ready
+    
+    def in_flight(self) -> int:
+        """Número de operações em andamento."""
+        return len(self._operations)
+
+
+class StallQuarantine:
+    """
+    Quarentena dos arquivos parados de uma execução, com novas tentativas.
+    
+    Um arquivo parado deixa de segurar o laço de despacho: o resto do lote
+    dele volta para a fila e a execução pode terminar sem ele. Se a operação
+    presa retornar depois com sucesso, o resultado vale; se retornar com
+    falha, o arquivo é tentado de novo após ``RETRY_BACKOFF`` segundos
+    (dobrando a cada tentativa, até ``MAX_RETRIES``). Os que continuam presos
+    no fim são relatados em ``OrganizationStats.stalled_files``.
+    
+    ``finished`` conta arquivos, não tarefas: a execução acabou quando todos
+    os arquivos tiveram resultado ou estão presos, sem novas tentativas na
+    fila. Um arquivo preso ainda ganha mais ``timeout`` segundos depois de
+    detectado (``settled``) para retornar antes de ser dado como perdido.
+    """
+    
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 2.0
+    
+    def __init__(self, watchdog: OperationWatchdog, items: List, item_file: Callable,
+                 stats: OrganizationStats, logger: logging.Logger):
+        """
+        Args:
+            watchdog: Registro das operações do organizador
+            items: Itens da execução (arquivos ou ações)
+            item_file: ``FileInfo`` de um item
+            stats: Estatísticas da execução
+            logger: Logger do organizador
+        """
+        self.watchdog = watchdog
+        self.item_file = item_file
+        self.stats = stats
+        self.logger = logger
+        self.total = len(items)
+        self.resolved = 0
+        self._items = {id(item_file(item)): item for item in items}
+        self._stuck: Dict[int, float] = {}  # arquivo -> quando foi detectado
+        self._attempts: Dict[int, int] = defaultdict(int)
+        self._retries: List[Tuple[float, int]] = []  # heap (quando, arquivo)
+    
+    @property
+    def stuck(self) -> int:
+        return len(self._stuck)
+    
+    @property
+    def waiting(self) -> int:
+        return len(self._retries)
+    
+    @property
+    def settled(self) -> bool:
+        """Todos os arquivos presos já esgotaram o prazo extra."""
+        deadline = time.monotonic() - self.watchdog.timeout
+        return all(detected <= deadline for detected in self._stuck.values())
+    
+    @property
+    def finished(self) -> bool:
+        return self.resolved + len(self._stuck) >= self.total and not self._retries and self.settled
+    
+    def wait_timeout(self) -> float:
+        """Quanto o laço de despacho pode esperar antes da próxima verificação."""
+        timeout = self.watchdog.poll_interval
+        if self._retries:
+            timeout = min(timeout, max(0.0, self._retries[0][0] - time.monotonic()))
+        return timeout
+    
+    def detect(self) -> Tuple[List[deque], List[Tuple[FileInfo, bool, str]]]:
+        """
+        Põe em quarentena os arquivos recém-parados.
+        
+        Returns:
+            Tuple: (resto dos lotes deles, a redistribuir; resultados que já
+            estavam prontos nesses lotes, definitivos)
+        """
+        remainders, ready = [], []
+        for ident, file_info, idle in self.watchdog.stalled():
+            key = id(file_info)
+            if key in self._stuck or key not in self._items:
+                continue
+            self._stuck[key] = time.monotonic()
+            self.logger.warning(f"⏳ Sem progresso há {idle:.0f}s, em quarentena: {file_info.name}")
+            remaining, results = self.watchdog.take_remaining(ident)
+            if remaining:
+                remainders.append(remaining)
+            ready += results
+        self.resolved += len(ready)
+        return remainders, ready
+    
+    def filter(self, results: List[Tuple[FileInfo, bool, str]]) -> List[Tuple[FileInfo, bool, str]]:
+        """
+        Separa os resultados definitivos; falhas de arquivos em quarentena viram novas tentativas.
+        """
+        final = []
+        for result in results:
+            file_info, success, _ = result
+            key = id(file_info)
+            if key in self._stuck:
+                del self._stuck[key]
+                if not success and self._attempts[key] < self.MAX_RETRIES:
+                    self._attempts[key] += 1
+                    delay = self.RETRY_BACKOFF * 2 ** (self._attempts[key] - 1)
+                    heapq.heappush(self._retries, (time.monotonic() + delay, key))
+                    self.stats.retried_files += 1
+                    self.logger.info(f"🔁 Nova tentativa em {delay:.0f}s: {file_info.name}")
+                    continue
+            final.append(result)
+        self.resolved += len(final)
+        return final
+    
+    def due(self) -> List[deque]:
+        """Novas tentativas vencidas, como lotes de um item."""
+        now = time.monotonic()
+        batches = []
+        while self._retries and self._retries[0][0] <= now:
+            _, key = heapq.heappop(self._retries)
+            batches.append(deque([self._items[key]]))
+        return batches
+    
+    def abandon(self, batches: List) -> List[Tuple[FileInfo, bool, str]]:
+        """
+        Encerra a quarentena: falhas para os lotes não processados, as novas
+        tentativas pendentes e os arquivos ainda presos (registrados em
+        ``stats.stalled_files``).
+        """
+        results = []
+        for batch in batches:
+            results += [(self.item_file(item), False, f"⏳ Não processado (workers parados): "
+                         f"{self.item_file(item).name}") for item in batch]
+        for _, key in self._retries:
+            file_info = self.item_file(self._items[key])
+            results.append((file_info, False, f"⏳ Não processado (nova tentativa pendente): "
+                            f"{file_info.name}"))
+        self._retries.clear()
+        for key in self._stuck:
+            file_info = self.item_file(self._items[key])
+            self.stats.stalled_files.append(file_info.path_str)
+            results.append((file_info, False, f"⏳ Sem resposta há mais de "
+                            f"{self.watchdog.timeout:.0f}s: {file_info.name}"))
+        self._stuck.clear()
+        self.resolved += len(results)
+        return results
+
+
+class FilesystemBackend(ABC):
+    """
+    Operações de sistema de arquivos do organizador (contrato dos backends).
+    
+    O caminho de cada arquivo — varredura, ``stat``, leitura para hash e
+    detecção de tipo, criação de pastas, movimentos, vínculos e remoções —
+    passa por um backend. O mesmo código roda sobre o disco
+    (``LocalBackend``), em memória (``MemoryBackend``, para medir o custo do
+    próprio organizador) ou com latência e erros injetados
+    (``LatencyBackend``, para reproduzir um NFS/SMB). As operações seguem a
+    semântica das funções homônimas de ``os``, inclusive as exceções
+    (``OSError`` com ``errno``).
+    
+    ``local`` indica que os caminhos existem de verdade no disco: só então
+    valem a cópia no kernel entre dispositivos, os clones (reflink), os
+    fsyncs de durabilidade, o modo multiprocesso, os metadados gravados no
+    destino (índice de conteúdo e catálogo) e o retrato da varredura
+    incremental em ``output_dir``.
+    """
+    
+    local = False
+    
+    @abstractmethod
+    def scandir(self, path):
+        """Entradas de ``path``, como ``os.scandir`` (iterador e gerenciador de contexto)."""
+    
+    @abstractmethod
+    def stat(self, path) -> os.stat_result:
+        """Metadados de ``path``, como ``os.stat``."""
+    
+    @abstractmethod
+    def open(self, path, mode: str = "rb"):
+        """Abre ``path`` em modo binário (``rb``, ``wb`` ou ``xb``)."""
+    
+    @abstractmethod
+    def exists(self, path) -> bool:
+        """Se ``path`` existe, como ``os.path.exists``."""
+    
+    @abstractmethod
+    def makedirs(self, path):
+        """Cria ``path`` e os pais que faltarem (sem erro se já existir)."""
+    
+    @abstractmethod
+    def rename(self, source, target):
+        """Renomeia ``source`` para ``target``, como ``os.rename``."""
+    
+    @abstractmethod
+    def link(self, source, target):
+        """Cria o hardlink ``target`` para ``source``, como ``os.link``."""
+    
+    @abstractmethod
+    def unlink(self, path):
+        """Remove o arquivo ``path``, como ``os.unlink``."""
+
+
+class LocalBackend(FilesystemBackend):
+    """Sistema de arquivos local (``os`` e ``open``): o backend padrão."""
+    
+    local = True
+    
+    def scandir(self, path):
+        return os.scandir(path)
+    
+    def stat(self, path) -> os.stat_result:
+        return os.stat(path)
+    
+    def open(self, path, mode: str = "rb"):
+        return open(path, mode)
+    
+    def exists(self, path) -> bool:
+        return os.path.exists(path)
+    
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+    
+    def rename(self, source, target):
+        os.rename(source, target)
+    
+    def link(self, source, target):
+        os.link(source, target)
+    
+    def unlink(self, path):
+        os.unlink(path)
+
+
+class _MemoryNode:
+    """Arquivo (``data`` em bytes) ou pasta (``children``) do ``MemoryBackend``."""
+    __slots__ = ("data", "children", "mtime", "ino", "nlink")
+    
+    def __init__(self, ino: int, data: Optional[bytes] = None, mtime: Optional[float] = None):
+        self.data = data
+        self.children: Optional[set] = set() if data is None else None
+        self.mtime = time.time() if mtime is None else mtime
+        self.ino = ino
+        self.nlink = 2 if data is None else 1  # pasta: "." e a entrada no pai
+    
+    @property
+    def is_dir(self) -> bool:
+        return self.children is not None
+    
+    def stat(self) -> os.stat_result:
+        if self.is_dir:
+            mode, size = stat_module.S_IFDIR | 0o755, 0
+        else:
+            mode, size = stat_module.S_IFREG | 0o644, len(self.data)
+        seconds, mtime_ns = int(self.mtime), int(self.mtime * 1e9)
+        # Campos inteiros, depois os em float e em nanossegundos (como os.stat)
+        return os.stat_result((mode, self.ino, MemoryBackend.DEVICE, self.nlink, 0, 0, size,
+                               seconds, seconds, seconds, self.mtime, self.mtime, self.mtime,
+                               mtime_ns, mtime_ns, mtime_ns))
+
+
+class _MemoryEntry:
+    """Entrada de ``MemoryBackend.scandir`` com a interface usada de ``os.DirEntry``."""
+    __slots__ = ("name", "path", "_stat")
+    
+    def __init__(self, name: str, path: str, stat: os.stat_result):
+        self.name = name
+        self.path = path
+        self._stat = stat
+    
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return stat_module.S_ISDIR(self._stat.st_mode)
+    
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return stat_module.S_ISREG(self._stat.st_mode)
+    
+    def is_symlink(self) -> bool:
+        return False
+    
+    def stat(self, follow_symlinks: bool = True) -> os.stat_result:
+        return self._stat
+
+
+class _MemoryScandir:
+    """Resultado de ``MemoryBackend.scandir`` (iterável e gerenciador de contexto)."""
+    
+    def __init__(self, entries: List[_MemoryEntry]):
+        self._entries = iter(entries)
+    
+    def __iter__(self):
+        return self._entries
+    
+    def __enter__(self):
+        return self._entries
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self._entries = iter(())
+
+
+class _MemoryWriter(io.BytesIO):
+    """Arquivo aberto para escrita no ``MemoryBackend``: o conteúdo é gravado ao fechar."""
+    
+    def __init__(self, commit: Callable[[bytes], None]):
+        super().__init__()
+        self._commit = commit
+    
+    def close(self):
+        if not self.closed:
+            self._commit(self.getvalue())
+        super().close()
+
+
+class MemoryBackend(FilesystemBackend):
+    """
+    Sistema de arquivos em memória, num único dispositivo.
+    
+    Sem syscalls nem cache de página, uma execução sobre ele mede só o custo
+    do organizador (planejamento, locks, despacho) — e roda igual em qualquer
+    máquina. Os caminhos são normalizados com ``os.path.normpath``; ``/``
+    (ou a raiz da unidade) sempre existe. Uma pasta muda de ``mtime`` quando
+    ganha ou perde entradas, como no disco (a varredura incremental depende
+    disso). ``add_file`` popula a árvore.
+    """
+    
+    DEVICE = 1
+    
+    def __init__(self):
+        self._ino = itertools.count(1)
+        self._nodes: Dict[str, _MemoryNode] = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.normpath(os.fspath(path))
+    
+    @staticmethod
+    def _error(code: int, path) -> OSError:
+        # OSError com errno vira a subclasse certa (FileNotFoundError, ...)
+        return OSError(code, os.strerror(code), os.fspath(path))
+    
+    def _get(self, path) -> _MemoryNode:
+        key = self._key(path)
+        node = self._nodes.get(key)
+        if node is None:
+            if os.path.dirname(key) == key:  # raiz
+                node = self._nodes[key] = _MemoryNode(next(self._ino))
+            else:
+                raise self._error(errno.ENOENT, path)
+        return node
+    
+    def _parent(self, key: str) -> _MemoryNode:
+        parent = self._get(os.path.dirname(key))
+        if not parent.is_dir:
+            raise self._error(errno.ENOTDIR, key)
+        return parent
+    
+    def _attach(self, key: str, node: _MemoryNode):
+        parent = self._parent(key)
+        self._nodes[key] = node
+        parent.children.add(os.path.basename(key))
+        parent.mtime = time.time()
+        if node.is_dir:
+            parent.nlink += 1  # o ".." da subpasta
+    
+    def _detach(self, key: str) -> _MemoryNode:
+        node = self._nodes.pop(key)
+        parent = self._nodes[os.path.dirname(key)]
+        parent.children.discard(os.path.basename(key))
+        parent.mtime = time.time()
+        if node.is_dir:
+            parent.nlink -= 1
+        return node
+    
+    def add_file(self, path, data: bytes = b"", mtime: Optional[float] = None):
+        """Cria (ou substitui) um arquivo, com as pastas que faltarem."""
+        key = self._key(path)
+        self.makedirs(os.path.dirname(key))
+        with self._lock:
+            self._store(key, data, mtime)
+    
+    def _store(self, key: str, data: bytes, mtime: Optional[float] = None):
+        node = self._nodes.get(key)
+        if node is not None and node.is_dir:
+            raise self._error(errno.EISDIR, key)
+        if node is not None:
+            self._detach(key).nlink -= 1
+        self._attach(key, _MemoryNode(next(self._ino), bytes(data), mtime))
+    
+    def scandir(self, path):
+        with self._lock:
+            key = self._key(path)
+            node = self._get(key)
+            if not node.is_dir:
+                raise self._error(errno.ENOTDIR, path)
+            # Entradas e stats capturados agora, como o cache de os.DirEntry
+            base = os.fspath(path)
+            entries = [_MemoryEntry(name, os.path.join(base, name),
+                                    self._nodes[os.path.join(key, name)].stat())
+                       for name in sorted(node.children)]
+        return _MemoryScandir(entries)
+    
+    def stat(self, path) -> os.stat_result:
+        with self._lock:
+            return self._get(path).stat()
+    
+    def open(self, path, mode: str = "rb"):
+        key = self._key(path)
+        with self._lock:
+            if mode == "rb":
+                node = self._get(key)
+                if node.is_dir:
+                    raise self._error(errno.EISDIR, path)
+                return io.BytesIO(node.data)
+            if mode not in ("wb", "xb"):
+                raise ValueError(f"Modo não suportado pelo backend em memória: {mode}")
+            if mode == "xb" and key in self._nodes:
+                raise self._error(errno.EEXIST, path)
+            self._store(key, b"")
+        
+        def commit(data: bytes):
+            with self._lock:
+                self._store(key, data)
+        return _MemoryWriter(commit)
+    
+    def exists(self, path) -> bool:
+        with self._lock:
+            try:
+                self._get(path)
+                return True
+            except OSError:
+                return False
+    
+    def makedirs(self, path):
+        key = self._key(path)
+        with self._lock:
+            missing = []
+            while True:
+                node = self._nodes.get(key)
+                if node is not None or os.path.dirname(key) == key:
+                    break
+                missing.append(key)
+                key = os.path.dirname(key)
+            if node is not None and not node.is_dir:
+                raise self._error(errno.ENOTDIR if missing else errno.EEXIST, key)
+            for key in reversed(missing):
+                self._attach(key, _MemoryNode(next(self._ino)))
+    
+    def rename(self, source, target):
+        source_key, target_key = self._key(source), self._key(target)
+        with self._lock:
+            node = self._get(source_key)
+            self._parent(target_key)
+            if source_key == target_key:
+                return
+            existing = self._nodes.get(target_key)
+            if existing is not None:
+                if existing.is_dir != node.is_dir:
+                    raise self._error(errno.EISDIR if existing.is_dir else errno.ENOTDIR, target)
+                if existing.is_dir and existing.children:
+                    raise self._error(errno.ENOTEMPTY, target)
+                self._detach(target_key).nlink -= 1
+            self._attach(target_key, self._detach(source_key))
+            if node.is_dir:
+                # Move a subárvore (pastas só são renomeadas fora do caminho quente)
+                prefix = source_key + os.sep
+                for key in [key for key in self._nodes if key.startswith(prefix)]:
+                    self._nodes[target_key + os.sep + key[len(prefix):]] = self._nodes.pop(key)
+    
+    def link(self, source, target):
+        target_key = self._key(target)
+        with self._lock:
+            node = self._get(source)
+            if node.is_dir:
+                raise self._error(errno.EPERM, source)
+            if target_key in self._nodes:
+                raise self._error(errno.EEXIST, target)
+            self._attach(target_key, node)
+            node.nlink += 1
+    
+    def unlink(self, path):
+        key = self._key(path)
+        with self._lock:
+            if self._get(key).is_dir:
+                raise self._error(errno.EISDIR, path)
+            self._detach(key).nlink -= 1
+
+
+class _SlowFile:
+    """Arquivo aberto por um ``LatencyBackend``: cada leitura espera ``delay`` segundos."""
+    
+    def __init__(self, raw, delay: float):
+        self._raw = raw
+        self._delay = delay
+    
+    def read(self, size: int = -1) -> bytes:
+        time.sleep(self._delay)
+        return self._raw.read(size)
+    
+    def readinto(self, buffer) -> int:
+        time.sleep(self._delay)
+        return self._raw.readinto(buffer)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self._raw.close()
+    
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+class LatencyBackend(FilesystemBackend):
+    """
+    Envolve outro backend atrasando (e, opcionalmente, fazendo falhar) cada operação.
+    
+    Reproduz num disco local — ou em memória — o comportamento de um NFS/SMB:
+    cada operação espera ``latency`` segundos (ou o valor de
+    ``operation_latency`` para ela) mais um acréscimo aleatório de até
+    ``jitter``, e cada leitura de um arquivo aberto espera ``read_latency``.
+    Com ``error_rate``, essa fração das operações de ``error_operations``
+    falha com ``EIO`` sem ser executada. A espera é um ``time.sleep``, que
+    libera o GIL como uma chamada de sistema lenta: o efeito de mais workers
+    sob latência aparece como apareceria no compartilhamento real.
+    """
+    
+    OPERATIONS = ("scandir", "stat", "open", "exists", "makedirs", "rename", "link", "unlink")
+    
+    def __init__(self, inner: Optional[FilesystemBackend] = None, latency: float = 0.0,
+                 operation_latency: Optional[Dict[str, float]] = None, jitter: float = 0.0,
+                 read_latency: float = 0.0, error_rate: float = 0.0,
+                 error_operations: Optional[List[str]] = None, seed: Optional[int] = None):
+        """
+        Args:
+            inner: Backend envolvido (padrão: ``LocalBackend``)
+            latency: Espera de cada operação, em segundos
+            operation_latency: Espera por operação (de ``OPERATIONS``), sobrepondo ``latency``
+            jitter: Acréscimo aleatório máximo de cada espera, em segundos
+            read_latency: Espera de cada leitura de arquivo aberto, em segundos
+            error_rate: Fração (0-1) das operações que falham
+            error_operations: Operações sujeitas a falhas (padrão: todas)
+            seed: Semente do gerador aleatório (execuções reproduzíveis)
+        """
+        unknown = set(operation_latency or {}).union(error_operations or ()) - set(self.OPERATIONS)
+        if unknown:
+            raise ValueError(f"Operações desconhecidas: {', '.join(sorted(unknown))}")
+        self.inner = inner or LocalBackend()
+        self.latency = {operation: latency for operation in self.OPERATIONS}
+        self.latency.update(operation_latency or {})
+        self.jitter = jitter
+        self.read_latency = read_latency
+        self.error_rate = error_rate
+        self.error_operations = set(error_operations or self.OPERATIONS)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    @property
+    def local(self) -> bool:
+        return self.inner.local
+    
+    def _delay(self, operation: str, path):
+        with self._lock:
+            self.calls[operation] += 1
+            extra = self._random.random() * self.jitter if self.jitter else 0.0
+            fail = (self.error_rate > 0 and operation in self.error_operations
+                    and self._random.random() < self.error_rate)
+            if fail:
+                self.injected_errors += 1
+        delay = self.latency[operation] + extra
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise OSError(errno.EIO, f"Erro injetado ({operation})", os.fspath(path))
+    
+    def scandir(self, path):
+        self._delay("scandir", path)
+        return self.inner.scandir(path)
+    
+    def stat(self, path) -> os.stat_result:
+        self._delay("stat", path)
+        return self.inner.stat(path)
+    
+    def open(self, path, mode: str = "rb"):
+        self._delay("open", path)
+        raw = self.inner.open(path, mode)
+        return _SlowFile(raw, self.read_latency) if self.read_latency > 0 else raw
+    
+    def exists(self, path) -> bool:
+        self._delay("exists", path)
+        return self.inner.exists(path)
+    
+    def makedirs(self, path):
+        self._delay("makedirs", path)
+        self.inner.makedirs(path)
+    
+    def rename(self, source, target):
+        self._delay("rename", source)
+        self.inner.rename(source, target)
+    
+    def link(self, source, target):
+        self._delay("link", source)
+        self.inner.link(source, target)
+    
+    def unlink(self, path):
+        self._delay("unlink", path)
+        self.inner.unlink(path)
+
+
+class FileTransferEngine:
+    """
+    Move arquivos entre dispositivos com cópia no kernel e troca atômica.
+    
+    No mesmo dispositivo o movimento é um ``os.rename``. Entre dispositivos
+    o conteúdo é copiado para um nome temporário no diretório de destino
+    com ``os.copy_file_range`` (ou ``os.sendfile``) em extents grandes, sem
+    passar pelo espaço de usuário; os metadados são copiados com uma única
+    chamada a ``shutil.copystat`` e só então o arquivo recebe o nome final
+    com ``os.replace`` e a origem é removida. Com verificação ativa a cópia
+    passa pelo espaço de usuário para que o MD5 seja calculado sobre os
+    mesmos bytes gravados, sem uma segunda leitura.
+    
+    Com um ``throttle`` definido, renomeações e vínculos contam no limite de
+    operações/s e cada bloco copiado no limite de banda. Com um
+    ``durability`` os movimentos são registrados para fsync e, entre
+    dispositivos, a remoção da origem passa por ele. ``heartbeat`` é chamado
+    a cada bloco copiado (sinal de progresso para o ``OperationWatchdog``).
+    
+    Renomeações, vínculos e remoções passam pelo ``backend``; a cópia entre
+    dispositivos e os clones só existem num backend ``local`` (um backend em
+    memória nunca responde ``EXDEV``).
+    """
+    
+    KERNEL_COPY_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                          errno.EPERM, errno.ENOTSUP)
+    
+    def __init__(self, backend: Optional[FilesystemBackend] = None):
+        self.backend = backend or LocalBackend()
+        self.copy_file_range_supported = hasattr(os, "copy_file_range")
+        self.sendfile_supported = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+        self.throttle: Optional[IOThrottle] = None
+        self.durability: Optional[DurabilityManager] = None
+        self.heartbeat: Optional[Callable[[], None]] = None
+    
+    def _progress(self, nbytes: int, started: float):
+        """Contabiliza um bloco copiado no ``throttle`` e sinaliza progresso."""
+        if self.throttle is not None:
+            self.throttle.account(nbytes, time.monotonic() - started)
+        if self.heartbeat is not None:
+            self.heartbeat()
+    
+    def _metadata_operation(self, operation: Callable, *args):
+        """Executa uma operação de metadados contando-a no ``throttle``."""
+        throttle = self.throttle
+        if throttle is None:
+            return operation(*args)
+        throttle.operation()
+        started = time.monotonic()
+        try:
+            return operation(*args)
+        finally:
+            throttle.observe(time.monotonic() - started)
+    
+    def move(self, source: Path, target: Path, verify: bool = False,
+             chunk_size: int = 64 * 1024 * 1024,
+             expected_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Move ``source`` para ``target``.
+        
+        Args:
+            source: Arquivo de origem
+            target: Caminho final (já único)
+            verify: Calcular o MD5 durante a cópia entre dispositivos
+            chunk_size: Tamanho dos extents/blocos de cópia
+            expected_hash: Hash já conhecido da origem, comparado com o da cópia
+            
+        Returns:
+            Optional[str]: MD5 calculado durante a cópia (apenas com ``verify``)
+        """
+        durability = self.durability
+        try:
+            self._metadata_operation(self.backend.rename, source, target)
+            if durability is not None:
+                durability.placed(target, source)
+            return None
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        
+        if source.is_symlink():
+            shutil.move(str(source), str(target))
+            if durability is not None:
+                durability.placed(target, source)
+            return None
+        
+        digest = self.copy(source, target, verify, chunk_size, expected_hash)
+        if durability is None:
+            self.backend.unlink(source)
+        else:
+            durability.placed(target, data_written=True)
+            durability.remove_source(source)
+        return digest
+    
+    def copy(self, source: Path, target: Path, verify: bool = False,
+             chunk_size: int = 64 * 1024 * 1024,
+             expected_hash: Optional[str] = None) -> Optional[str]:
+        """Copia para um temporário no destino e o renomeia atomicamente para ``target``."""
+        temp_path = self._temp_path(target)
+        digest = None
+        if self.throttle is not None:
+            chunk_size = self.throttle.chunk_size(chunk_size)
+        try:
+            with open(source, 'rb') as fsrc, open(temp_path, 'wb') as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                if verify:
+                    digest = self._copy_hashing(fsrc, fdst, min(chunk_size, max(size, 64 * 1024)))
+                else:
+                    self._copy_kernel(fsrc, fdst, size, chunk_size)
+                
+                fdst.flush()
+                copied = os.fstat(fdst.fileno()).st_size
+                if copied != size:
+                    raise IOError(f"Cópia incompleta: {copied} de {size} bytes")
+                if self.durability is not None and self.durability.strict:
+                    self.durability.sync_descriptor(fdst.fileno())
+            
+            if digest and expected_hash and digest != expected_hash:
+                raise IOError(f"Hash divergente após a cópia ({digest} != {expected_hash})")
+            
+            shutil.copystat(source, temp_path)
+            os.replace(temp_path, target)
+            return digest
+        
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _temp_path(self, target: Path) -> Path:
+        """Nome temporário no mesmo diretório do destino (para a troca atômica)."""
+        return target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.part")
+    
+    def hardlink(self, existing: Path, target: Path) -> bool:
+        """
+        Cria ``target`` como hardlink de ``existing``.
+        
+        Returns:
+            bool: False se o sistema de arquivos não permitir (outro disco, limite de links...)
+        """
+        try:
+            self._metadata_operation(self.backend.link, existing, target)
+            return True
+        except OSError as e:
+            if e.errno in self.KERNEL_COPY_ERRORS + (errno.EMLINK,):
+                return False
+            raise
+    
+    def reflink(self, existing: Path, target: Path,
+                metadata_from: Optional[Path] = None) -> bool:
+        """
+        Cria ``target`` como clone copy-on-write de ``existing`` (``FICLONE``).
+        
+        Args:
+            existing: Arquivo cujos blocos serão compartilhados
+            target: Caminho final (já único)
+            metadata_from: Arquivo cujos metadados (datas, permissões) o clone recebe
+            
+        Returns:
+            bool: False se a plataforma ou o sistema de arquivos não suportar clones
+        """
+        if not self.backend.local or fcntl is None or not sys.platform.startswith("linux"):
+            return False
+        
+        temp_path = self._temp_path(target)
+        try:
+            with open(existing, 'rb') as fsrc, open(temp_path, 'wb') as fdst:
+                self._metadata_operation(fcntl.ioctl, fdst.fileno(), FICLONE, fsrc.fileno())
+                if self.durability is not None and self.durability.strict:
+                    self.durability.sync_descriptor(fdst.fileno())
+            if metadata_from is not None:
+                shutil.copystat(metadata_from, temp_path)
+            os.replace(temp_path, target)
+            return True
+        except OSError as e:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            if e.errno in self.KERNEL_COPY_ERRORS + (errno.ENOTTY,):
+                return False
+            raise
+    
+    def _copy_kernel(self, fsrc, fdst, size: int, chunk_size: int):
+        """Copia no kernel; recorre ao espaço de usuário se não houver suporte."""
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        offset = 0
+        
+        if self.copy_file_range_supported:
+            try:
+                while offset < size:
+                    started = time.monotonic()
+                    copied = os.copy_file_range(src_fd, dst_fd, min(chunk_size, size - offset))
+                    if copied == 0:
+                        break
+                    offset += copied
+                    self._progress(copied, started)
+                if offset >= size:
+                    return
+            except OSError as e:
+                if e.errno not in self.KERNEL_COPY_ERRORS or offset:
+                    raise
+                # EXDEV etc. (ex.: sistemas de arquivos de tipos diferentes) vale só
+                # para este par; ENOSYS desativa a chamada de vez
+                if e.errno == errno.ENOSYS:
+                    self.copy_file_range_supported = False
+        
+        if self.sendfile_supported:
+            try:
+                while offset < size:
+                    started = time.monotonic()
+                    sent = os.sendfile(dst_fd, src_fd, offset, min(chunk_size, size - offset))
+                    if sent == 0:
+                        break
+                    offset += sent
+                    self._progress(sent, started)
+                if offset >= size:
+                    return
+            except OSError as e:
+                if e.errno not in self.KERNEL_COPY_ERRORS or offset:
+                    raise
+                if e.errno == errno.ENOSYS:
+                    self.sendfile_supported = False
+        
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        if self.throttle is None and self.heartbeat is None:
+            shutil.copyfileobj(fsrc, fdst, min(chunk_size, 8 * 1024 * 1024))
+        else:
+            self._copy_userspace(fsrc, fdst, chunk_size)
+    
+    def _copy_hashing(self, fsrc, fdst, chunk_size: int) -> str:
+        """Copia pelo espaço de usuário calculando o MD5 dos blocos gravados."""
+        hash_md5 = hashlib.md5()
+        self._copy_userspace(fsrc, fdst, chunk_size, hash_md5)
+        return hash_md5.hexdigest()
+    
+    def _copy_userspace(self, fsrc, fdst, chunk_size: int, hash_md5=None):
+        """Copia bloco a bloco por um buffer reutilizado, opcionalmente alimentando ``hash_md5``."""
+        buffer = bytearray(min(chunk_size, 8 * 1024 * 1024))
+        view = memoryview(buffer)
+        while True:
+            started = time.monotonic()
+            read = fsrc.readinto(buffer)
+            if not read:
+                break
+            chunk = view[:read]
+            if hash_md5 is not None:
+                hash_md5.update(chunk)
+            fdst.write(chunk)
+            self._progress(read, started)
+
+
+class ContentClaims:
+    """
+    Reservas de conteúdo em andamento, para a detecção de duplicatas em paralelo.
+    
+    Um arquivo reserva ``(tamanho, hash)`` da verificação de duplicata até o
+    registro no destino (ou a falha do movimento); só outro arquivo com o
+    mesmo conteúdo espera por ele. O hash é calculado antes da reserva e o
+    movimento acontece com a reserva, mas sem lock. Sem hash (tamanho
+    inédito no índice), a reserva vale para o tamanho inteiro.
+    """
+    
+    def __init__(self):
+        self._claims: Dict[int, Dict[Optional[str], int]] = {}  # tamanho -> hash -> thread
+        self._condition = threading.Condition()
+    
+    def busy(self, size: int) -> bool:
+        """Indica se algum arquivo deste tamanho está entre a verificação e o registro."""
+        return size in self._claims
+    
+    def _holder(self, size: int, file_hash: Optional[str]) -> Optional[int]:
+        claims = self._claims.get(size)
+        if not claims:
+            return None
+        if file_hash is None:
+            return next(iter(claims.values()))
+        return claims.get(file_hash, claims.get(None))
+    
+    @contextmanager
+    def claim(self, size: int, file_hash: Optional[str],
+              watchdog: Optional['OperationWatchdog'] = None):
+        """Reserva o conteúdo, esperando enquanto outro arquivo igual estiver em andamento."""
+        with self._condition:
+            while True:
+                holder = self._holder(size, file_hash)
+                if holder is None:
+                    break
+                self._condition.wait(watchdog.poll_interval if watchdog is not None else None)
+                if watchdog is not None:
+                    watchdog.waiting(holder)
+            self._claims.setdefault(size, {})[file_hash] = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._condition:
+                claims = self._claims[size]
+                del claims[file_hash]
+                if not claims:
+                    del self._claims[size]
+                self._condition.notify_all()
+
+
+class ContentIndex:
+    """
+    Índice persistente do conteúdo do destino para detectar duplicatas entre execuções.
+    
+    Em memória as entradas ficam particionadas por tamanho: um arquivo novo
+    só precisa de hash se o destino já tiver outro do mesmo tamanho. Arquivos
+    de tamanho inédito entram como *pendentes* e só são lidos se um candidato
+    do mesmo tamanho aparecer depois — por isso construir o índice de um
+    destino existente custa apenas uma listagem, sem ler conteúdo.
+    
+    Em disco o índice é um log append-only em ``<destino>/.organizador/``:
+    cabeçalho ``MAGIC`` e registros ``<Q16sH`` (tamanho, digest MD5 binário
+    de largura fixa, comprimento do caminho) seguidos do caminho relativo em
+    UTF-8. Digest zerado marca entrada pendente e um caminho prefixado por
+    ``REMOVED`` remove só aquela cópia: o mesmo conteúdo pode estar em vários
+    caminhos (``rename``, ``hardlink``) e as demais cópias continuam valendo.
+    Um registro final incompleto (gravação interrompida) é descartado ao
+    carregar.
+    """
+    
+    INDEX_DIR = ".organizador"
+    INDEX_FILE = "indice_conteudo.bin"
+    MAGIC = b"OAIDX1\n"
+    RECORD = struct.Struct("<Q16sH")
+    PENDING = bytes(16)
+    REMOVED = "\x00"  # Prefixo de caminho dos registros de remoção (NUL não ocorre em caminhos)
+    
+    def __init__(self, destination: Path, logger: logging.Logger):
+        self.destination = destination
+        self.path = destination / self.INDEX_DIR / self.INDEX_FILE
+        self.logger = logger
+        self._hashed: Dict[int, Dict[bytes, List[str]]] = {}
+        self._pending: Dict[int, List[str]] = {}
+        self._buffer: List[bytes] = []
+        self._record_count = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def open(cls, destination: Path, logger: logging.Logger,
+             rebuild: bool = False) -> 'ContentIndex':
+        """Carrega o índice do destino, construindo-o se não existir."""
+        index = cls(destination, logger)
+        if rebuild or not index._load():
+            index._build()
+        return index
+    
+    def _load(self) -> bool:
+        """Reproduz o log do disco. Retorna False se não houver índice válido."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return False
+        
+        if not data.startswith(self.MAGIC):
+            self.logger.warning(f"⚠️ Índice de conteúdo inválido, reconstruindo: {self.path}")
+            return False
+        
+        offset = len(self.MAGIC)
+        record_size = self.RECORD.size
+        while offset + record_size <= len(data):
+            size, digest, length = self.RECORD.unpack_from(data, offset)
+            end = offset + record_size + length
+            if end > len(data):
+                break
+            if length == 0:
+                self.logger.warning(f"⚠️ Índice de conteúdo corrompido, reconstruindo: {self.path}")
+                return False
+            relative_path = data[offset + record_size:end].decode('utf-8', 'surrogateescape')
+            self._apply(size, digest, relative_path)
+            self._record_count += 1
+            offset = end
+        
+        if offset < len(data):
+            # Registro incompleto no fim (gravação interrompida): descarta para
+            # que os próximos registros não sejam anexados a ele
+            self.logger.warning(f"⚠️ Índice de conteúdo com registro final incompleto "
+                                f"({len(data) - offset} bytes descartados)")
+            try:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(offset)
+            except OSError as e:
+                self.logger.warning(f"⚠️ Não foi possível reparar o índice, reconstruindo: {e}")
+                return False
+        
+        self.logger.info(f"🗃️ Índice de conteúdo carregado: {self._entry_count()} arquivo(s)")
+        return True
+    
+    def _build(self):
+        """Cria o índice a partir de uma listagem do destino (sem ler conteúdo)."""
+        self._hashed.clear()
+        self._pending.clear()
+        for root, dirnames, filenames in os.walk(self.destination):
+            if root == str(self.destination) and self.INDEX_DIR in dirnames:
+                dirnames.remove(self.INDEX_DIR)
+            for filename in filenames:
+                path = Path(root) / filename
+                try:
+                    size = path.stat().st_size
+                except OSError:
+                    continue
+                self._apply(size, self.PENDING, path.relative_to(self.destination).as_posix())
+        
+        self._rewrite()
+        self.logger.info(f"🗃️ Índice de conteúdo criado: {self._entry_count()} arquivo(s)")
+    
+    def _entry_count(self) -> int:
+        return (sum(len(paths) for entries in self._hashed.values() for paths in entries.values()) +
+                sum(len(entries) for entries in self._pending.values()))
+    
+    def _apply(self, size: int, digest: bytes, relative_path: str):
+        """Aplica um registro ao estado em memória."""
+        if digest == self.PENDING:
+            self._pending.setdefault(size, []).append(relative_path)
+        elif relative_path.startswith(self.REMOVED):
+            relative_path = relative_path[len(self.REMOVED):]
+            bucket = self._hashed.get(size, {})
+            paths = bucket.get(digest)
+            if paths and relative_path in paths:
+                paths.remove(relative_path)
+                if not paths:
+                    del bucket[digest]
+                    if not bucket:
+                        del self._hashed[size]
+        else:
+            paths = self._hashed.setdefault(size, {}).setdefault(digest, [])
+            if relative_path not in paths:
+                paths.append(relative_path)
+            pending = self._pending.get(size)
+            if pending and relative_path in pending:
+                pending.remove(relative_path)
+                if not pending:
+                    del self._pending[size]
+    
+    def _append(self, size: int, digest: bytes, relative_path: str):
+        """Aplica um registro e o enfileira para gravação."""
+        encoded = relative_path.encode('utf-8', 'surrogateescape')
+        self._apply(size, digest, relative_path)
+        self._buffer.append(self.RECORD.pack(size, digest, len(encoded)) + encoded)
+    
+    def has_size(self, size: int) -> bool:
+        """Indica se há no destino algum arquivo com este tamanho."""
+        return size in self._hashed or size in self._pending
+    
+    def find(self, size: int, file_hash: str,
+             hash_function: Callable[[Path], str]) -> Optional[Path]:
+        """
+        Procura no destino um arquivo com o mesmo tamanho e hash.
+        
+        Args:
+            size: Tamanho do arquivo
+            file_hash: Hash MD5 (hex) do arquivo
+            hash_function: Usada para calcular o hash das entradas pendentes deste tamanho
+            
+        Returns:
+            Optional[Path]: Caminho de uma cópia existente, se houver
+        """
+        with self._lock:
+            pending = self._pending.pop(size, [])
+        
+        for relative_path in pending:
+            path = self.destination / relative_path
+            pending_hash = hash_function(path) if path.is_file() else ""
+            if pending_hash:
+                self.add(size, pending_hash, relative_path)
+        
+        digest = bytes.fromhex(file_hash)
+        with self._lock:
+            candidates = list(self._hashed.get(size, {}).get(digest, ()))
+        for relative_path in candidates:
+            path = self.destination / relative_path
+            if path.is_file():
+                return path
+            # Removido do destino por fora do organizador
+            self.remove(size, file_hash, relative_path)
+        return None
+    
+    def add(self, size: int, file_hash: Optional[str], relative_path: str):
+        """Registra um arquivo do destino (sem hash, fica pendente)."""
+        digest = bytes.fromhex(file_hash) if file_hash else self.PENDING
+        with self._lock:
+            if digest != self.PENDING and relative_path in self._hashed.get(size, {}).get(digest, ()):
+                return
+            self._append(size, digest, relative_path)
+    
+    def remove(self, size: int, file_hash: str, relative_path: str):
+        """Remove do índice a cópia em ``relative_path`` (as demais com o mesmo conteúdo ficam)."""
+        with self._lock:
+            self._append(size, bytes.fromhex(file_hash), self.REMOVED + relative_path)
+    
+    def flush(self):
+        """Grava os registros pendentes, compactando o log quando ele fica muito maior que o índice."""
+        with self._lock:
+            if not self._buffer:
+                return
+            self._record_count += len(self._buffer)
+            if self._record_count > 2 * self._entry_count() + 1000:
+                self._rewrite()
+                return
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_file = not self.path.exists()
+            with open(self.path, 'ab') as f:
+                if new_file:
+                    f.write(self.MAGIC)
+                f.write(b"".join(self._buffer))
+            self._buffer.clear()
+    
+    def _rewrite(self):
+        """Regrava o índice compactado, agrupado por tamanho, com troca atômica."""
+        records = []
+        for size in sorted(set(self._hashed) | set(self._pending)):
+            entries = [(digest, relative_path) for digest, paths in self._hashed.get(size, {}).items()
+                       for relative_path in paths]
+            entries += [(self.PENDING, relative_path) for relative_path in self._pending.get(size, [])]
+            for digest, relative_path in entries:
+                encoded = relative_path.encode('utf-8', 'surrogateescape')
+                records.append(self.RECORD.pack(size, digest, len(encoded)) + encoded)
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(b"".join(records))
+        os.replace(temp_path, self.path)
+        self._buffer.clear()
+        self._record_count = len(records)
+
+
+class DestinationCatalog:
+    """
+    Catálogo SQLite dos arquivos organizados, para buscas sem percorrer o destino.
+    
+    Fica em ``<destino>/.organizador/catalogo.sqlite3`` com nome, caminho
+    relativo, categoria, extensão, tamanho, datas e MD5 (quando calculado)
+    de cada arquivo. Os workers apenas enfileiram as operações; elas são
+    gravadas em lotes de ``BATCH_SIZE``, cada lote em uma única transação,
+    e o restante ao fim da execução. Buscas por nome usam FTS5 quando o
+    SQLite tem suporte, com fallback para ``LIKE``.
+    """
+    
+    CATALOG_FILE = "catalogo.sqlite3"
+    BATCH_SIZE = 500
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            category TEXT,
+            extension TEXT,
+            size INTEGER,
+            modified REAL,
+            created REAL,
+            organized_at REAL,
+            source TEXT,
+            md5 TEXT,
+            kind TEXT
+        );
+        CREATE INDEX IF NOT EXISTS files_category ON files(category);
+        CREATE INDEX IF NOT EXISTS files_md5 ON files(md5);
+    """
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+            name, path, content='files', content_rowid='id', tokenize='unicode61 remove_diacritics 2');
+        CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+            INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
+        END;
+        CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+            INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
+        END;
+        CREATE TRIGGER IF NOT EXISTS files_au AFTER UPDATE ON files BEGIN
+            INSERT INTO files_fts(files_fts, rowid, name, path) VALUES ('delete', old.id, old.name, old.path);
+            INSERT INTO files_fts(rowid, name, path) VALUES (new.id, new.name, new.path);
+        END;
+    """
+    UPSERT = """
+        INSERT INTO files (path, name, category, extension, size, modified, created,
+                           organized_at, source, md5, kind)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            name = excluded.name, category = excluded.category, extension = excluded.extension,
+            size = excluded.size, modified = excluded.modified, created = excluded.created,
+            organized_at = excluded.organized_at, source = excluded.source,
+            md5 = excluded.md5, kind = excluded.kind
+    """
+    
+    def __init__(self, destination: Path, logger: logging.Logger):
+        self.destination = destination
+        self.path = destination / ContentIndex.INDEX_DIR / self.CATALOG_FILE
+        self.logger = logger
+        self.fts = False
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: List[Tuple[str, tuple]] = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def open(cls, destination: Path, logger: logging.Logger) -> 'DestinationCatalog':
+        """Abre (criando se preciso) o catálogo do destino."""
+        catalog = cls(destination, logger)
+        catalog.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(catalog.path), check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(cls.SCHEMA)
+        try:
+            connection.executescript(cls.FTS_SCHEMA)
+            catalog.fts = True
+        except sqlite3.OperationalError:
+            # SQLite compilado sem FTS5: buscas usam LIKE
+            catalog.fts = False
+        catalog._connection = connection
+        return catalog
+    
+    @classmethod
+    def open_existing(cls, destination: Path, logger: logging.Logger) -> Optional['DestinationCatalog']:
+        """Abre o catálogo só se ele já existir (consultas não criam nada no destino)."""
+        if not (destination / ContentIndex.INDEX_DIR / cls.CATALOG_FILE).exists():
+            return None
+        return cls.open(destination, logger)
+    
+    def add(self, relative_path: str, file_info: FileInfo, category: str, kind: str = "move"):
+        """Enfileira o registro de um arquivo organizado (seguro entre threads)."""
+        self._enqueue(("add", self._row(relative_path, file_info, category, kind, file_info.path_str)))
+    
+    @staticmethod
+    def _row(relative_path: str, file_info: FileInfo, category: str, kind: str,
+             source: Optional[str]) -> tuple:
+        return (relative_path, os.path.basename(relative_path), category, file_info.extension,
+                file_info.size, file_info.mtime, file_info.ctime, time.time(),
+                source, file_info.hash_md5 or None, kind)
+    
+    def rebuild(self, category_function: Callable[[FileInfo], str]) -> int:
+        """Recria o catálogo listando o destino (sem MD5 nem origem). Retorna o total."""
+        with self._lock:
+            self._pending.clear()
+            with self._connection:
+                self._connection.execute("DELETE FROM files")
+        
+        count = 0
+        for root, directories, filenames in os.walk(self.destination):
+            directories[:] = [name for name in directories if name != ContentIndex.INDEX_DIR]
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    file_info = FileInfo.from_stat(path, os.stat(path))
+                except OSError:
+                    continue
+                relative_path = os.path.relpath(path, self.destination).replace(os.sep, '/')
+                self._enqueue(("add", self._row(relative_path, file_info, category_function(file_info),
+                                                "rebuild", None)))
+                count += 1
+        self.flush()
+        return count
+    
+    def remove(self, relative_path: str):
+        """Enfileira a remoção de um arquivo do catálogo."""
+        self._enqueue(("remove", (relative_path,)))
+    
+    def _enqueue(self, operation: Tuple[str, tuple]):
+        with self._lock:
+            self._pending.append(operation)
+            if len(self._pending) >= self.BATCH_SIZE:
+                self._write_pending()
+    
+    def flush(self):
+        """Grava as operações pendentes em uma transação."""
+        with self._lock:
+            self._write_pending()
+    
+    def _write_pending(self):
+        """Grava o lote pendente (chamado com o lock adquirido)."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        try:
+            with self._connection:
+                for operation, parameters in pending:
+                    if operation == "add":
+                        self._connection.execute(self.UPSERT, parameters)
+                    else:
+                        self._connection.execute("DELETE FROM files WHERE path = ?", parameters)
+        except sqlite3.Error as e:
+            self.logger.warning(f"⚠️ Falha ao atualizar o catálogo ({len(pending)} registros): {e}")
+    
+    def search(self, text: str, limit: int = 50) -> List[sqlite3.Row]:
+        """Busca arquivos pelo nome ou caminho (todas as palavras, por prefixo)."""
+        terms = re.findall(r"\w+", text)
+        with self._lock:
+            if self.fts and terms:
+                query = " AND ".join(f'"{term}"*' for term in terms)
+                return self._connection.execute(
+                    "SELECT files.* FROM files_fts JOIN files ON files.id = files_fts.rowid "
+                    "WHERE files_fts MATCH ? ORDER BY rank LIMIT ?", (query, limit)).fetchall()
+            
+            pattern = f"%{text.strip()}%"
+            return self._connection.execute(
+                "SELECT * FROM files WHERE name LIKE ? OR path LIKE ? ORDER BY organized_at DESC LIMIT ?",
+                (pattern, pattern, limit)).fetchall()
+    
+    def summary(self) -> Dict:
+        """Totais do catálogo: arquivos e bytes por categoria e no geral."""
+        with self._lock:
+            categories = self._connection.execute(
+                "SELECT category, COUNT(*) AS files, COALESCE(SUM(size), 0) AS size "
+                "FROM files GROUP BY category ORDER BY files DESC").fetchall()
+            totals = self._connection.execute(
+                "SELECT COUNT(*) AS files, COALESCE(SUM(size), 0) AS size, "
+                "MAX(organized_at) AS last_organized FROM files").fetchone()
+        return {
+            'files': totals['files'],
+            'size': totals['size'],
+            'last_organized': totals['last_organized'],
+            'categories': [(row['category'], row['files'], row['size']) for row in categories]
+        }
+    
+    def close(self):
+        """Grava o pendente e fecha a conexão."""
+        self.flush()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class ScanSnapshot:
+    """
+    Retrato das pastas da origem entre execuções, para a varredura incremental.
+    
+    Para cada pasta guarda ``[mtime_ns, nlink, entradas, subpastas]``, lidos
+    *antes* de listá-la. Na execução seguinte, uma pasta cujo ``mtime_ns`` e
+    ``nlink`` não mudaram não é listada de novo: seus arquivos já foram
+    vistos (o que sobrou nela foi ignorado ou falhou) e as subpastas vêm do
+    retrato. Como o mtime de uma pasta só muda com as entradas diretas dela,
+    as subpastas continuam sendo visitadas (um ``stat`` cada).
+    
+    Salvaguardas: pastas alteradas no mesmo instante da varredura não são
+    confiáveis (mtime guardado como -1, sempre relistadas), o retrato só é
+    gravado ao fim de uma execução completa, e a cada ``full_rescan_hours``
+    a varredura volta a ser completa.
+    """
+    
+    STATE_DIR = "state"
+    VERSION = 1
+    RACY_WINDOW_NS = 2_000_000_000  # mudanças a menos de 2 s da varredura
+    
+    def __init__(self, path: Path, source: str):
+        self.path = path
+        self.source = source
+        self.previous: Dict[str, list] = {}
+        self.directories: Dict[str, list] = {}
+        self.full_scan_at = 0.0
+        self.full_scan = True
+        self.pruned = 0
+        self.started_ns = time.time_ns()
+    
+    @classmethod
+    def open(cls, output_dir: Path, source_path: Path, full_rescan_hours: float,
+             force_full: bool = False) -> 'ScanSnapshot':
+        """Carrega o retrato da origem e decide se esta varredura precisa ser completa."""
+        source = str(Path(source_path).resolve())
+        name = hashlib.md5(source.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+        snapshot = cls(Path(output_dir) / cls.STATE_DIR / f"varredura_{name}.json", source)
+        
+        try:
+            with open(snapshot.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == cls.VERSION and data.get('source') == source:
+                snapshot.previous = data['directories']
+                snapshot.full_scan_at = data['full_scan_at']
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        due = time.time() - snapshot.full_scan_at >= full_rescan_hours * 3600
+        snapshot.full_scan = force_full or due or not snapshot.previous
+        return snapshot
+    
+    def known_subdirs(self, relative: str, stat: os.stat_result) -> Optional[List[str]]:
+        """Subpastas do retrato se a pasta não mudou; None se ela precisa ser listada."""
+        if self.full_scan:
+            return None
+        entry = self.previous.get(relative)
+        if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_nlink:
+            return None
+        self.directories[relative] = entry
+        self.pruned += 1
+        return entry[3]
+    
+    def record(self, relative: str, stat: os.stat_result, entries: int, subdirs: List[str]):
+        """Registra uma pasta recém-listada (com o ``stat`` tirado antes da listagem)."""
+        mtime_ns = stat.st_mtime_ns
+        if mtime_ns >= self.started_ns - self.RACY_WINDOW_NS:
+            mtime_ns = -1
+        self.directories[relative] = [mtime_ns, stat.st_nlink, entries, subdirs]
+    
+    def save(self):
+        """Grava o retrato (troca atômica do arquivo)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': self.VERSION,
+            'source': self.source,
+            'full_scan_at': self.started_ns / 1e9 if self.full_scan else self.full_scan_at,
+            'directories': self.directories
+        }
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+
+
+@dataclass
+class RoutingRule:
+    """Regra de roteamento já compilada (ver ``RoutingRules``)."""
+    name: str
+    destination: str
+    pattern: 're.Pattern'
+    prefix: str = ''
+    extensions: Optional[frozenset] = None
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+    older_than: Optional[float] = None
+    newer_than: Optional[float] = None
+    uses_category: bool = False
+    
+    def accepts(self, file_info: FileInfo, now: float) -> bool:
+        """Verifica as condições de tamanho e idade (o nome/caminho já casou)."""
+        if self.min_size is not None and file_info.size < self.min_size:
+            return False
+        if self.max_size is not None and file_info.size > self.max_size:
+            return False
+        if self.older_than is not None or self.newer_than is not None:
+            age = now - file_info.mtime
+            if self.older_than is not None and age < self.older_than:
+                return False
+            if self.newer_than is not None and age > self.newer_than:
+                return False
+        return True
+    
+    def render(self, file_info: FileInfo, category_function: Callable[[FileInfo], str]) -> str:
+        """Monta a pasta de destino relativa a partir do modelo da regra."""
+        date = file_info.modified_date
+        return self.destination.format_map({
+            'ano': f"{date.year}",
+            'mes': f"{date.month:02d}",
+            'extensao': file_info.extension.lstrip('.') or 'sem_extensao',
+            'categoria': category_function(file_info) if self.uses_category else ''
+        })
+
+
+class _RuleGroup:
+    """Regras candidatas de uma extensão: trie de prefixos literais do nome + regex única das demais."""
+    
+    def __init__(self, rules: List[RoutingRule], indices: List[int]):
+        self.trie: Dict = {}
+        self.loose = [i for i in indices if not rules[i].prefix]
+        for i in indices:
+            if rules[i].prefix:
+                node = self.trie
+                for char in rules[i].prefix:
+                    node = node.setdefault(char, {})
+                node.setdefault(None, []).append(i)
+        
+        self.loose_pattern = None
+        if self.loose:
+            merged = "|".join(f"(?P<r{i}>{rules[i].pattern.pattern})" for i in self.loose)
+            self.loose_pattern = re.compile(merged, re.IGNORECASE | re.DOTALL)
+    
+    def prefixed(self, name: str) -> List[int]:
+        """Regras cujo prefixo literal é prefixo de ``name`` (já em minúsculas)."""
+        found = []
+        node = self.trie
+        for char in name:
+            node = node.get(char)
+            if node is None:
+                break
+            found.extend(node.get(None, ()))
+        return sorted(found)
+
+
+class RoutingRules:
+    """
+    Regras declarativas de roteamento (``routing_rules`` na configuração).
+    
+    Cada regra combina condições opcionais — ``extensions``, ``name_glob`` ou
+    ``name_regex``, ``path_glob`` (casado com a pasta que contém o arquivo,
+    não com o caminho completo), ``min_size``/``max_size``,
+    ``older_than_days``/``newer_than_days`` — e um ``destination`` com os
+    marcadores ``{categoria}``, ``{ano}``, ``{mes}`` e ``{extensao}``. Vale a
+    primeira regra da lista que casar; sem regra aplicável, o arquivo segue o
+    ``OrganizationMode`` configurado.
+    
+    As regras são compiladas uma única vez em uma árvore de decisão: primeiro
+    a extensão (um acesso a dicionário), depois o prefixo literal do padrão de
+    nome (uma trie percorrida pelo nome do arquivo). Só as poucas regras que
+    passam por esses dois níveis têm a regex testada. Regras sem prefixo
+    literal (``*.pdf``, só pasta ou tamanho) ficam juntas em uma única regex
+    com um grupo nomeado por regra, e o ``lastgroup`` do match indica a
+    primeira candidata.
+    """
+    
+    PLACEHOLDERS = {'categoria', 'ano', 'mes', 'extensao'}
+    
+    def __init__(self, rules: List[Dict]):
+        self.source = list(rules)
+        self.rules = [self._compile_rule(i, rule) for i, rule in enumerate(self.source)]
+        
+        wildcard = [i for i, rule in enumerate(self.rules) if rule.extensions is None]
+        by_extension: Dict[str, List[int]] = defaultdict(list)
+        for i, rule in enumerate(self.rules):
+            for extension in rule.extensions or ():
+                by_extension[extension].append(i)
+        
+        self._wildcard = _RuleGroup(self.rules, wildcard) if wildcard else None
+        self._groups = {
+            extension: _RuleGroup(self.rules, sorted(indices + wildcard))
+            for extension, indices in by_extension.items()
+        }
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    @staticmethod
+    def _glob_to_regex(pattern: str) -> str:
+        """Converte um glob em regex sem âncora final (``fnmatch`` acrescenta ``\\Z``)."""
+        regex = fnmatch.translate(pattern)
+        return regex[:-2] if regex.endswith(r'\Z') else regex
+    
+    @staticmethod
+    def _literal_prefix(rule: Dict) -> str:
+        """Trecho literal do início do padrão de nome (vazio se não houver)."""
+        if 'name_glob' in rule:
+            pattern, stop = rule['name_glob'], '*?['
+        elif 'name_regex' in rule and '|' not in rule['name_regex']:
+            pattern, stop = rule['name_regex'], '\\.^$*+?{}[]()'
+        else:
+            return ''
+        
+        length = 0
+        while length < len(pattern) and pattern[length] not in stop:
+            length += 1
+        # Em regex, um quantificador após o literal torna o último caractere opcional
+        if 'name_regex' in rule and pattern[length:length + 1] in ('?', '*', '{'):
+            length -= 1
+        return pattern[:max(length, 0)].lower()
+    
+    def _compile_rule(self, position: int, rule: Dict) -> RoutingRule:
+        """Valida uma regra do JSON e a converte em ``RoutingRule``."""
+        name = rule.get('name', f"regra_{position + 1}")
+        destination = rule.get('destination')
+        if not destination:
+            raise ValueError(f"Regra '{name}': 'destination' é obrigatório")
+        
+        destination = destination.replace('\\', '/').strip('/')
+        if Path(rule['destination']).is_absolute() or '..' in destination.split('/'):
+            raise ValueError(f"Regra '{name}': o destino deve ser relativo à pasta de destino")
+        
+        fields_used = {field for _, field, _, _ in string.Formatter().parse(destination) if field is not None}
+        unknown = fields_used - self.PLACEHOLDERS
+        if unknown:
+            raise ValueError(f"Regra '{name}': marcadores desconhecidos {sorted(unknown)}")
+        
+        if 'name_glob' in rule and 'name_regex' in rule:
+            raise ValueError(f"Regra '{name}': use 'name_glob' ou 'name_regex', não ambos")
+        if 'name_regex' in rule:
+            if '(?P<' in rule['name_regex']:
+                raise ValueError(f"Regra '{name}': 'name_regex' não pode ter grupos nomeados")
+            name_pattern = f"(?:{rule['name_regex']})"
+        elif 'name_glob' in rule:
+            name_pattern = self._glob_to_regex(rule['name_glob'])
+        else:
+            name_pattern = r'[^\x00]*'
+        path_pattern = self._glob_to_regex(rule['path_glob']) if 'path_glob' in rule else r'[^\x00]*'
+        
+        extensions = rule.get('extensions')
+        if extensions is not None:
+            extensions = frozenset(
+                extension.lower() if extension.startswith('.') else f".{extension.lower()}"
+                for extension in extensions
+            )
+        
+        day = 24 * 3600
+        return RoutingRule(
+            name=name,
+            destination=destination,
+            pattern=re.compile(f"{name_pattern}\\x00{path_pattern}", re.IGNORECASE | re.DOTALL),
+            prefix=self._literal_prefix(rule),
+            extensions=extensions,
+            min_size=rule.get('min_size'),
+            max_size=rule.get('max_size'),
+            older_than=rule['older_than_days'] * day if 'older_than_days' in rule else None,
+            newer_than=rule['newer_than_days'] * day if 'newer_than_days' in rule else None,
+            uses_category='categoria' in fields_used
+        )
+    
+    def match(self, file_info: FileInfo, now: Optional[float] = None) -> Optional[RoutingRule]:
+        """Retorna a primeira regra que se aplica ao arquivo, ou None."""
+        group = self._groups.get(file_info.extension, self._wildcard)
+        if group is None:
+            return None
+        
+        name = file_info.name
+        key = f"{name}\x00{os.path.dirname(file_info.path_str).replace(os.sep, '/')}"
+        now = time.time() if now is None else now
+        
+        best = None
+        for i in group.prefixed(name.lower()):
+            rule = self.rules[i]
+            if rule.pattern.fullmatch(key) and rule.accepts(file_info, now):
+                best = i
+                break
+        
+        if group.loose_pattern is not None:
+            match = group.loose_pattern.fullmatch(key)
+            first = int(match.lastgroup[1:]) if match is not None else None
+            if first is not None and (best is None or first < best):
+                # Tamanho/idade podem reprovar a primeira: segue pelas seguintes
+                for i in group.loose[bisect.bisect_left(group.loose, first):]:
+                    if best is not None and i > best:
+                        break
+                    rule = self.rules[i]
+                    if rule.pattern.fullmatch(key) and rule.accepts(file_info, now):
+                        best = i
+                        break
+        
+        return self.rules[best] if best is not None else None
+
+
+class SmartFileOrganizer:
+    """
+    Organizador de arquivos inteligente com recursos avançados.
+    Versão 2025 com melhorias em performance, segurança e usabilidade.
+    """
+    
+    _shared_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _shared_executor_lock = threading.Lock()
+    _shared_executor_users = 0
+    
+    def __init__(self, config_file: Optional[str] = None,
+                 logger: Optional[logging.Logger] = None,
+                 report_sink: Optional[Callable[[Dict], None]] = None,
+                 output_dir: Optional[str] = None,
+                 backend: Optional[FilesystemBackend] = None):
+        """
+        Inicializa o organizador com configurações avançadas.
+        
+        Com um ``logger`` injetado o organizador roda em modo embutido: não
+        altera o logging global nem cria a pasta ``logs/``, de modo que a
+        construção não faz I/O além da leitura de ``config_file``. Nesse modo
+        o relatório só é gravado em disco com um ``output_dir`` explícito.
+        
+        Args:
+            config_file: Arquivo de configuração personalizada (JSON)
+            logger: Logger da aplicação hospedeira (ativa o modo embutido)
+            report_sink: Recebe o relatório final (dict) em vez de gravá-lo em ``reports/``
+            output_dir: Diretório base para ``logs/`` e ``reports/`` (padrão: diretório
+                atual; no modo embutido, sem ele o relatório não é gravado)
+            backend: Sistema de arquivos de origem e destino (padrão: ``LocalBackend``)
+        """
+        self.version = "2.0.0"
+        self.year = 2025
+        self.output_dir = Path(output_dir) if output_dir else Path(".")
+        self.report_sink = report_sink
+        # Modo embutido sem output_dir: nada é gravado no diretório atual da aplicação
+        self.save_reports = logger is None or output_dir is not None
+        # Modo embutido: o modo segundo plano não altera a prioridade do processo hospedeiro
+        self.lower_priority = logger is None
+        
+        # Configurações padrão expandidas para 2025
+        self.file_categories = {
+            'documentos': {
+                'extensions': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.xls', 
+                              '.xlsx', '.ppt', '.pptx', '.csv', '.ods', '.odp', '.pages',
+                              '.numbers', '.key', '.epub', '.mobi'],
+                'icon': '📄',
+                'description': 'Documentos e planilhas'
+            },
+            'imagens': {
+                'extensions': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.svg', 
+                              '.webp', '.ico', '.raw', '.psd', '.ai', '.sketch', '.fig',
+                              '.heic', '.heif', '.avif', '.jxl'],
+                'icon': '🖼️',
+                'description': 'Imagens e gráficos'
+            },
+            'videos': {
+                'extensions': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', 
+                              '.m4v', '.3gp', '.mpg', '.mpeg', '.ogv', '.f4v', '.asf',
+                              '.m2ts', '.mts', '.vob'],
+                'icon': '🎬',
+                'description': 'Vídeos e filmes'
+            },
+            'audios': {
+                'extensions': ['.mp3', '.wav', '.flac', '.aac', '.ogg', '.wma', '.m4a', 
+                              '.opus', '.aiff', '.alac', '.ape', '.dsd', '.pcm'],
+                'icon': '🎵',
+                'description': 'Áudios e música'
+            },
+            'compactados': {
+                'extensions': ['.zip', '.rar', '.7z', '.tar', '.gz', '.bz2', '.xz', 
+                              '.tar.gz', '.tar.bz2', '.tar.xz', '.lzma', '.zst'],
+                'icon': '📦',
+                'description': 'Arquivos compactados'
+            },
+            'executaveis': {
+                'extensions': ['.exe', '.msi', '.deb', '.rpm', '.dmg', '.pkg', '.appimage',
+                              '.snap', '.flatpak', '.app', '.run'],
+                'icon': '⚙️',
+                'description': 'Programas executáveis'
+            },
+            'codigo': {
+                'extensions': ['.py', '.js', '.ts', '.html', '.css', '.php', '.java', '.cpp', 
+                              '.c', '.h', '.json', '.xml', '.sql', '.sh', '.bat', '.ps1',
+                              '.go', '.rs', '.swift', '.kt', '.dart', '.vue', '.jsx', '.tsx'],
+                'icon': '💻',
+                'description': 'Código fonte'
+            },
+            'fontes': {
+                'extensions': ['.ttf', '.otf', '.woff', '.woff2', '.eot', '.fon', '.pfb', '.pfm'],
+                'icon': '🔤',
+                'description': 'Arquivos de fonte'
+            },
+            'ebooks': {
+                'extensions': ['.epub', '.mobi', '.azw', '.azw3', '.fb2', '.lit', '.pdb'],
+                'icon': '📚',
+                'description': 'Livros eletrônicos'
+            },
+            'outros': {
+                'extensions': [],
+                'icon': '📋',
+                'description': 'Outros arquivos'
+            }
+        }
+        
+        self.organization_mode = OrganizationMode.BY_TYPE_AND_DATE
+        self.duplicate_handling = "rename"  # Uma de DUPLICATE_POLICIES
+        self.max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.content_index = False  # Índice persistente de conteúdo do destino
+        self.content_sniffing = False  # Tipo pelo conteúdo quando a extensão não basta
+        self.routing_rules: Optional[RoutingRules] = None  # Regras de roteamento compiladas
+        self.event_buffer: Optional[EventRingBuffer] = None  # Eventos por arquivo para o painel ao vivo
+        self.catalog_enabled = False  # Catálogo SQLite do destino (--catalog; consultas com --find / --stats)
+        self._catalogs: Dict[str, Optional[DestinationCatalog]] = {}
+        self._catalogs_lock = threading.Lock()
+        self.incremental_scan = False  # Relista só as pastas da origem que mudaram
+        self.full_rescan_hours = 168.0  # Varredura completa periódica (padrão: semanal)
+        self.force_full_rescan = False
+        self._scan_snapshots: Dict[str, ScanSnapshot] = {}
+        self._scan_snapshots_lock = threading.Lock()
+        self.verify_copies = False  # MD5 durante cópias entre dispositivos
+        self.copy_chunk_size_mb = 8
+        self.max_mb_per_second = 0.0  # Banda de hash/cópia (0 = sem limite)
+        self.max_operations_per_second = 0.0  # Renomeações, vínculos e aberturas (0 = sem limite)
+        self.background_mode = False  # Prioridade baixa e recuo quando o disco fica lento
+        self.latency_threshold_ms = 50.0
+        self.throttle: Optional[IOThrottle] = None  # Criado a cada execução por _prepare_throttle
+        self.durability_mode = "none"  # Uma de DURABILITY_MODES
+        self.timeout_seconds = 300.0  # Sem progresso por mais que isso = operação parada (0 = sem limite)
+        self.watchdog: Optional[OperationWatchdog] = None  # Criado a cada execução por _prepare_watchdog
+        self.backend = backend or LocalBackend()  # Operações de arquivo da origem e do destino
+        self.transfer_engine = FileTransferEngine(self.backend)
+        
+        self._content_indexes: Dict[str, ContentIndex] = {}
+        self._content_indexes_lock = threading.Lock()
+        self._content_claims = ContentClaims()
+        # Vínculo indisponível (hardlink/reflink): um aviso por execução, não um por arquivo
+        self._link_fallback_warned = False
+        self._link_fallback_lock = threading.Lock()
+        self.locality = "none"  # Um de LOCALITY_MODES (--locality destination agrupa por pasta)
+        self.scheduling = "fifo"  # Uma de SCHEDULING_POLICIES
+        self.fast_lane_threshold_mb = 8.0  # Abaixo disso o arquivo é "pequeno" (faixa rápida)
+        # Nomes escolhidos e ainda não gravados: evita que dois arquivos de mesmo
+        # nome, em paralelo, recebam o mesmo destino (o rename sobrescreveria)
+        self._claimed_targets: set = set()
+        self._target_locks = [threading.Lock() for _ in range(16)]
+        # Watchdog da execução que a thread atual está servindo (ver ``_run_sealed``)
+        self._worker = threading.local()
+        
+        # Logging antes da configuração: load_config registra mensagens
+        if logger is not None:
+            self.logger = logger
+        else:
+            self.setup_logging()
+        
+        # Carrega configurações personalizadas se fornecidas
+        if config_file and Path(config_file).exists():
+            self.load_config(config_file)
+        
+        if logger is None:
+            self.logger.info(f"🚀 Organizador de Arquivos Inteligente {self.version} ({self.year}) iniciado")
+    
+    def setup_logging(self):
+        """Configura sistema de logging avançado."""
+        log_format = '%(asctime)s | %(levelname)8s | %(message)s'
+        
+        # Cria pasta de logs se não existir
+        log_dir = self.output_dir / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Nome do arquivo de log com timestamp
+        log_filename = f"organizador_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        log_path = log_dir / log_filename
+        
+        logging.basicConfig(
+            level=logging.INFO,
+            format=log_format,
+            handlers=[
+                logging.FileHandler(log_path, encoding='utf-8'),
+                logging.StreamHandler()
+            ]
+        )
+        self.logger = logging.getLogger(__name__)
+        
+        # Mantém apenas os 10 logs mais recentes
+        self.cleanup_old_logs(log_dir, keep_count=10)
+    
+    def cleanup_old_logs(self, log_dir: Path, keep_count: int = 10):
+        """Remove logs antigos mantendo apenas os mais recentes."""
+        try:
+            log_files = sorted(log_dir.glob("organizador_*.log"), key=lambda x: x.stat().st_mtime, reverse=True)
+            for old_log in log_files[keep_count:]:
+                old_log.unlink()
+                self.logger.debug(f"Log antigo removido: {old_log.name}")
+        except Exception as e:
+            self.logger.warning(f"Erro ao limpar logs antigos: {e}")
+    
+    def load_config(self, config_file: str):
+        """Carrega configurações personalizadas de arquivo JSON."""
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            
+            self.apply_config(config)
+            
+            self.logger.info(f"Configurações carregadas de: {config_file}")
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar configurações: {e}")
+    
+    def apply_config(self, config: Dict):
+        """Aplica um dicionário de configuração (formato do arquivo JSON)."""
+        if 'file_categories' in config:
+            self.file_categories.update(config['file_categories'])
+        
+        if 'organization_mode' in config:
+            self.organization_mode = OrganizationMode(config['organization_mode'])
+        
+        if 'duplicate_handling' in config:
+            self.duplicate_handling = config['duplicate_handling']
+        
+        if 'max_workers' in config:
+            self.max_workers = int(config['max_workers'])
+        
+        if 'content_index' in config:
+            self.content_index = bool(config['content_index'])
+        
+        if 'content_sniffing' in config:
+            self.content_sniffing = bool(config['content_sniffing'])
+        
+        if 'catalog' in config:
+            self.catalog_enabled = bool(config['catalog'])
+        
+        if 'locality' in config:
+            if config['locality'] not in LOCALITY_MODES:
+                raise ValueError(f"Ordem de despacho inválida: {config['locality']}")
+            self.locality = config['locality']
+        
+        if 'scheduling' in config:
+            if config['scheduling'] not in SCHEDULING_POLICIES:
+                raise ValueError(f"Política de escalonamento inválida: {config['scheduling']}")
+            self.scheduling = config['scheduling']
+        if 'fast_lane_threshold_mb' in config:
+            threshold = float(config['fast_lane_threshold_mb'])
+            if threshold <= 0:
+                # Com 0 todo arquivo seria "grande" e viraria um lote próprio
+                raise ValueError(f"fast_lane_threshold_mb deve ser maior que zero: {threshold:g}")
+            self.fast_lane_threshold_mb = threshold
+        
+        if 'durability' in config:
+            if config['durability'] not in DURABILITY_MODES:
+                raise ValueError(f"Modo de durabilidade inválido: {config['durability']}")
+            self.durability_mode = config['durability']
+        
+        if 'incremental_scan' in config:
+            self.incremental_scan = bool(config['incremental_scan'])
+        if 'full_rescan_hours' in config:
+            self.full_rescan_hours = float(config['full_rescan_hours'])
+        
+        throttling = config.get('throttling', {})
+        if 'max_mb_per_second' in throttling:
+            self.max_mb_per_second = float(throttling['max_mb_per_second'])
+        if 'max_operations_per_second' in throttling:
+            self.max_operations_per_second = float(throttling['max_operations_per_second'])
+        if 'background' in throttling:
+            self.background_mode = bool(throttling['background'])
+        if 'latency_threshold_ms' in throttling:
+            self.latency_threshold_ms = float(throttling['latency_threshold_ms'])
+        
+        if 'routing_rules' in config:
+            # Compiladas uma vez aqui; o custo por arquivo não cresce com o número de regras
+            rules = config['routing_rules']
+            self.routing_rules = RoutingRules(rules) if rules else None
+        
+        advanced = config.get('advanced_settings', {})
+        if 'enable_hash_verification' in advanced:
+            self.verify_copies = bool(advanced['enable_hash_verification'])
+        if 'chunk_size_mb' in advanced:
+            self.copy_chunk_size_mb = int(advanced['chunk_size_mb'])
+        if 'timeout_seconds' in advanced:
+            self.timeout_seconds = float(advanced['timeout_seconds'])
+        
+        self._extension_index = None
+    
+    def to_config_dict(self) -> Dict:
+        """Exporta as configurações atuais no formato aceito por ``apply_config``."""
+        return {
+            'file_categories': self.file_categories,
+            'organization_mode': self.organization_mode.value,
+            'duplicate_handling': self.duplicate_handling,
+            'max_workers': self.max_workers,
+            'content_index': self.content_index,
+            'content_sniffing': self.content_sniffing,
+            'catalog': self.catalog_enabled,
+            'durability': self.durability_mode,
+            'locality': self.locality,
+            'scheduling': self.scheduling,
+            'fast_lane_threshold_mb': self.fast_lane_threshold_mb,
+            'incremental_scan': self.incremental_scan,
+            'full_rescan_hours': self.full_rescan_hours,
+            'routing_rules': self.routing_rules.source if self.routing_rules else [],
+            'throttling': {
+                'max_mb_per_second': self.max_mb_per_second,
+                'max_operations_per_second': self.max_operations_per_second,
+                'background': self.background_mode,
+                'latency_threshold_ms': self.latency_threshold_ms
+            },
+            'advanced_settings': {
+                'enable_hash_verification': self.verify_copies,
+                'chunk_size_mb': self.copy_chunk_size_mb,
+                'timeout_seconds': self.timeout_seconds
+            }
+        }
+    
+    def save_config(self, config_file: str):
+        """Salva configurações atuais em arquivo JSON."""
+        try:
+            config = {
+                'version': self.version,
+                **self.to_config_dict(),
+                'last_updated': datetime.datetime.now().isoformat()
+            }
+            
+            with open(config_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+            
+            self.logger.info(f"Configurações salvas em: {config_file}")
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao salvar configurações: {e}")
+    
+    def get_file_info(self, file_path: Path) -> FileInfo:
+        """
+        Extrai informações detalhadas de um arquivo.
+        
+        Args:
+            file_path: Caminho do arquivo
+            
+        Returns:
+            FileInfo: Informações completas do arquivo
+        """
+        try:
+            return FileInfo.from_stat(os.fspath(file_path), self.backend.stat(file_path))
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao obter informações do arquivo {file_path}: {e}")
+            raise
+    
+    def calculate_file_hash(self, file_path: Path) -> str:
+        """
+        Calcula hash MD5 do arquivo para detecção de duplicatas.
+        
+        Args:
+            file_path: Caminho do arquivo
+            
+        Returns:
+            str: Hash MD5 do arquivo
+        """
+        return self._read_file_digest(file_path)[0]
+    
+    def _read_file_digest(self, file_path: Path, head_size: int = 0) -> Tuple[str, bytes]:
+        """
+        Lê o arquivo uma vez, devolvendo o MD5 e os primeiros ``head_size`` bytes.
+        
+        Returns:
+            Tuple[str, bytes]: (hash MD5, início do arquivo); ("", b"") em caso de erro
+        """
+        try:
+            hash_md5 = hashlib.md5()
+            head = b""
+            if self.throttle is not None:
+                self.throttle.operation()
+            with self.backend.open(file_path, "rb") as f:
+                # Lê em chunks para arquivos grandes
+                pipelined = (self.backend.local
+                             and os.fstat(f.fileno()).st_size >= PIPELINED_HASH_SIZE)
+                for chunk in self._read_chunks(f, pipelined):
+                    if head_size and not head:
+                        head = chunk[:head_size]
+                    hash_md5.update(chunk)
+            return hash_md5.hexdigest(), head
+        
+        except Exception as e:
+            self.logger.error(f"Erro ao calcular hash do arquivo {file_path}: {e}")
+            return "", b""
+    
+    def _read_chunks(self, f, pipelined: bool = False):
+        """
+        Blocos de ``HASH_CHUNK_SIZE`` de ``f``, contabilizados no ``throttle``.
+        
+        Cada bloco entregue conta como progresso no ``watchdog``.
+        
+        O MD5 é uma cadeia sequencial — não dá para dividir um arquivo em
+        pedaços hasheados em paralelo sem mudar o resultado. Com
+        ``pipelined`` a leitura roda numa thread até ``PIPELINE_DEPTH``
+        blocos à frente, sobrepondo o I/O ao hash (ambos liberam o GIL).
+        """
+        throttle = self.throttle
+        heartbeat = self.watchdog.heartbeat if self.watchdog is not None else None
+        
+        def read() -> bytes:
+            started = time.monotonic()
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if chunk and throttle is not None:
+                throttle.account(len(chunk), time.monotonic() - started)
+            return chunk
+        
+        if not pipelined:
+            for chunk in iter(read, b""):
+                if heartbeat is not None:
+                    heartbeat()
+                yield chunk
+            return
+        
+        chunks: queue.Queue = queue.Queue(maxsize=PIPELINE_DEPTH)
+        stop = threading.Event()
+        
+        def reader():
+            try:
+                while not stop.is_set():
+                    chunk = read()
+                    chunks.put(chunk)
+                    if not chunk:
+                        return
+            except Exception as e:
+                chunks.put(e)
+        
+        thread = threading.Thread(target=reader, name="organizador-leitura", daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if isinstance(chunk, Exception):
+                    raise chunk
+                if not chunk:
+                    return
+                if heartbeat is not None:
+                    heartbeat()
+                yield chunk
+        finally:
+            # Interrompido no meio: esvazia a fila para a thread não ficar presa no put
+            stop.set()
+            while thread.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    thread.join(0.01)
+    
+    def hash_file(self, file_info: FileInfo) -> str:
+        """
+        Calcula e guarda o hash do arquivo, aproveitando a mesma leitura para
+        a detecção de tipo por conteúdo quando ela for necessária.
+        """
+        sniff = self.needs_sniffing(file_info)
+        file_hash, head = self._read_file_digest(file_info.path_str, SNIFF_SIZE if sniff else 0)
+        file_info.hash_md5 = file_hash
+        if sniff:
+            self._apply_sniffing(file_info, head)
+        return file_hash
+    
+    def needs_sniffing(self, file_info: FileInfo) -> bool:
+        """Indica se o tipo deve ser detectado pelo conteúdo (extensão e MIME não bastam)."""
+        return (self.content_sniffing and file_info.category is None
+                and self._category_from_metadata(file_info) == 'outros')
+    
+    def ensure_category(self, file_info: FileInfo):
+        """Detecta o tipo pelo conteúdo se ainda for preciso (lê só o início do arquivo)."""
+        if not self.needs_sniffing(file_info):
+            return
+        if self.throttle is not None:
+            self.throttle.operation()
+        try:
+            with self.backend.open(file_info.path_str, "rb") as f:
+                head = f.read(SNIFF_SIZE)
+        except OSError:
+            head = b""
+        self._apply_sniffing(file_info, head)
+    
+    def _apply_sniffing(self, file_info: FileInfo, head: bytes):
+        """Aplica o resultado da detecção por conteúdo ao arquivo."""
+        detected = sniff_content_type(head, not file_info.extension)
+        if detected is None:
+            file_info.category = 'outros'
+            return
+        
+        file_info.mime_type, category = detected
+        if category not in self.file_categories:
+            category = self._category_from_metadata(file_info)
+        file_info.category = category
+    
+    @property
+    def file_categories(self) -> Dict[str, Dict]:
+        """Categorias configuradas; atribuir um novo dicionário invalida o índice de extensões."""
+        return self._file_categories
+    
+    @file_categories.setter
+    def file_categories(self, categories: Dict[str, Dict]):
+        self._file_categories = categories
+        self._extension_index = None
+    
+    def _rebuild_extension_index(self) -> Dict[str, str]:
+        """Recria o índice extensão → categoria (a primeira categoria listada vence)."""
+        index = {}
+        for category, info in self.file_categories.items():
+            for extension in info.get('extensions', []):
+                index.setdefault(extension.lower(), category)
+        self._extension_index = index
+        return index
+    
+    def _category_from_metadata(self, file_info: FileInfo) -> str:
+        """Categoria a partir da extensão e do MIME type deduzido do nome."""
+        # Verifica por extensão primeiro (o índice é recriado sob demanda)
+        index = self._extension_index
+        if index is None:
+            index = self._rebuild_extension_index()
+        category = index.get(file_info.extension)
+        if category is not None:
+            return category
+        
+        # Fallback por MIME type
+        mime_type = file_info.mime_type
+        if mime_type.startswith('image/'):
+            return 'imagens'
+        elif mime_type.startswith('video/'):
+            return 'videos'
+        elif mime_type.startswith('audio/'):
+            return 'audios'
+        elif mime_type.startswith('text/'):
+            return 'documentos'
+        
+        return 'outros'
+    
+    def get_file_category(self, file_info: FileInfo) -> str:
+        """
+        Determina a categoria de um arquivo baseado em extensão e MIME type
+        (ou no conteúdo, se a detecção por conteúdo já tiver sido aplicada).
+        
+        Args:
+            file_info: Informações do arquivo
+            
+        Returns:
+            str: Categoria do arquivo
+        """
+        if file_info.category is not None:
+            return file_info.category
+        return self._category_from_metadata(file_info)
+    
+    def get_organization_path(self, file_info: FileInfo, base_dest: Path) -> Path:
+        """
+        Determina o caminho de destino baseado no modo de organização.
+        
+        Args:
+            file_info: Informações do arquivo
+            base_dest: Diretório base de destino
+            
+        Returns:
+            Path: Caminho completo de destino
+        """
+        if self.routing_rules is not None:
+            rule = self.routing_rules.match(file_info)
+            if rule is not None:
+                return base_dest / rule.render(file_info, self.get_file_category)
+        
+        category = self.get_file_category(file_info)
+        
+        if self.organization_mode == OrganizationMode.BY_TYPE_AND_DATE:
+            modified = file_info.modified_date
+            date_folder = f"{modified.year}/{modified.month:02d}"
+            return base_dest / category / date_folder
+        
+        elif self.organization_mode == OrganizationMode.BY_TYPE_ONLY:
+            return base_dest / category
+        
+        elif self.organization_mode == OrganizationMode.BY_DATE_ONLY:
+            modified = file_info.modified_date
+            date_folder = f"{modified.year}/{modified.month:02d}"
+            return base_dest / date_folder
+        
+        elif self.organization_mode == OrganizationMode.BY_SIZE:
+            if file_info.size < 1024 * 1024:  # < 1MB
+                size_category = "pequenos"
+            elif file_info.size < 100 * 1024 * 1024:  # < 100MB
+                size_category = "medios"
+            else:
+                size_category = "grandes"
+            return base_dest / size_category / category
+        
+        return base_dest / category
+    
+    def create_unique_filename(self, destination: Path,
+                               reserved: Optional[set] = None,
+                               exists: Optional[Callable] = None) -> Path:
+        """
+        Cria nome único para evitar sobrescrita com estratégia inteligente.
+        
+        Args:
+            destination: Caminho de destino desejado
+            reserved: Caminhos já reservados por movimentos ainda não executados
+            exists: Verificação de existência (padrão: a do ``backend``)
+            
+        Returns:
+            Path: Caminho único para o arquivo
+        """
+        reserved = reserved or set()
+        exists = exists or self.backend.exists
+        if destination not in reserved and not exists(destination):
+            return destination
+        
+        stem = destination.stem
+        suffix = destination.suffix
+        parent = destination.parent
+        
+        # Estratégia: nome_arquivo (1), nome_arquivo (2), etc.
+        counter = 1
+        while True:
+            new_name = f"{stem} ({counter}){suffix}"
+            new_path = parent / new_name
+            if new_path not in reserved and not exists(new_path):
+                return new_path
+            counter += 1
+            
+            # Proteção contra loop infinito
+            if counter > 9999:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                new_name = f"{stem}_{timestamp}{suffix}"
+                return parent / new_name
+    
+    def needs_hash(self) -> bool:
+        """Indica se a política de duplicatas exige o hash dos arquivos."""
+        # "rename" mantém todas as cópias: sem índice, o hash não muda o resultado
+        return self.duplicate_handling != "rename" or self.uses_content_index()
+    
+    def uses_content_index(self) -> bool:
+        """Índice de conteúdo ativo (só existe em backend local: é gravado no destino)."""
+        return self.content_index and self.backend.local
+    
+    def get_content_index(self, destination_dir: Path) -> Optional['ContentIndex']:
+        """Índice de conteúdo do destino (carregado uma vez por organizador), se ativo."""
+        if not self.uses_content_index():
+            return None
+        
+        key = str(Path(destination_dir).resolve())
+        with self._content_indexes_lock:
+            index = self._content_indexes.get(key)
+            if index is None:
+                index = ContentIndex.open(Path(destination_dir), self.logger)
+                self._content_indexes[key] = index
+            return index
+    
+    def rebuild_content_index(self, destination_dir: str) -> 'ContentIndex':
+        """Recria o índice de conteúdo a partir do destino atual."""
+        key = str(Path(destination_dir).resolve())
+        index = ContentIndex.open(Path(destination_dir), self.logger, rebuild=True)
+        with self._content_indexes_lock:
+            self._content_indexes[key] = index
+        return index
+    
+    def _find_duplicate(self, file_info: FileInfo, duplicate_hashes: Dict[str, Path],
+                        index: Optional['ContentIndex']) -> Optional[Path]:
+        """
+        Procura uma cópia já organizada com o mesmo conteúdo.
+        
+        Com o índice ativo, o hash só é calculado se o destino já tiver algum
+        arquivo do mesmo tamanho; caso contrário não pode haver duplicata.
+        """
+        if index is not None and not index.has_size(file_info.size):
+            return None
+        
+        file_hash = file_info.hash_md5 or self.hash_file(file_info)
+        if not file_hash:
+            return None
+        
+        if index is not None:
+            return index.find(file_info.size, file_hash, self.calculate_file_hash)
+        return duplicate_hashes.get(file_hash)
+    
+    def _register_file(self, file_info: FileInfo, target_file: Path, destination_dir: Path,
+                       duplicate_hashes: Dict[str, Path], index: Optional['ContentIndex'],
+                       kind: str = "move"):
+        """Registra o arquivo organizado para a detecção de duplicatas e no catálogo."""
+        if self._run_sealed():
+            return
+        if index is not None:
+            relative_path = target_file.relative_to(destination_dir).as_posix()
+            index.add(file_info.size, file_info.hash_md5, relative_path)
+        elif file_info.hash_md5:
+            duplicate_hashes[file_info.hash_md5] = target_file
+        self._catalog_file(file_info, target_file, destination_dir, kind)
+    
+    def get_catalog(self, destination_dir: Path) -> Optional['DestinationCatalog']:
+        """Catálogo SQLite do destino (aberto uma vez por organizador), se ativo."""
+        if not self.catalog_enabled or not self.backend.local or self._run_sealed():
+            return None
+        
+        key = str(Path(destination_dir).resolve())
+        with self._catalogs_lock:
+            if key not in self._catalogs:
+                try:
+                    self._catalogs[key] = DestinationCatalog.open(Path(destination_dir), self.logger)
+                except (OSError, sqlite3.Error) as e:
+                    self.logger.warning(f"⚠️ Catálogo do destino indisponível: {e}")
+                    self._catalogs[key] = None
+            return self._catalogs[key]
+    
+    def close_catalogs(self):
+        """Grava o pendente e fecha as conexões dos catálogos abertos (reabertos sob demanda)."""
+        with self._catalogs_lock:
+            catalogs, self._catalogs = self._catalogs, {}
+        for catalog in catalogs.values():
+            if catalog is None:
+                continue
+            try:
+                catalog.close()
+            except sqlite3.Error as e:
+                self.logger.warning(f"⚠️ Erro ao fechar o catálogo do destino: {e}")
+    
+    def rebuild_catalog(self, destination_dir: str) -> Optional['DestinationCatalog']:
+        """Recria o catálogo a partir do destino atual (ex.: após alterações externas)."""
+        catalog = self.get_catalog(Path(destination_dir))
+        if catalog is not None:
+            count = catalog.rebuild(self.get_file_category)
+            self.logger.info(f"🗂️ Catálogo recriado: {count} arquivo(s)")
+        return catalog
+    
+    def _catalog_file(self, file_info: FileInfo, target_file: Path, destination_dir: Path,
+                      kind: str = "move"):
+        """Enfileira o arquivo organizado no catálogo do destino."""
+        catalog = self.get_catalog(destination_dir)
+        if catalog is not None:
+            relative_path = target_file.relative_to(destination_dir).as_posix()
+            catalog.add(relative_path, file_info, self.get_file_category(file_info), kind)
+    
+    def _uncatalog_file(self, target_file: Path, destination_dir: Path):
+        """Enfileira a remoção de um arquivo apagado do destino."""
+        catalog = self.get_catalog(destination_dir)
+        if catalog is not None:
+            try:
+                catalog.remove(target_file.relative_to(destination_dir).as_posix())
+            except ValueError:
+                pass  # não estava no destino (cópia anterior ainda na origem)
+    
+    def _link_duplicate(self, file_info: FileInfo, existing: Path,
+                        destination_dir: Path) -> Optional[Path]:
+        """
+        Organiza uma duplicata como hardlink/reflink de ``existing`` e remove a origem.
+        
+        Returns:
+            Optional[Path]: Caminho criado, ou None se o vínculo não for possível
+            (o arquivo deve então ser movido normalmente)
+        """
+        self.ensure_category(file_info)
+        target_dir = self.get_organization_path(file_info, destination_dir)
+        self.backend.makedirs(target_dir)
+        target_file = self._claim_target(target_dir / file_info.name)
+        
+        try:
+            if self.duplicate_handling == "hardlink":
+                linked = self.transfer_engine.hardlink(existing, target_file)
+            else:
+                linked = self.transfer_engine.reflink(existing, target_file, metadata_from=file_info.path)
+        finally:
+            self._release_target(target_file)
+        
+        if not linked:
+            self._warn_link_unavailable(file_info)
+            return None
+        
+        self._remove_linked_source(file_info, target_file)
+        file_info.target_path = target_file
+        # No índice também: se a cópia canônica sair do destino, o vínculo segue valendo
+        self._register_file(file_info, target_file, destination_dir, {},
+                            self.get_content_index(destination_dir), kind=self.duplicate_handling)
+        return target_file
+    
+    def _warn_link_unavailable(self, file_info: FileInfo):
+        """Avisa, uma vez por execução, que a duplicata será movida sem vínculo."""
+        with self._link_fallback_lock:
+            warn, self._link_fallback_warned = not self._link_fallback_warned, True
+        if warn:
+            self.logger.warning(f"⚠️ {self.duplicate_handling} não suportado neste sistema de arquivos "
+                                f"({file_info.name}); as duplicatas serão movidas sem vínculo")
+        self.logger.debug(f"{self.duplicate_handling} indisponível para {file_info.name}, movendo")
+    
+    def _remove_linked_source(self, file_info: FileInfo, target_file: Path):
+        """Remove a origem de uma duplicata já vinculada em ``target_file``."""
+        durability = self.transfer_engine.durability
+        if durability is None or self._run_sealed():
+            self.backend.unlink(file_info.path)
+        else:
+            durability.placed(target_file, data_written=self.duplicate_handling == "reflink")
+            durability.remove_source(file_info.path)
+    
+    def _move_to_destination(self, file_info: FileInfo, destination_dir: Path) -> Path:
+        """Move o arquivo para a pasta de destino com nome único e devolve o caminho final."""
+        self.ensure_category(file_info)
+        
+        # Determina pasta de destino
+        target_dir = self.get_organization_path(file_info, destination_dir)
+        self.backend.makedirs(target_dir)
+        
+        # Reserva um nome único até o movimento terminar
+        target_file = self._claim_target(target_dir / file_info.name)
+        
+        # Move o arquivo
+        try:
+            self._move_file(file_info, target_file)
+        finally:
+            self._release_target(target_file)
+        return target_file
+    
+    def _claim_target(self, destination: Path) -> Path:
+        """Escolhe um nome livre para ``destination`` e o reserva até ``_release_target``."""
+        with self._target_locks[hash(destination.parent) % len(self._target_locks)]:
+            target_file = self.create_unique_filename(destination, self._claimed_targets)
+            self._claimed_targets.add(target_file)
+        return target_file
+    
+    def _release_target(self, target_file: Path):
+        """Libera a reserva (o arquivo já existe no disco, ou o movimento falhou)."""
+        with self._target_locks[hash(target_file.parent) % len(self._target_locks)]:
+            self._claimed_targets.discard(target_file)
+    
+    def _move_file(self, file_info: FileInfo, target_file: Path):
+        """Move via ``transfer_engine``; o hash calculado numa cópia verificada é reaproveitado."""
+        digest = self.transfer_engine.move(file_info.path, target_file,
+                                           verify=self.verify_copies,
+                                           chunk_size=self.copy_chunk_size_mb * 1024 * 1024,
+                                           expected_hash=file_info.hash_md5)
+        if digest and not file_info.hash_md5:
+            file_info.hash_md5 = digest
+        file_info.target_path = target_file
+    
+    def process_single_file(self, file_info: FileInfo, destination_dir: Path, 
+                           duplicate_hashes: Dict[str, Path]) -> Tuple[bool, str]:
+        """
+        Processa um único arquivo com tratamento avançado de duplicatas.
+        
+        Args:
+            file_info: Informações do arquivo
+            destination_dir: Diretório de destino
+            duplicate_hashes: Dicionário de hashes para detecção de duplicatas
+            
+        Returns:
+            Tuple[bool, str]: (sucesso, mensagem)
+        """
+        with self._throttle_slot(), self._watch(file_info):
+            started = time.monotonic()
+            success, message = False, f"❌ Erro ao processar {file_info.name}"
+            try:
+                success, message = self._process_single_file(file_info, destination_dir, duplicate_hashes)
+                return success, message
+            finally:
+                self._publish_event(file_info, started, success, message)
+    
+    def _process_batch(self, batch: deque, destination_dir: Path,
+                       duplicate_hashes: Dict[str, Path],
+                       stop: Optional[threading.Event] = None) -> List[Tuple[FileInfo, bool, str]]:
+        """
+        Processa em sequência um lote de ``_locality_batches`` (mesma pasta de destino).
         
-        # Carrega configurações personalizadas se fornecidas
-        if config_file and Path(config_file).exists():
-            self.load_config(config_file)
+        Com ``stop`` sinalizado os arquivos ainda não iniciados do lote são
+        deixados de fora do resultado. Um erro inesperado vira falha do
+        arquivo, sem perder o resto do lote.
+        """
+        results = []
+        for file_info in self._consume(batch, results, stop):
+            try:
+                outcome = self.process_single_file(file_info, destination_dir, duplicate_hashes)
+            except Exception as e:
+                outcome = (False, f"❌ Erro no processamento: {e}")
+                self.logger.error(outcome[1])
+            results.append((file_info, *outcome))
+        return results
+    
+    def _consume(self, batch: deque, results: list, stop: Optional[threading.Event] = None):
+        """
+        Retira os itens de ``batch`` um a um, na hora de processá-los.
         
-        self.setup_logging()
-        self.logger.info(f"🚀 Organizador de Arquivos Inteligente {self.version} ({self.year}) iniciado")
+        Enquanto isso o lote e a lista ``results`` ficam registrados no
+        ``watchdog``: se o item atual parar, o laço de despacho recolhe os
+        resultados prontos e redistribui o que ainda não foi retirado.
+        """
+        with self.watchdog.running(batch, results) if self.watchdog is not None else nullcontext():
+            while stop is None or not stop.is_set():
+                try:
+                    item = batch.popleft()
+                except IndexError:
+                    return
+                yield item
     
-    def setup_logging(self):
-        """Configura sistema de logging avançado."""
-        log_format = '%(asctime)s | %(levelname)8s | %(message)s'
+    def _locality_batches(self, items: List, target_dir: Callable, source_path: Callable) -> List[List]:
+        """
+        Agrupa o plano por pasta de destino (e de origem) em lotes de até ``LOCALITY_BATCH_SIZE``.
         
-        # Cria pasta de logs se não existir
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        Cada lote vai inteiro para um worker: as gravações de uma pasta não se
+        intercalam com as de centenas de outras (menos disputa pelo lock do
+        diretório e caches de dentries/inodes quentes, o que pesa em NFS/SMB).
+        Os grupos maiores são despachados primeiro.
         
-        # Nome do arquivo de log com timestamp
-        log_filename = f"organizador_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        log_path = log_dir / log_filename
+        Args:
+            items: Arquivos (ou ações) a despachar
+            target_dir: Pasta de destino de um item
+            source_path: Caminho de origem (str) de um item
+            
+        Returns:
+            List[List]: Lotes na ordem de despacho (um item por lote sem localidade)
+        """
+        if self.locality == "none":
+            return [[item] for item in items]
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            handlers=[
-                logging.FileHandler(log_path, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        by_source = self.locality == "destination_source"
+        groups: Dict[tuple, List] = defaultdict(list)
+        for item in items:
+            source = source_path(item)
+            key = (os.fspath(target_dir(item)), os.path.dirname(source) if by_source else "")
+            groups[key].append((source, item))
         
-        # Mantém apenas os 10 logs mais recentes
-        self.cleanup_old_logs(log_dir, keep_count=10)
+        batches = []
+        for key in sorted(groups, key=lambda key: (-len(groups[key]), key)):
+            # Dentro do grupo, na ordem da origem (mesmo diretório lido em sequência)
+            group = [item for _, item in sorted(groups[key], key=lambda entry: entry[0])]
+            for start in range(0, len(group), LOCALITY_BATCH_SIZE):
+                batches.append(group[start:start + LOCALITY_BATCH_SIZE])
+        return batches
     
-    def cleanup_old_logs(self, log_dir: Path, keep_count: int = 10):
-        """Remove logs antigos mantendo apenas os mais recentes."""
-        try:
-            log_files = sorted(log_dir.glob("organizador_*.log"), key=lambda x: x.stat().st_mtime, reverse=True)
-            for old_log in log_files[keep_count:]:
-                old_log.unlink()
-                self.logger.debug(f"Log antigo removido: {old_log.name}")
-        except Exception as e:
-            self.logger.warning(f"Erro ao limpar logs antigos: {e}")
+    def _schedule_batches(self, items: List, target_dir: Callable, source_path: Callable,
+                          size_of: Callable) -> List[List]:
+        """
+        Monta os lotes na ordem de despacho de ``scheduling``.
+        
+        Com ``largest_first`` os arquivos grandes (a partir de
+        ``fast_lane_threshold_mb``) viram lotes de um item — vários vídeos da
+        mesma pasta não ficam em fila num único worker — e todos os lotes são
+        ordenados do maior para o menor em bytes: os longos começam cedo e os
+        pequenos preenchem as brechas no fim, em vez de um arquivo de vários
+        GB submetido por último segurar a execução inteira.
+        """
+        if self.scheduling == "fifo":
+            return self._locality_batches(items, target_dir, source_path)
+        
+        threshold = self.fast_lane_threshold_mb * 1024 * 1024
+        large = [[item] for item in items if size_of(item) >= threshold]
+        small = [item for item in items if size_of(item) < threshold]
+        batches = large + self._locality_batches(small, target_dir, source_path)
+        batches.sort(key=lambda batch: sum(size_of(item) for item in batch), reverse=True)
+        return batches
     
-    def load_config(self, config_file: str):
-        """Carrega configurações personalizadas de arquivo JSON."""
-        try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            if 'file_categories' in config:
-                self.file_categories.update(config['file_categories'])
-            
-            if 'organization_mode' in config:
-                self.organization_mode = OrganizationMode(config['organization_mode'])
+    def _file_batches(self, files: List[FileInfo], destination_dir: Path) -> List[List[FileInfo]]:
+        """``_schedule_batches`` para arquivos ainda não planejados."""
+        return self._schedule_batches(
+            files,
+            lambda file_info: self.get_organization_path(file_info, destination_dir),
+            lambda file_info: file_info.path_str,
+            lambda file_info: file_info.size
+        )
+    
+    def fast_lane_workers(self) -> int:
+        """Workers reservados aos lotes menores (0 com ``fifo`` ou um único worker)."""
+        if self.scheduling == "fifo" or self.max_workers < 2:
+            return 0
+        return max(1, self.max_workers // 4)
+    
+    def _run_lanes(self, batches: List[List], run_batch: Callable, stats: OrganizationStats,
+                   item_file: Callable = lambda item: item):
+        """
+        Executa os lotes (já ordenados) nas duas faixas e os devolve conforme terminam.
+        
+        A faixa principal consome a fila pela frente (lotes maiores) e a faixa
+        rápida por trás (menores); cada tarefa retira o lote só quando começa,
+        então uma faixa ociosa continua consumindo o que a outra não pegou.
+        
+        Com ``watchdog`` a espera é periódica: um arquivo parado vai para a
+        quarentena (``StallQuarantine``), os resultados já prontos do lote
+        dele são entregues, o resto do lote volta para a fila e a execução
+        termina sem esperar indefinidamente pelas operações presas, que são
+        relatadas como falha. Se todos os workers ficarem presos, o que ainda
+        estava na fila é relatado como não processado.
+        
+        Args:
+            batches: Lotes na ordem de despacho
+            run_batch: Processa um lote (``deque``) até o fim ou até o ``stop``
+                (``threading.Event``) recebido, e devolve os resultados
+            stats: Estatísticas da execução (novas tentativas e arquivos presos)
+            item_file: ``FileInfo`` de um item dos lotes
             
-            if 'duplicate_handling' in config:
-                self.duplicate_handling = config['duplicate_handling']
+        Yields:
+            Tuple[List, List]: (lote, resultados ``(arquivo, sucesso, mensagem)``)
+        """
+        pending = deque(deque(batch) for batch in batches)
+        pending_lock = threading.Lock()
+        # Sinalizado ao sair (fim, erro ou abandono): os lotes em andamento param
+        # depois do arquivo atual em vez de seguir movendo em segundo plano
+        stop = threading.Event()
+        
+        def lane_task(from_front: bool):
+            with pending_lock:
+                if not pending or stop.is_set():
+                    return None, []
+                batch = pending.popleft() if from_front else pending.pop()
+            return batch, run_batch(batch, stop)
+        
+        fast_workers = self.fast_lane_workers()
+        lanes = [(concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers - fast_workers), True)]
+        if fast_workers:
+            lanes.append((concurrent.futures.ThreadPoolExecutor(max_workers=fast_workers), False))
+        
+        # Com ``watchdog``, as conclusões chegam por uma fila (e não por
+        # ``concurrent.futures.wait``, que percorre todas as tarefas pendentes a cada chamada)
+        completed: queue.Queue = queue.Queue()
+        
+        def dispatch(count: int) -> set:
+            submitted = {executor.submit(lane_task, from_front)
+                         for executor, from_front in lanes for _ in range(count)}
+            if self.watchdog is not None:
+                for future in submitted:
+                    future.add_done_callback(completed.put)
+            return submitted
+        
+        futures = dispatch(len(pending))
+        if self.watchdog is None:
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    batch, results = future.result()
+                    if batch is not None:
+                        yield batch, results
+            finally:
+                stop.set()
+                for executor, _ in lanes:
+                    executor.shutdown()
+            return
+        
+        quarantine = StallQuarantine(self.watchdog, [item for batch in batches for item in batch],
+                                     item_file, stats, self.logger)
+        abandoned: List[deque] = []
+        drained = False
+        
+        def collect(timeout: Optional[float]) -> List[concurrent.futures.Future]:
+            done = []
+            try:
+                done.append(completed.get(timeout=timeout) if timeout else completed.get_nowait())
+                while True:
+                    done.append(completed.get_nowait())
+            except queue.Empty:
+                pass
+            futures.difference_update(done)
+            return done
+        
+        try:
+            while not quarantine.finished:
+                for future in collect(quarantine.wait_timeout()):
+                    batch, results = future.result()
+                    if batch is not None:
+                        yield batch, quarantine.filter(results)
+                
+                remainders, ready = quarantine.detect()
+                if ready:
+                    yield [file_info for file_info, _, _ in ready], ready
+                with pending_lock:
+                    requeued = remainders + quarantine.due()
+                    pending.extendleft(reversed(requeued))
+                    if pending and quarantine.stuck >= self.max_workers and quarantine.settled:
+                        abandoned = list(pending)
+                        pending.clear()
+                if abandoned:
+                    self.logger.error("⏳ Todos os workers estão parados; o restante da fila "
+                                      "não será processado")
+                    break
+                if requeued:
+                    futures |= dispatch(len(requeued))
             
-            self.logger.info(f"Configurações carregadas de: {config_file}")
+            # Operações que terminaram junto com a última verificação
+            for future in collect(None):
+                batch, results = future.result()
+                if batch is not None:
+                    yield batch, quarantine.filter(results)
+            leftovers = quarantine.abandon(abandoned)
+            drained = True
+            if leftovers:
+                yield [file_info for file_info, _, _ in leftovers], leftovers
+        finally:
+            # As tarefas ainda na fila são descartadas
+            stop.set()
+            for future in futures:
+                future.cancel()
+            if not drained:
+                # Saída por erro: os lotes em andamento terminam o arquivo atual
+                # antes do retorno; só as operações presas não são esperadas
+                concurrent.futures.wait(futures, timeout=self.watchdog.timeout)
+            for executor, _ in lanes:
+                executor.shutdown(wait=False)
+    
+    def _throttle_slot(self):
+        """Vaga de arquivo em andamento no ``throttle`` (nada a reservar sem ele)."""
+        return self.throttle.slot() if self.throttle is not None else nullcontext()
+    
+    def _prepare_throttle(self, share: int = 1, shared: Optional['IOThrottle'] = None):
+        """
+        Cria o ``throttle`` da execução a partir da configuração atual.
         
-        except Exception as e:
-            self.logger.error(f"Erro ao carregar configurações: {e}")
+        Args:
+            share: Número de processos que dividem os limites (modo multiprocesso)
+            shared: Throttle comum a vários organizadores (``JobScheduler``),
+                usado no lugar dos limites desta configuração
+        """
+        if shared is not None:
+            self.throttle = shared
+        elif not (self.max_mb_per_second or self.max_operations_per_second or self.background_mode):
+            self.throttle = None
+        else:
+            self.throttle = IOThrottle(
+                bytes_per_second=self.max_mb_per_second * 1024 * 1024 / share,
+                operations_per_second=self.max_operations_per_second / share,
+                max_concurrency=self.max_workers,
+                latency_threshold=self.latency_threshold_ms / 1000 if self.background_mode else None
+            )
+            limits = []
+            if self.max_mb_per_second:
+                limits.append(f"{self.max_mb_per_second:g} MB/s")
+            if self.max_operations_per_second:
+                limits.append(f"{self.max_operations_per_second:g} op/s")
+            if self.background_mode:
+                limits.append(f"segundo plano (recuo acima de {self.latency_threshold_ms:g} ms)")
+                applied = lower_process_priority() if self.lower_priority else []
+                if applied:
+                    self.logger.info(f"🐢 Prioridade reduzida: {', '.join(applied)}")
+            if share == 1:
+                self.logger.info(f"🚦 Limites de I/O: {'; '.join(limits)}")
+        self.transfer_engine.throttle = self.throttle
     
-    def save_config(self, config_file: str):
-        """Salva configurações atuais em arquivo JSON."""
+    def _prepare_durability(self):
+        """Cria o ``DurabilityManager`` da execução conforme ``durability_mode``."""
+        # fsync só tem sentido no disco (um backend em memória não tem o que sincronizar)
+        if self.durability_mode == "none" or not self.backend.local:
+            self.transfer_engine.durability = None
+        else:
+            self.transfer_engine.durability = DurabilityManager(self.durability_mode, logger=self.logger)
+    
+    def _prepare_links(self):
+        """Rearma o aviso de vínculo indisponível para a nova execução."""
+        with self._link_fallback_lock:
+            self._link_fallback_warned = False
+    
+    def _prepare_watchdog(self):
+        """Cria o ``OperationWatchdog`` da execução conforme ``timeout_seconds``."""
+        if self.timeout_seconds > 0:
+            self.watchdog = OperationWatchdog(self.timeout_seconds)
+            self.transfer_engine.heartbeat = self.watchdog.heartbeat
+        else:
+            self.watchdog = None
+            self.transfer_engine.heartbeat = None
+    
+    @contextmanager
+    def _watch(self, file_info: FileInfo):
+        """Registro de ``file_info`` no ``watchdog`` (nada a registrar sem ele)."""
+        watchdog = self.watchdog
+        if watchdog is None:
+            yield
+            return
+        self._worker.watchdog = watchdog
         try:
-            config = {
-                'version': self.version,
-                'file_categories': self.file_categories,
-                'organization_mode': self.organization_mode.value,
-                'duplicate_handling': self.duplicate_handling,
-                'last_updated': datetime.datetime.now().isoformat()
-            }
-            
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
-            
-            self.logger.info(f"Configurações salvas em: {config_file}")
+            with watchdog.track(file_info):
+                yield
+        finally:
+            self._worker.watchdog = None
+            if watchdog.closed:
+                self.logger.warning(f"⏳ Operação presa em {file_info.name} terminou depois do "
+                                    f"fim da execução (não registrada no índice nem no catálogo)")
+    
+    def _run_sealed(self) -> bool:
+        """Se a thread atual conclui uma operação presa de uma execução já encerrada."""
+        watchdog = getattr(self._worker, "watchdog", None)
+        return watchdog is not None and watchdog.closed
+    
+    def _seal_run(self):
+        """
+        Encerra o estado da execução antes de gravá-lo (índice, catálogo, retrato).
         
-        except Exception as e:
-            self.logger.error(f"Erro ao salvar configurações: {e}")
+        Threads abandonadas pela quarentena que ainda concluírem uma operação
+        presa não tocam mais o índice nem o catálogo, e a durabilidade passa
+        a sincronizar e remover a origem delas na hora.
+        """
+        if self.watchdog is not None:
+            self.watchdog.closed = True
+        if self.transfer_engine.durability is not None:
+            self.transfer_engine.durability.close()
     
-    def get_file_info(self, file_path: Path) -> FileInfo:
+    def stuck_operations(self) -> int:
         """
-        Extrai informações detalhadas de um arquivo.
+        Operações de arquivo ainda em andamento — depois de uma execução, as que ficaram presas.
         
-        Args:
-            file_path: Caminho do arquivo
-            
-        Returns:
-            FileInfo: Informações completas do arquivo
+        O processo não deve esperar por elas ao sair (``os._exit``): o
+        ``concurrent.futures`` aguarda as threads dos pools no encerramento.
         """
+        return self.watchdog.in_flight() if self.watchdog is not None else 0
+    
+    def _publish_event(self, file_info: FileInfo, started: float, success: bool, message: str):
+        """Publica o resultado de um arquivo no ``event_buffer`` (se houver um painel ouvindo)."""
+        if self.event_buffer is None:
+            return
+        finished = time.monotonic()
+        self.event_buffer.append(FileEvent(
+            name=file_info.name,
+            category=self.get_file_category(file_info),
+            size=file_info.size,
+            duration=finished - started,
+            success=success,
+            message=message,
+            timestamp=finished
+        ))
+    
+    def _process_single_file(self, file_info: FileInfo, destination_dir: Path,
+                             duplicate_hashes: Dict[str, Path]) -> Tuple[bool, str]:
+        """Corpo de ``process_single_file``."""
         try:
-            stat = file_path.stat()
-            
-            # Datas de criação e modificação
-            created_date = datetime.datetime.fromtimestamp(stat.st_ctime)
-            modified_date = datetime.datetime.fromtimestamp(stat.st_mtime)
+            if not self.needs_hash():
+                target_file = self._move_to_destination(file_info, destination_dir)
+                self._catalog_file(file_info, target_file, destination_dir)
+            else:
+                index = self.get_content_index(destination_dir)
+                
+                # Hash antes da reserva, sem lock (pode ser um arquivo de vários GB).
+                # Com o índice, tamanho inédito dispensa o hash, a menos que outro
+                # arquivo do mesmo tamanho esteja em andamento
+                if index is None or index.has_size(file_info.size) or self._content_claims.busy(file_info.size):
+                    self.hash_file(file_info)
+                
+                # Só arquivos com o mesmo conteúdo esperam um pelo outro, da
+                # verificação ao registro (ou à falha do movimento)
+                with self._content_claims.claim(file_info.size, file_info.hash_md5 or None, self.watchdog):
+                    duplicate = self._find_duplicate(file_info, duplicate_hashes, index)
+                    
+                    if duplicate is not None:
+                        if self.duplicate_handling == "skip":
+                            return False, f"Duplicata ignorada: {file_info.name}"
+                        elif self.duplicate_handling == "replace":
+                            # Remove arquivo duplicado anterior
+                            self.backend.unlink(duplicate)
+                            self._uncatalog_file(duplicate, destination_dir)
+                            if index is not None and not self._run_sealed():
+                                index.remove(file_info.size, file_info.hash_md5,
+                                             duplicate.relative_to(destination_dir).as_posix())
+                        elif self.duplicate_handling in ("hardlink", "reflink"):
+                            target_file = self._link_duplicate(file_info, duplicate, destination_dir)
+                            if target_file is not None:
+                                relative_path = target_file.relative_to(destination_dir)
+                                return True, f"🔗 Duplicata vinculada: {file_info.name} → {relative_path}"
+                    
+                    target_file = self._move_to_destination(file_info, destination_dir)
+                    self._register_file(file_info, target_file, destination_dir,
+                                        duplicate_hashes, index)
+                    if duplicate is not None and self.duplicate_handling in ("hardlink", "reflink"):
+                        # Vínculo indisponível: ainda é uma duplicata, só que movida como cópia
+                        relative_path = target_file.relative_to(destination_dir)
+                        return True, f"📋 Duplicata movida sem vínculo: {file_info.name} → {relative_path}"
             
-            # MIME type
-            mime_type, _ = mimetypes.guess_type(str(file_path))
-            if not mime_type:
-                mime_type = "application/octet-stream"
+            relative_path = target_file.relative_to(destination_dir)
             
-            return FileInfo(
-                path=file_path,
-                size=stat.st_size,
-                created_date=created_date,
-                modified_date=modified_date,
-                extension=file_path.suffix.lower(),
-                mime_type=mime_type
-            )
+            return True, f"✅ {file_info.name} → {relative_path}"
         
         except Exception as e:
-            self.logger.error(f"Erro ao obter informações do arquivo {file_path}: {e}")
-            raise
+            return False, f"❌ Erro ao processar {file_info.name}: {e}"
     
-    def calculate_file_hash(self, file_path: Path) -> str:
+    def scan_source(self, source_path: Path, include_subdirs: bool,
+                    stats: OrganizationStats,
+                    stop: Optional[threading.Event] = None) -> List[FileInfo]:
         """
-        Calcula hash MD5 do arquivo para detecção de duplicatas.
+        Coleta os arquivos da origem, atualizando total e tamanho nas estatísticas.
         
         Args:
-            file_path: Caminho do arquivo
+            source_path: Diretório de origem
+            include_subdirs: Incluir subdiretórios na busca
+            stats: Estatísticas da execução
+            stop: Interrompe a varredura entre uma pasta e outra (cancelamento)
             
         Returns:
-            str: Hash MD5 do arquivo
+            List[FileInfo]: Arquivos encontrados
         """
+        self.logger.info(f"🔍 Escaneando arquivos em: {source_path}")
+        # Edições feitas direto nas listas de extensões (GUI) valem a partir desta execução
+        self._rebuild_extension_index()
+        
+        files_to_process = []
+        snapshot = None
+        # O retrato vai para o disco real (output_dir): caminhos de outro backend não valem lá
+        if self.incremental_scan and self.backend.local:
+            snapshot = ScanSnapshot.open(self.output_dir, source_path, self.full_rescan_hours,
+                                         force_full=self.force_full_rescan)
+            with self._scan_snapshots_lock:
+                self._scan_snapshots[str(source_path)] = snapshot
+        
+        # scandir (os.scandir no backend local) reaproveita o tipo da entrada
+        # do diretório e evita um Path por arquivo; links para diretórios não
+        # são seguidos (evita ciclos)
+        root = os.fspath(source_path)
+        pending = [""]
+        while pending:
+            if stop is not None and stop.is_set():
+                self.logger.info("⏹️ Varredura interrompida")
+                break
+            relative = pending.pop()
+            directory = os.path.join(root, relative) if relative else root
+            try:
+                if snapshot is not None:
+                    directory_stat = self.backend.stat(directory)
+                    known = snapshot.known_subdirs(relative, directory_stat)
+                    if known is not None:
+                        # Pasta inalterada desde a última execução: só desce nas subpastas
+                        if include_subdirs:
+                            pending.extend(os.path.join(relative, name) for name in known)
+                        continue
+                
+                entries = 0
+                subdirs = []
+                with self.backend.scandir(directory) as iterator:
+                    for entry in iterator:
+                        entries += 1
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.name)
+                            elif entry.is_file():
+                                file_info = FileInfo.from_stat(entry.path, entry.stat())
+                                files_to_process.append(file_info)
+                                stats.total_size += file_info.size
+                        except OSError as e:
+                            self.logger.error(f"Erro ao processar {entry.path}: {e}")
+                            stats.errors += 1
+                
+                if snapshot is not None:
+                    snapshot.record(relative, directory_stat, entries, subdirs)
+                if include_subdirs:
+                    pending.extend(os.path.join(relative, name) for name in subdirs)
+            except OSError as e:
+                self.logger.error(f"Erro ao listar {directory}: {e}")
+                stats.errors += 1
+        
+        if snapshot is not None:
+            stats.pruned_directories = snapshot.pruned
+            kind = "completa" if snapshot.full_scan else "incremental"
+            self.logger.info(f"🗃️ Varredura {kind}: {snapshot.pruned} pasta(s) inalterada(s) não relistada(s)")
+        
+        stats.total_files = len(files_to_process)
+        self.logger.info(f"📊 Encontrados {stats.total_files} arquivos ({self.format_size(stats.total_size)})")
+        return files_to_process
+    
+    def _record_result(self, stats: OrganizationStats, file_info: FileInfo,
+                       success: bool, message: str):
+        """Contabiliza o resultado de um arquivo nas estatísticas."""
+        if success:
+            stats.organized_files += 1
+            category = self.get_file_category(file_info)
+            stats.categories[category] += 1
+            if "Duplicata" in message:
+                stats.duplicates_found += 1
+            self.logger.info(message)
+        else:
+            if "Duplicata" in message:
+                stats.duplicates_found += 1
+            else:
+                stats.errors += 1
+            stats.skipped_files += 1
+            self.logger.warning(message)
+    
+    def _flush_destination(self, destination_dir: Path):
+        """Fecha o checkpoint de durabilidade, grava o índice e fecha os catálogos."""
+        if self.transfer_engine.durability is not None:
+            self.transfer_engine.durability.checkpoint()
+        index = self.get_content_index(destination_dir)
+        if index is not None:
+            index.flush()
+        self.close_catalogs()
+    
+    def _save_scan_snapshot(self, source_path: Path):
+        """Grava o retrato da varredura incremental ao fim de uma execução completa."""
+        with self._scan_snapshots_lock:
+            snapshot = self._scan_snapshots.pop(str(source_path), None)
+        if snapshot is None:
+            return
         try:
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                # Lê em chunks para arquivos grandes
-                for chunk in iter(lambda: f.read(8192), b""):
-                    hash_md5.update(chunk)
-            return hash_md5.hexdigest()
+            snapshot.save()
+        except OSError as e:
+            self.logger.warning(f"⚠️ Não foi possível salvar o retrato da varredura: {e}")
+    
+    def _finish_run(self, stats: OrganizationStats, start_time: datetime.datetime,
+                    source_dir: str, destination_dir: str):
+        """Fecha a execução: tempo total, índices, retrato da varredura, log final e relatório."""
+        end_time = datetime.datetime.now()
+        stats.processing_time = (end_time - start_time).total_seconds()
         
-        except Exception as e:
-            self.logger.error(f"Erro ao calcular hash do arquivo {file_path}: {e}")
-            return ""
+        self._seal_run()
+        self._flush_destination(Path(destination_dir))
+        self._save_scan_snapshot(Path(source_dir))
+        
+        durability = self.transfer_engine.durability
+        if durability is not None:
+            self.logger.info(f"💾 Durabilidade {durability.mode}: {durability.fsyncs} fsync(s)"
+                             f"{f' em {durability.checkpoints} checkpoint(s)' if not durability.strict else ''}")
+        
+        if self.throttle is not None and self.throttle.backoffs:
+            self.logger.info(f"🐢 Concorrência reduzida {self.throttle.backoffs} vez(es) por latência "
+                             f"alta (final: {int(self.throttle.concurrency)} de "
+                             f"{self.throttle.max_concurrency})")
+        
+        self.log_final_stats(stats)
+        self.save_detailed_report(stats, source_dir, destination_dir)
     
-    def get_file_category(self, file_info: FileInfo) -> str:
+    def organize_files(self, source_dir: str, destination_dir: str, 
+                      progress_callback: Optional[Callable] = None,
+                      include_subdirs: bool = True) -> OrganizationStats:
         """
-        Determina a categoria de um arquivo baseado em extensão e MIME type.
+        Organiza arquivos com processamento paralelo e recursos avançados.
         
         Args:
-            file_info: Informações do arquivo
+            source_dir: Diretório de origem
+            destination_dir: Diretório de destino
+            progress_callback: Função callback para progresso
+            include_subdirs: Incluir subdiretórios na busca
             
         Returns:
-            str: Categoria do arquivo
+            OrganizationStats: Estatísticas detalhadas da operação
         """
-        extension = file_info.extension
-        mime_type = file_info.mime_type
+        start_time = datetime.datetime.now()
+        source_path = Path(source_dir)
+        destination_path = Path(destination_dir)
         
-        # Verifica por extensão primeiro
-        for category, info in self.file_categories.items():
-            if extension in info['extensions']:
-                return category
+        if not self.backend.exists(source_path):
+            raise FileNotFoundError(f"Diretório de origem não encontrado: {source_dir}")
         
-        # Fallback por MIME type
-        if mime_type.startswith('image/'):
-            return 'imagens'
-        elif mime_type.startswith('video/'):
-            return 'videos'
-        elif mime_type.startswith('audio/'):
-            return 'audios'
-        elif mime_type.startswith('text/'):
-            return 'documentos'
+        self.backend.makedirs(destination_path)
+        self._prepare_throttle()
+        self._prepare_durability()
+        self._prepare_links()
+        self._prepare_watchdog()
         
-        return 'outros'
+        # Inicializa estatísticas
+        stats = OrganizationStats()
+        duplicate_hashes = {}
+        
+        files_to_process = self.scan_source(source_path, include_subdirs, stats)
+        
+        if stats.total_files == 0:
+            self._save_scan_snapshot(source_path)
+            return stats
+        
+        # Processamento paralelo: lotes conforme ``locality`` e ``scheduling``
+        batches = self._file_batches(files_to_process, destination_path)
+        completed = 0
+        
+        def run_batch(batch, stop):
+            return self._process_batch(batch, destination_path, duplicate_hashes, stop)
+        
+        # Processa resultados conforme completam
+        lanes = self._run_lanes(batches, run_batch, stats)
+        finished = False
+        try:
+            for _, results in lanes:
+                for file_info, success, message in results:
+                    self._record_result(stats, file_info, success, message)
+                    completed += 1
+                    
+                    # Atualiza progresso
+                    if progress_callback:
+                        progress = completed / stats.total_files * 100
+                        progress_callback(progress, f"Processando: {file_info.name}")
+            finished = True
+        finally:
+            # Origens adiadas pela durabilidade são removidas mesmo se um lote
+            # falhar (depois que os lotes em andamento terminam)
+            lanes.close()
+            self._seal_run()
+            if not finished:
+                # O que já foi organizado fica no índice e no catálogo
+                self._flush_destination(destination_path)
+        
+        self._finish_run(stats, start_time, source_dir, destination_dir)
+        
+        return stats
     
-    def get_organization_path(self, file_info: FileInfo, base_dest: Path) -> Path:
+    @classmethod
+    def shared_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
         """
-        Determina o caminho de destino baseado no modo de organização.
+        Executor limitado compartilhado pelas execuções assíncronas.
+        
+        Todas as tarefas assíncronas do processo usam o mesmo pool, de modo
+        que N organizações simultâneas não criam N pools de threads. O pool
+        é encerrado quando a última execução assíncrona que o usa termina
+        (e recriado na próxima).
+        """
+        with cls._shared_executor_lock:
+            if cls._shared_executor is None:
+                cls._shared_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(32, (os.cpu_count() or 1) + 4),
+                    thread_name_prefix="organizador-io"
+                )
+            return cls._shared_executor
+    
+    @classmethod
+    def _acquire_shared_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        """``shared_executor()`` registrando uma execução que o usa."""
+        with cls._shared_executor_lock:
+            cls._shared_executor_users += 1
+        return cls.shared_executor()
+    
+    @classmethod
+    def _release_shared_executor(cls):
+        """Libera o uso de ``_acquire_shared_executor``; o último encerra o pool."""
+        with cls._shared_executor_lock:
+            cls._shared_executor_users -= 1
+            if cls._shared_executor_users > 0 or cls._shared_executor is None:
+                return
+            executor, cls._shared_executor = cls._shared_executor, None
+        # Sem esperar: uma operação presa não segura quem encerra a execução
+        executor.shutdown(wait=False)
+    
+    async def organize_files_async(self, source_dir: str, destination_dir: str,
+                                   include_subdirs: bool = True,
+                                   executor: Optional[concurrent.futures.Executor] = None,
+                                   concurrency: Optional[int] = None) -> AsyncIterator[ProgressEvent]:
+        """
+        Variante assíncrona de ``organize_files`` que emite eventos de progresso.
+        
+        As chamadas bloqueantes de sistema de arquivos rodam em um executor
+        limitado (por padrão ``shared_executor()``). Cancelar a tarefa ou
+        fechar o iterador interrompe a execução: arquivos ainda não iniciados
+        são descartados e os que já estão sendo movidos terminam antes do retorno.
         
         Args:
-            file_info: Informações do arquivo
-            base_dest: Diretório base de destino
+            source_dir: Diretório de origem
+            destination_dir: Diretório de destino
+            include_subdirs: Incluir subdiretórios na busca
+            executor: Executor para as operações bloqueantes
+            concurrency: Máximo de arquivos em andamento desta execução (padrão: max_workers)
             
-        Returns:
-            Path: Caminho completo de destino
+        Yields:
+            ProgressEvent: Eventos ``scan``, ``file`` (um por arquivo) e ``done``
         """
-        category = self.get_file_category(file_info)
+        owns_executor = executor is None
+        events = self._organize_events(source_dir, destination_dir, include_subdirs,
+                                       executor or self._acquire_shared_executor(), concurrency)
+        try:
+            async for event in events:
+                yield event
+        finally:
+            # Fecha o corpo já (cancela o que não começou) antes de liberar o pool
+            await events.aclose()
+            if owns_executor:
+                self._release_shared_executor()
+    
+    async def _organize_events(self, source_dir: str, destination_dir: str,
+                               include_subdirs: bool, executor: concurrent.futures.Executor,
+                               concurrency: Optional[int]) -> AsyncIterator[ProgressEvent]:
+        """Corpo de ``organize_files_async``."""
+        loop = asyncio.get_running_loop()
+        limit = concurrency or self.max_workers
         
-        if self.organization_mode == OrganizationMode.BY_TYPE_AND_DATE:
-            date_folder = f"{file_info.modified_date.year}/{file_info.modified_date.month:02d}"
-            return base_dest / category / date_folder
+        start_time = datetime.datetime.now()
+        source_path = Path(source_dir)
+        destination_path = Path(destination_dir)
+        
+        if not await loop.run_in_executor(executor, self.backend.exists, source_path):
+            raise FileNotFoundError(f"Diretório de origem não encontrado: {source_dir}")
+        
+        await loop.run_in_executor(executor, self.backend.makedirs, destination_path)
+        self._prepare_throttle()
+        self._prepare_durability()
+        self._prepare_links()
+        self._prepare_watchdog()
+        
+        stats = OrganizationStats()
+        duplicate_hashes = {}
+        stop = threading.Event()
+        
+        try:
+            files_to_process = await loop.run_in_executor(
+                executor, self.scan_source, source_path, include_subdirs, stats, stop)
+        except BaseException:
+            stop.set()  # cancelado durante a varredura: a thread para na próxima pasta
+            raise
+        yield ProgressEvent("scan", total=stats.total_files,
+                            message=f"{stats.total_files} arquivos encontrados")
+        
+        # Lotes por pasta de destino; cada lote processa um arquivo por vez,
+        # então ``limit`` lotes em andamento são ``limit`` arquivos em andamento.
+        # Parte das vagas é a faixa rápida, que consome os menores lotes
+        pending: Dict[asyncio.Future, Tuple[concurrent.futures.Future, deque, bool]] = {}
+        batches = self._file_batches(files_to_process, destination_path)
+        remaining = deque(deque(batch) for batch in batches)
+        fast_slots = min(self.fast_lane_workers(), limit - 1)
+        fast_in_flight = 0
+        processed = 0
+        # Com ``watchdog``, lotes parados continuam ocupando a vaga (não se
+        # empilha mais trabalho num disco que não responde) e o laço termina
+        # quando só restam operações presas
+        quarantine = (StallQuarantine(self.watchdog, files_to_process, lambda item: item,
+                                      stats, self.logger)
+                      if self.watchdog is not None else None)
+        abandoned: List[deque] = []
+        finished = False
+        cancelled = False
+        
+        try:
+            while True:
+                # Mantém no máximo ``limit`` arquivos em andamento
+                while len(pending) < limit and remaining:
+                    fast = fast_in_flight < fast_slots
+                    batch = remaining.pop() if fast else remaining.popleft()
+                    if fast:
+                        fast_in_flight += 1
+                    cf_future = executor.submit(self._process_batch, batch, destination_path,
+                                                duplicate_hashes, stop)
+                    pending[asyncio.wrap_future(cf_future)] = (cf_future, batch, fast)
+                
+                if quarantine is None:
+                    if not pending:
+                        break
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                elif quarantine.finished:
+                    pending.clear()  # só operações presas: não esperamos por elas
+                    break
+                elif pending:
+                    done, _ = await asyncio.wait(pending, timeout=quarantine.wait_timeout(),
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                else:  # só novas tentativas aguardando a vez
+                    done = set()
+                    await asyncio.sleep(quarantine.wait_timeout())
+                
+                for future in done:
+                    _, batch, fast = pending.pop(future)
+                    if fast:
+                        fast_in_flight -= 1
+                    results = future.result()
+                    if quarantine is not None:
+                        results = quarantine.filter(results)
+                    for file_info, success, message in results:
+                        self._record_result(stats, file_info, success, message)
+                        processed += 1
+                        yield ProgressEvent("file", processed=processed, total=stats.total_files,
+                                            message=message, success=success, path=file_info.path)
+                
+                if quarantine is not None:
+                    remainders, ready = quarantine.detect()
+                    for file_info, success, message in ready:
+                        self._record_result(stats, file_info, success, message)
+                        processed += 1
+                        yield ProgressEvent("file", processed=processed, total=stats.total_files,
+                                            message=message, success=success, path=file_info.path)
+                    remaining.extendleft(reversed(remainders + quarantine.due()))
+                    if remaining and quarantine.stuck >= limit and quarantine.settled:
+                        self.logger.error("⏳ Todos os workers estão parados; o restante da fila "
+                                          "não será processado")
+                        abandoned = list(remaining)
+                        remaining.clear()
+                        pending.clear()
+                        break
+            
+            if quarantine is not None:
+                for file_info, success, message in quarantine.abandon(abandoned):
+                    self._record_result(stats, file_info, success, message)
+                    processed += 1
+                    yield ProgressEvent("file", processed=processed, total=stats.total_files,
+                                        message=message, success=success, path=file_info.path)
+            finished = True
+        
+        except (asyncio.CancelledError, GeneratorExit):
+            # Também entre dois lotes, sem nada em andamento (``pending`` vazio)
+            cancelled = True
+            raise
+        finally:
+            if pending:
+                # Cancelamento: descarta o que não começou e aguarda o que está em curso
+                # (os lotes em andamento param depois do arquivo atual)
+                stop.set()
+                for cf_future, _, _ in pending.values():
+                    cf_future.cancel()
+                running = [future for future, (cf_future, _, _) in pending.items()
+                           if not cf_future.cancelled()]
+                if running:
+                    # Com ``watchdog``, operações presas não seguram o cancelamento
+                    running, _ = await asyncio.wait(
+                        running, timeout=self.watchdog.timeout if self.watchdog is not None else None)
+                    for future in running:
+                        if future.exception() is None:
+                            for file_info, success, message in future.result():
+                                processed += 1
+                                self._record_result(stats, file_info, success, message)
+            # Fim normal, falha num lote ou cancelamento: as origens adiadas pela
+            # durabilidade não ficam para trás e operações presas não tocam mais o estado
+            await loop.run_in_executor(executor, self._seal_run)
+            if not finished:
+                await loop.run_in_executor(executor, self._flush_destination, destination_path)
+            if cancelled:
+                self.logger.warning(f"⏹️ Organização cancelada após {processed} de "
+                                    f"{stats.total_files} arquivos")
+        
+        await loop.run_in_executor(executor, self._finish_run, stats, start_time,
+                                   source_dir, destination_dir)
+        yield ProgressEvent("done", processed=processed, total=stats.total_files,
+                            message="Organização concluída", stats=stats)
+    
+    def _build_shards(self, source_path: Path, include_subdirs: bool, shard_by: str,
+                      shard_count: int) -> List[Tuple[Optional[str], Optional[List[str]]]]:
+        """
+        Divide a origem em shards ``(diretório_raiz, lista_de_arquivos)``.
         
-        elif self.organization_mode == OrganizationMode.BY_TYPE_ONLY:
-            return base_dest / category
+        ``directory`` cria um shard por subdiretório de primeiro nível (os
+        arquivos soltos na raiz são espalhados por hash do caminho);
+        ``hash`` espalha todos os arquivos por hash do caminho.
+        """
+        buckets: List[List[str]] = [[] for _ in range(shard_count)]
+        shards: List[Tuple[Optional[str], Optional[List[str]]]] = []
         
-        elif self.organization_mode == OrganizationMode.BY_DATE_ONLY:
-            date_folder = f"{file_info.modified_date.year}/{file_info.modified_date.month:02d}"
-            return base_dest / date_folder
+        def add_to_bucket(path: str):
+            buckets[zlib.crc32(path.encode('utf-8', 'surrogateescape')) % shard_count].append(path)
         
-        elif self.organization_mode == OrganizationMode.BY_SIZE:
-            if file_info.size < 1024 * 1024:  # < 1MB
-                size_category = "pequenos"
-            elif file_info.size < 100 * 1024 * 1024:  # < 100MB
-                size_category = "medios"
+        # Links para diretórios não viram shards (evita ciclos e sair da origem),
+        # como na varredura de ``scan_source``
+        if shard_by == "directory":
+            for entry in os.scandir(source_path):
+                if entry.is_dir(follow_symlinks=False):
+                    if include_subdirs:
+                        shards.append((entry.path, None))
+                elif entry.is_file():
+                    add_to_bucket(entry.path)
+        elif shard_by == "hash":
+            if include_subdirs:
+                for root, _, filenames in os.walk(source_path):
+                    for filename in filenames:
+                        add_to_bucket(os.path.join(root, filename))
             else:
-                size_category = "grandes"
-            return base_dest / size_category / category
+                for entry in os.scandir(source_path):
+                    if entry.is_file():
+                        add_to_bucket(entry.path)
+        else:
+            raise ValueError(f"Modo de shard inválido: {shard_by}")
         
-        return base_dest / category
+        shards.extend((None, bucket) for bucket in buckets if bucket)
+        return shards
     
-    def create_unique_filename(self, destination: Path) -> Path:
+    def _reconcile_plan(self, planned: List[FileInfo], destination_path: Path
+                        ) -> List[Tuple[FileInfo, str, Optional[Path], Optional[Path]]]:
         """
-        Cria nome único para evitar sobrescrita com estratégia inteligente.
+        Decide duplicatas e colisões de nome de todos os shards de uma só vez.
+        
+        Os arquivos são percorridos em ordem de caminho, aplicando as mesmas
+        regras de ``process_single_file``: ``skip`` descarta a duplicata e
+        ``replace`` troca a cópia anterior pela mais recente (a anterior é
+        apenas removida da origem, sem chegar a ser movida; se ela já estava
+        no destino, é removida de lá). Com ``hardlink``/``reflink`` a
+        duplicata recebe a ação ``link`` apontando para a cópia canônica.
         
-        Args:
-            destination: Caminho de destino desejado
-            
         Returns:
-            Path: Caminho único para o arquivo
+            List[Tuple[FileInfo, str, Optional[Path], Optional[Path]]]:
+            (arquivo, ação, destino, cópia relacionada no destino — substituída
+            ou vinculada), com ação ``move``, ``link``, ``skip`` ou ``delete``
         """
-        if not destination.exists():
-            return destination
+        actions: List[Tuple[FileInfo, str, Optional[Path], Optional[Path]]] = []
+        canonical: Dict[str, int] = {}
+        reserved: set = set()
+        index = self.get_content_index(destination_path)
         
-        stem = destination.stem
-        suffix = destination.suffix
-        parent = destination.parent
+        link_policy = self.duplicate_handling in ("hardlink", "reflink")
         
-        # Estratégia: nome_arquivo (1), nome_arquivo (2), etc.
-        counter = 1
-        while True:
-            new_name = f"{stem} ({counter}){suffix}"
-            new_path = parent / new_name
-            if not new_path.exists():
-                return new_path
-            counter += 1
+        for file_info in planned:
+            file_hash = file_info.hash_md5
+            related = None
+            if file_hash and file_hash in canonical:
+                index_position = canonical[file_hash]
+                previous, _, previous_target, previous_related = actions[index_position]
+                if self.duplicate_handling == "skip":
+                    actions.append((file_info, "skip", None, None))
+                    continue
+                elif self.duplicate_handling == "replace":
+                    actions[index_position] = (previous, "delete", None, None)
+                    reserved.discard(previous_target)
+                    related = previous_related
+                elif link_policy:
+                    related = previous_target
+            elif file_hash and index is not None:
+                existing = index.find(file_info.size, file_hash, self.calculate_file_hash)
+                if existing is not None:
+                    if self.duplicate_handling == "skip":
+                        actions.append((file_info, "skip", None, None))
+                        continue
+                    elif self.duplicate_handling == "replace" or link_policy:
+                        related = existing
             
-            # Proteção contra loop infinito
-            if counter > 9999:
-                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                new_name = f"{stem}_{timestamp}{suffix}"
-                return parent / new_name
-    
-    def process_single_file(self, file_info: FileInfo, destination_dir: Path, 
-                           duplicate_hashes: Dict[str, Path]) -> Tuple[bool, str]:
-        """
-        Processa um único arquivo com tratamento avançado de duplicatas.
-        
-        Args:
-            file_info: Informações do arquivo
-            destination_dir: Diretório de destino
-            duplicate_hashes: Dicionário de hashes para detecção de duplicatas
+            target_dir = self.get_organization_path(file_info, destination_path)
+            target_file = self.create_unique_filename(target_dir / file_info.name, reserved)
+            reserved.add(target_file)
             
-        Returns:
-            Tuple[bool, str]: (sucesso, mensagem)
-        """
+            if link_policy and related is not None:
+                actions.append((file_info, "link", target_file, related))
+                continue
+            
+            if file_hash:
+                canonical[file_hash] = len(actions)
+            actions.append((file_info, "move", target_file, related))
+        
+        return actions
+    
+    def _execute_action(self, file_info: FileInfo, action: str, target_file: Optional[Path],
+                        related: Optional[Path], destination_dir: Path) -> Tuple[bool, str]:
+        """Executa uma ação decidida por ``_reconcile_plan``."""
+        with self._throttle_slot(), self._watch(file_info):
+            started = time.monotonic()
+            success, message = self._run_action(file_info, action, target_file, related, destination_dir)
+            self._publish_event(file_info, started, success, message)
+            return success, message
+    
+    def _execute_batch(self, batch: deque, destination_dir: Path,
+                       stop: Optional[threading.Event] = None) -> List[Tuple[FileInfo, bool, str]]:
+        """Executa em sequência um lote de ações da mesma pasta de destino (até o ``stop``)."""
+        results = []
+        for file_info, action, target_file, related in self._consume(batch, results, stop):
+            results.append((file_info, *self._execute_action(file_info, action, target_file,
+                                                              related, destination_dir)))
+        return results
+    
+    def _run_action(self, file_info: FileInfo, action: str, target_file: Optional[Path],
+                    related: Optional[Path], destination_dir: Path) -> Tuple[bool, str]:
+        """Corpo de ``_execute_action``."""
         try:
-            # Calcula hash para detecção de duplicatas
-            if self.duplicate_handling != "skip":
-                file_hash = self.calculate_file_hash(file_info.path)
-                file_info.hash_md5 = file_hash
-                
-                if file_hash in duplicate_hashes:
-                    if self.duplicate_handling == "skip":
-                        return False, f"Duplicata ignorada: {file_info.path.name}"
-                    elif self.duplicate_handling == "replace":
-                        # Remove arquivo duplicado anterior
-                        duplicate_hashes[file_hash].unlink()
+            if action == "skip":
+                return False, f"Duplicata ignorada: {file_info.name}"
             
-            # Determina pasta de destino
-            target_dir = self.get_organization_path(file_info, destination_dir)
-            target_dir.mkdir(parents=True, exist_ok=True)
+            if action == "delete":
+                # Roda depois dos movimentos: com durabilidade, a remoção espera o
+                # checkpoint que tornou durável a cópia que substitui esta
+                durability = self.transfer_engine.durability
+                if durability is None:
+                    self.backend.unlink(file_info.path)
+                else:
+                    durability.remove_source(file_info.path)
+                return True, f"🔁 {file_info.name} substituído por duplicata"
             
-            # Define arquivo de destino
-            target_file = target_dir / file_info.path.name
+            self.backend.makedirs(target_file.parent)
             
-            # Cria nome único se necessário
-            if target_file.exists():
-                target_file = self.create_unique_filename(target_file)
+            unlinked_duplicate = False
+            if action == "link":
+                if not self.backend.exists(related):
+                    # O movimento da cópia canônica falhou: esta cópia é movida normalmente
+                    self.logger.debug(f"Cópia canônica ausente para {file_info.name}, movendo")
+                    linked = False
+                else:
+                    if self.duplicate_handling == "hardlink":
+                        linked = self.transfer_engine.hardlink(related, target_file)
+                    else:
+                        linked = self.transfer_engine.reflink(related, target_file,
+                                                              metadata_from=file_info.path)
+                    if not linked:
+                        self._warn_link_unavailable(file_info)
+                        unlinked_duplicate = True
+                if linked:
+                    self._remove_linked_source(file_info, target_file)
+                    file_info.target_path = target_file
+                    self._register_file(file_info, target_file, destination_dir, {},
+                                        self.get_content_index(destination_dir),
+                                        kind=self.duplicate_handling)
+                    relative_path = target_file.relative_to(destination_dir)
+                    return True, f"🔗 Duplicata vinculada: {file_info.name} → {relative_path}"
+                related = None
             
-            # Move o arquivo
-            shutil.move(str(file_info.path), str(target_file))
+            index = self.get_content_index(destination_dir)
+            if related is not None:
+                self.backend.unlink(related)
+                self._uncatalog_file(related, destination_dir)
+                if index is not None and not self._run_sealed():
+                    index.remove(file_info.size, file_info.hash_md5,
+                                 related.relative_to(destination_dir).as_posix())
             
-            # Atualiza registro de duplicatas
-            if file_info.hash_md5:
-                duplicate_hashes[file_info.hash_md5] = target_file
+            self._move_file(file_info, target_file)
+            self._register_file(file_info, target_file, destination_dir, {}, index)
             
-            category = self.get_file_category(file_info)
             relative_path = target_file.relative_to(destination_dir)
-            
-            return True, f"✅ {file_info.path.name} → {relative_path}"
+            if unlinked_duplicate:
+                return True, f"📋 Duplicata movida sem vínculo: {file_info.name} → {relative_path}"
+            return True, f"✅ {file_info.name} → {relative_path}"
         
         except Exception as e:
-            return False, f"❌ Erro ao processar {file_info.path.name}: {e}"
+            return False, f"❌ Erro ao processar {file_info.name}: {e}"
     
-    def organize_files(self, source_dir: str, destination_dir: str, 
-                      progress_callback: Optional[Callable] = None,
-                      include_subdirs: bool = True) -> OrganizationStats:
+    def organize_files_sharded(self, source_dir: str, destination_dir: str,
+                               processes: Optional[int] = None, shard_by: str = "directory",
+                               progress_callback: Optional[Callable] = None,
+                               include_subdirs: bool = True) -> OrganizationStats:
         """
-        Organiza arquivos com processamento paralelo e recursos avançados.
+        Organiza arquivos dividindo a origem em shards processados em paralelo.
+        
+        Cada shard é planejado em um processo separado (metadados, hash e
+        categoria, a parte limitada pelo GIL). As decisões de duplicatas e
+        colisões são tomadas depois, em uma única etapa de reconciliação
+        sobre todos os shards, e os movimentos rodam em threads — o
+        resultado é o mesmo da execução em um único processo.
         
         Args:
             source_dir: Diretório de origem
             destination_dir: Diretório de destino
+            processes: Número de processos (padrão: número de CPUs)
+            shard_by: ``directory`` (subdiretório de primeiro nível) ou ``hash`` (do caminho)
             progress_callback: Função callback para progresso
             include_subdirs: Incluir subdiretórios na busca
             
@@ -455,84 +4446,95 @@ class SmartFileOrganizer:
         start_time = datetime.datetime.now()
         source_path = Path(source_dir)
         destination_path = Path(destination_dir)
+        processes = processes or os.cpu_count() or 1
         
+        if not self.backend.local:
+            raise ValueError("O modo multiprocesso exige o backend local (cada processo abre o disco)")
         if not source_path.exists():
             raise FileNotFoundError(f"Diretório de origem não encontrado: {source_dir}")
         
         destination_path.mkdir(parents=True, exist_ok=True)
+        if self.incremental_scan:
+            self.logger.info("ℹ️ Varredura incremental não se aplica ao modo multiprocesso; usando varredura completa")
+        self._prepare_throttle()
+        self._prepare_durability()
+        self._prepare_links()
+        self._prepare_watchdog()
         
-        # Inicializa estatísticas
         stats = OrganizationStats()
-        duplicate_hashes = {}
-        
-        self.logger.info(f"🔍 Escaneando arquivos em: {source_path}")
-        
-        # Coleta todos os arquivos
-        files_to_process = []
-        pattern = "**/*" if include_subdirs else "*"
+        shards = self._build_shards(source_path, include_subdirs, shard_by, processes)
+        self.logger.info(f"🧩 {len(shards)} shard(s) em {processes} processo(s) (modo {shard_by})")
         
-        for item in source_path.glob(pattern):
-            if item.is_file():
+        # Fase 1: planejamento dos shards em processos separados. O progresso
+        # vai até ``planning_share`` por shard concluído e o restante é da execução
+        planning_share = 50.0
+        planned: List[FileInfo] = []
+        config = self.to_config_dict()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(_plan_shard, config, root, paths, include_subdirs, processes)
+                       for root, paths in shards]
+            for i, future in enumerate(concurrent.futures.as_completed(futures)):
                 try:
-                    file_info = self.get_file_info(item)
-                    files_to_process.append(file_info)
-                    stats.total_size += file_info.size
+                    files, errors = future.result()
+                    planned.extend(files)
+                    stats.errors += errors
                 except Exception as e:
-                    self.logger.error(f"Erro ao processar {item}: {e}")
                     stats.errors += 1
+                    self.logger.error(f"❌ Erro no shard: {e}")
+                
+                if progress_callback:
+                    progress_callback((i + 1) / len(futures) * planning_share,
+                                      f"Planejando shards: {i + 1}/{len(futures)}")
         
-        stats.total_files = len(files_to_process)
+        # Fase 2: reconciliação em ordem determinística
+        planned.sort(key=lambda file_info: file_info.path_str)
+        stats.total_files = len(planned)
+        stats.total_size = sum(file_info.size for file_info in planned)
         self.logger.info(f"📊 Encontrados {stats.total_files} arquivos ({self.format_size(stats.total_size)})")
         
         if stats.total_files == 0:
             return stats
         
-        # Processamento paralelo com ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submete todas as tarefas
-            future_to_file = {
-                executor.submit(self.process_single_file, file_info, destination_path, duplicate_hashes): file_info
-                for file_info in files_to_process
-            }
-            
-            # Processa resultados conforme completam
-            for i, future in enumerate(concurrent.futures.as_completed(future_to_file)):
-                file_info = future_to_file[future]
-                
-                try:
-                    success, message = future.result()
-                    
-                    if success:
-                        stats.organized_files += 1
-                        category = self.get_file_category(file_info)
-                        stats.categories[category] += 1
-                        self.logger.info(message)
-                    else:
-                        if "Duplicata" in message:
-                            stats.duplicates_found += 1
-                        else:
-                            stats.errors += 1
-                        stats.skipped_files += 1
-                        self.logger.warning(message)
-                
-                except Exception as e:
-                    stats.errors += 1
-                    self.logger.error(f"❌ Erro no processamento: {e}")
-                
-                # Atualiza progresso
-                if progress_callback:
-                    progress = (i + 1) / stats.total_files * 100
-                    progress_callback(progress, f"Processando: {file_info.path.name}")
+        actions = self._reconcile_plan(planned, destination_path)
         
-        # Calcula tempo de processamento
-        end_time = datetime.datetime.now()
-        stats.processing_time = (end_time - start_time).total_seconds()
+        # Fase 3: execução — vínculos e remoções de cópias substituídas só
+        # depois que as cópias canônicas existirem
+        dependent = ("link", "delete")
+        phases = [[item for item in actions if item[1] not in dependent],
+                  [item for item in actions if item[1] in dependent]]
+        completed = 0
         
-        # Log final das estatísticas
-        self.log_final_stats(stats)
+        def run_batch(batch, stop):
+            return self._execute_batch(batch, destination_path, stop)
         
-        # Salva relatório detalhado
-        self.save_detailed_report(stats, source_dir, destination_dir)
+        finished = False
+        try:
+            for phase in phases:
+                batches = self._schedule_batches(
+                    phase,
+                    lambda item: item[2].parent if item[2] is not None else "",
+                    lambda item: item[0].path_str,
+                    lambda item: item[0].size
+                )
+                lanes = self._run_lanes(batches, run_batch, stats, lambda item: item[0])
+                try:
+                    for _, results in lanes:
+                        for file_info, success, message in results:
+                            self._record_result(stats, file_info, success, message)
+                            
+                            completed += 1
+                            if progress_callback:
+                                progress = planning_share + completed / stats.total_files * (100 - planning_share)
+                                progress_callback(progress, f"Processando: {file_info.name}")
+                finally:
+                    lanes.close()
+            finished = True
+        finally:
+            self._seal_run()
+            if not finished:
+                self._flush_destination(destination_path)
+        
+        self._finish_run(stats, start_time, source_dir, destination_dir)
         
         return stats
     
@@ -556,6 +4558,14 @@ class SmartFileOrganizer:
         self.logger.info(f"❌ Erros: {stats.errors}")
         self.logger.info(f"💾 Tamanho total processado: {self.format_size(stats.total_size)}")
         self.logger.info(f"⏱️  Tempo de processamento: {stats.processing_time:.2f}s")
+        if stats.pruned_directories:
+            self.logger.info(f"🗃️ Pastas inalteradas puladas: {stats.pruned_directories}")
+        if stats.retried_files:
+            self.logger.info(f"🔁 Novas tentativas: {stats.retried_files}")
+        if stats.stalled_files:
+            self.logger.warning(f"⏳ Arquivos sem resposta (operação ainda presa): {len(stats.stalled_files)}")
+            for path in stats.stalled_files:
+                self.logger.warning(f"  ⏳ {path}")
         
         if stats.categories:
             self.logger.info("\n📂 ARQUIVOS POR CATEGORIA:")
@@ -564,21 +4574,15 @@ class SmartFileOrganizer:
                 self.logger.info(f"  {icon} {category.title()}: {count} arquivo(s)")
     
     def save_detailed_report(self, stats: OrganizationStats, source_dir: str, destination_dir: str):
-        """Salva relatório detalhado em JSON."""
+        """Salva relatório detalhado em JSON (ou entrega ao ``report_sink``)."""
         try:
-            report_dir = Path("reports")
-            report_dir.mkdir(exist_ok=True)
-            
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_file = report_dir / f"relatorio_organizacao_{timestamp}.json"
-            
             report_data = {
                 'timestamp': datetime.datetime.now().isoformat(),
                 'version': self.version,
                 'source_directory': source_dir,
                 'destination_directory': destination_dir,
                 'organization_mode': self.organization_mode.value,
-                'statistics': asdict(stats),
+                'statistics': stats.to_dict(),
                 'configuration': {
                     'duplicate_handling': self.duplicate_handling,
                     'max_workers': self.max_workers,
@@ -586,6 +4590,20 @@ class SmartFileOrganizer:
                 }
             }
             
+            if self.report_sink is not None:
+                self.report_sink(report_data)
+                return
+            if not self.save_reports:
+                return
+            
+            report_dir = self.output_dir / "reports"
+            report_dir.mkdir(parents=True, exist_ok=True)
+            
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            report_file = report_dir / f"relatorio_organizacao_{timestamp}.json"
+            # Relatórios ficam no disco local, qualquer que seja o backend dos arquivos
+            report_file = self.create_unique_filename(report_file, exists=os.path.exists)
+            
             with open(report_file, 'w', encoding='utf-8') as f:
                 json.dump(report_data, f, indent=2, ensure_ascii=False, default=str)
             
@@ -595,19 +4613,458 @@ class SmartFileOrganizer:
             self.logger.error(f"Erro ao salvar relatório: {e}")
 
 
+def _plan_shard(config: Dict, root: Optional[str], paths: Optional[List[str]],
+                include_subdirs: bool, processes: int = 1) -> Tuple[List[FileInfo], int]:
+    """
+    Planeja um shard em um processo filho: metadados, hash e categoria.
+    
+    O organizador é recriado a partir de ``config`` para não depender do
+    pickling da instância do processo pai. Os limites de I/O são divididos
+    entre os ``processes`` que planejam ao mesmo tempo.
+    
+    Returns:
+        Tuple[List[FileInfo], int]: (arquivos planejados, erros de leitura)
+    """
+    organizer = SmartFileOrganizer(logger=logging.getLogger(__name__))
+    organizer.apply_config(config)
+    organizer.incremental_scan = False  # o retrato é da origem inteira, não do shard
+    organizer._prepare_throttle(share=processes)
+    stats = OrganizationStats()
+    
+    if root is not None:
+        files = organizer.scan_source(Path(root), include_subdirs, stats)
+    else:
+        files = []
+        for path in paths:
+            try:
+                files.append(organizer.get_file_info(Path(path)))
+            except Exception:
+                stats.errors += 1
+    
+    hash_files = organizer.needs_hash()
+    for file_info in files:
+        if hash_files:
+            organizer.hash_file(file_info)
+        else:
+            organizer.ensure_category(file_info)
+        file_info.category = organizer.get_file_category(file_info)
+    
+    return files, stats.errors
+
+
+@dataclass
+class OrganizationJob:
+    """Tarefa de organização origem → destino executada pelo ``JobScheduler``."""
+    source: str
+    destination: str
+    config: Optional[str] = None
+    include_subdirs: bool = True
+    name: Optional[str] = None
+    
+    def __post_init__(self):
+        if not self.name:
+            self.name = self.source
+
+
+class _JobState:
+    """Estado interno de uma tarefa durante a execução do agendador."""
+    
+    def __init__(self, job: OrganizationJob, organizer: SmartFileOrganizer,
+                 files: List[FileInfo], stats: OrganizationStats,
+                 devices: Tuple[int, ...], start_time: datetime.datetime):
+        self.job = job
+        self.organizer = organizer
+        self.files = iter(files)
+        self.stats = stats
+        self.devices = devices
+        self.start_time = start_time
+        self.destination_path = Path(job.destination)
+        self.duplicate_hashes: Dict[str, Path] = {}
+        self.in_flight = 0
+        self.exhausted = False
+        self.done = False
+        self.quarantine = (StallQuarantine(organizer.watchdog, files, lambda item: item, stats,
+                                           organizer.logger)
+                           if organizer.watchdog is not None else None)
+    
+    @property
+    def finished(self) -> bool:
+        """Todos os arquivos com resultado (ou presos, com ``watchdog``)."""
+        if self.quarantine is not None:
+            return self.quarantine.finished
+        return self.exhausted and self.in_flight == 0
+
+
+class JobScheduler:
+    """
+    Executa várias tarefas origem → destino sob um orçamento global de workers.
+    
+    Os arquivos de todas as tarefas dividem um único pool de threads. O
+    despacho é round-robin entre as tarefas (um arquivo por vez), e cada
+    dispositivo (``st_dev`` da origem e do destino) aceita no máximo
+    ``per_device_limit`` operações simultâneas; tarefas cujo disco está
+    saturado são puladas na rodada sem ocupar workers. As origens são
+    escaneadas em paralelo e cada tarefa entra no despacho assim que a sua
+    varredura termina.
+    
+    Limites de I/O (``throttling`` na configuração das tarefas) valem para a
+    execução inteira: um único ``IOThrottle`` é dividido por todas as
+    tarefas, com o limite mais restritivo entre elas para banda, operações
+    por segundo e latência do modo segundo plano.
+    
+    Com ``timeout_seconds`` ativo na configuração das tarefas, arquivos
+    parados vão para a quarentena da tarefa (``StallQuarantine``) e uma
+    tarefa cujo disco tem todas as vagas presas é encerrada com o restante
+    relatado como não processado, em vez de travar o agendador.
+    
+    ``overrides`` (formato de ``apply_config``) é aplicado por cima da
+    configuração de cada tarefa: é por ele que as opções globais da linha de
+    comando (``--timeout``, ``--durability``...) valem no modo ``--jobs``.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None,
+                 per_device_limit: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None,
+                 output_dir: Optional[str] = None,
+                 lower_priority: bool = False,
+                 overrides: Optional[Dict] = None):
+        """
+        Args:
+            max_workers: Orçamento global de operações simultâneas
+            per_device_limit: Máximo de operações simultâneas por dispositivo
+            logger: Logger compartilhado pelos organizadores das tarefas
+            output_dir: Diretório dos relatórios das tarefas (sem ele, não são gravados)
+            lower_priority: Se o modo segundo plano pode baixar a prioridade do
+                processo (só quando o agendador é o próprio aplicativo)
+            overrides: Configuração aplicada a todas as tarefas depois da de cada uma
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.per_device_limit = max(1, per_device_limit or self.max_workers)
+        self.logger = logger or logging.getLogger(__name__)
+        self.output_dir = output_dir
+        self.lower_priority = lower_priority
+        self.overrides = overrides or {}
+        self.throttle: Optional[IOThrottle] = None
+        self.jobs: List[OrganizationJob] = []
+        self._states: List[_JobState] = []
+    
+    def stuck_operations(self) -> int:
+        """Operações ainda presas nas tarefas (ver ``SmartFileOrganizer.stuck_operations``)."""
+        return sum(state.organizer.stuck_operations() for state in self._states)
+    
+    @classmethod
+    def from_job_file(cls, job_file: str, logger: Optional[logging.Logger] = None,
+                      output_dir: Optional[str] = None,
+                      lower_priority: bool = False,
+                      overrides: Optional[Dict] = None) -> 'JobScheduler':
+        """
+        Cria o agendador a partir de um arquivo de tarefas JSON.
+        
+        Formato: ``{"max_workers": 8, "per_device_limit": 4, "jobs": [{"source": ...,
+        "destination": ..., "config": ..., "include_subdirs": true, "name": ...}]}``
+        """
+        with open(job_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        scheduler = cls(data.get('max_workers'), data.get('per_device_limit'), logger, output_dir,
+                        lower_priority, overrides)
+        for job_data in data.get('jobs', []):
+            scheduler.add_job(OrganizationJob(**job_data))
+        return scheduler
+    
+    def add_job(self, job: OrganizationJob):
+        """
+        Adiciona uma tarefa à fila.
+        
+        Raises:
+            ValueError: Já existe uma tarefa com o mesmo nome (os resultados são por nome)
+        """
+        if any(existing.name == job.name for existing in self.jobs):
+            raise ValueError(f"Tarefa duplicada: '{job.name}' (use 'name' para diferenciá-las)")
+        self.jobs.append(job)
+    
+    def _shared_throttle(self, organizers: List[SmartFileOrganizer]) -> Optional[IOThrottle]:
+        """Cria o ``IOThrottle`` comum às tarefas com o limite mais restritivo de cada uma."""
+        def strictest(values):
+            return min((value for value in values if value > 0), default=0)
+        
+        mb_per_second = strictest(o.max_mb_per_second for o in organizers)
+        operations_per_second = strictest(o.max_operations_per_second for o in organizers)
+        background = [o.latency_threshold_ms for o in organizers if o.background_mode]
+        if not (mb_per_second or operations_per_second or background):
+            return None
+        
+        limits = []
+        if mb_per_second:
+            limits.append(f"{mb_per_second:g} MB/s")
+        if operations_per_second:
+            limits.append(f"{operations_per_second:g} op/s")
+        if background:
+            limits.append(f"segundo plano (recuo acima de {min(background):g} ms)")
+            applied = lower_process_priority() if self.lower_priority else []
+            if applied:
+                self.logger.info(f"🐢 Prioridade reduzida: {', '.join(applied)}")
+        self.logger.info(f"🚦 Limites de I/O para todas as tarefas: {'; '.join(limits)}")
+        
+        return IOThrottle(
+            bytes_per_second=mb_per_second * 1024 * 1024,
+            operations_per_second=operations_per_second,
+            max_concurrency=self.max_workers,
+            latency_threshold=min(background) / 1000 if background else None
+        )
+    
+    def _prepare_job(self, job: OrganizationJob, organizer: SmartFileOrganizer) -> _JobState:
+        """Escaneia a origem da tarefa e identifica os discos."""
+        start_time = datetime.datetime.now()
+        source_path = Path(job.source)
+        destination_path = Path(job.destination)
+        
+        if not source_path.exists():
+            raise FileNotFoundError(f"Diretório de origem não encontrado: {job.source}")
+        destination_path.mkdir(parents=True, exist_ok=True)
+        organizer._prepare_throttle(shared=self.throttle)
+        organizer._prepare_durability()
+        organizer._prepare_links()
+        organizer._prepare_watchdog()
+        
+        stats = OrganizationStats()
+        files = organizer.scan_source(source_path, job.include_subdirs, stats)
+        # O despacho é por arquivo (round-robin entre tarefas), mas na ordem dos
+        # lotes: com ``locality`` ativo, arquivos seguidos da tarefa caem na mesma pasta
+        files = [file_info for batch in organizer._file_batches(files, destination_path)
+                 for file_info in batch]
+        devices = tuple(sorted({source_path.stat().st_dev, destination_path.stat().st_dev}))
+        return _JobState(job, organizer, files, stats, devices, start_time)
+    
+    def _supervise(self, active: List[_JobState], record: Callable,
+                   condition: threading.Condition):
+        """
+        Quarentena e novas tentativas das tarefas ativas, e encerramento das bloqueadas.
+        
+        Uma tarefa está bloqueada quando o orçamento global ou um dos seus
+        discos só tem vagas ocupadas por operações presas e nada dela está em
+        andamento normalmente: o restante é relatado como não processado.
+        """
+        stalled = {id(state): len(state.organizer.watchdog.stalled())
+                   for state in self._states if state.organizer.watchdog is not None}
+        by_device: Dict[int, int] = defaultdict(int)
+        for state in self._states:
+            for dev in state.devices:
+                by_device[dev] += stalled.get(id(state), 0)
+        
+        for state in active:
+            quarantine = state.quarantine
+            if quarantine is None:
+                continue
+            quarantine.detect()  # despacho por arquivo: não há lotes a redistribuir
+            retries = [item for batch in quarantine.due() for item in batch]
+            with condition:
+                if retries:
+                    state.files = itertools.chain(retries, state.files)
+                    state.exhausted = False
+                blocked = (sum(stalled.values()) >= self.max_workers or
+                           any(by_device[dev] >= self.per_device_limit for dev in state.devices))
+                if (not blocked or quarantine.finished or state.in_flight > quarantine.stuck
+                        or not quarantine.settled):
+                    continue
+                leftover = list(state.files)
+                state.files = iter(())
+                state.exhausted = True
+            self.logger.error(f"⏳ [{state.job.name}] Disco sem vagas livres (operações presas); "
+                              f"{len(leftover)} arquivo(s) não processado(s)")
+            record(state, quarantine.abandon([leftover]))
+    
+    def run(self, progress_callback: Optional[Callable] = None) -> Dict[str, OrganizationStats]:
+        """
+        Executa todas as tarefas e devolve as estatísticas por tarefa.
+        
+        Args:
+            progress_callback: Função callback para progresso global
+            
+        Returns:
+            Dict[str, OrganizationStats]: Estatísticas indexadas pelo nome da tarefa
+        """
+        results: Dict[str, OrganizationStats] = {}
+        active: List[_JobState] = []
+        self._states = []
+        self.logger.info(f"🗂️ {len(self.jobs)} tarefa(s), {self.max_workers} workers, "
+                         f"{self.per_device_limit} por dispositivo")
+        
+        condition = threading.Condition()
+        completed: List[Tuple[_JobState, FileInfo, concurrent.futures.Future]] = []
+        prepared: List[Tuple[OrganizationJob, concurrent.futures.Future]] = []
+        device_busy: Dict[int, int] = defaultdict(int)
+        in_flight = 0
+        processed = 0
+        total_files = 0
+        turn = 0
+        
+        def on_done(state, file_info, future):
+            with condition:
+                completed.append((state, file_info, future))
+                condition.notify()
+        
+        def on_prepared(job, future):
+            with condition:
+                prepared.append((job, future))
+                condition.notify()
+        
+        def record(state: _JobState, outcome: List[Tuple[FileInfo, bool, str]]):
+            nonlocal processed
+            for file_info, success, message in outcome:
+                state.organizer._record_result(state.stats, file_info, success, message)
+                processed += 1
+                if progress_callback:
+                    # Total parcial enquanto houver origens sendo escaneadas
+                    progress_callback(processed / max(total_files, 1) * 100,
+                                      f"[{state.job.name}] {file_info.name}")
+        
+        organizers: Dict[str, SmartFileOrganizer] = {}
+        for job in self.jobs:
+            try:
+                organizer = SmartFileOrganizer(job.config, logger=self.logger,
+                                               output_dir=self.output_dir)
+                organizer.apply_config(self.overrides)
+                organizers[job.name] = organizer
+            except Exception as e:
+                self.logger.error(f"❌ Tarefa '{job.name}' ignorada: {e}")
+                results[job.name] = OrganizationStats(errors=1)
+        # Os limites de I/O valem para a execução inteira, não para cada tarefa
+        self.throttle = self._shared_throttle(list(organizers.values()))
+        
+        # Sem ``watchdog`` em nenhuma tarefa a espera por resultados não tem prazo
+        poll: Optional[float] = None
+        preparing = len(organizers)
+        scanner = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, min(len(self.jobs), self.max_workers)))
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for job in self.jobs:
+                if job.name not in organizers:
+                    continue
+                scanner.submit(self._prepare_job, job, organizers[job.name]).add_done_callback(
+                    lambda f, job=job: on_prepared(job, f))
+            
+            while active or preparing:
+                with condition:
+                    ready, prepared[:] = list(prepared), []
+                
+                # Tarefas cuja varredura terminou entram no despacho
+                for job, future in ready:
+                    preparing -= 1
+                    try:
+                        state = future.result()
+                    except Exception as e:
+                        self.logger.error(f"❌ Tarefa '{job.name}' ignorada: {e}")
+                        results[job.name] = OrganizationStats(errors=1)
+                        continue
+                    results[job.name] = state.stats
+                    total_files += state.stats.total_files
+                    active.append(state)
+                    self._states.append(state)
+                    if state.organizer.watchdog is not None:
+                        interval = state.organizer.watchdog.poll_interval
+                        poll = interval if poll is None else min(poll, interval)
+                
+                with condition:
+                    # Despacho round-robin respeitando o orçamento global e por disco
+                    dispatched = False
+                    start = turn
+                    for offset in range(len(active)):
+                        if in_flight >= self.max_workers:
+                            break
+                        position = (start + offset) % len(active)
+                        state = active[position]
+                        if state.exhausted:
+                            continue
+                        if any(device_busy[dev] >= self.per_device_limit for dev in state.devices):
+                            continue
+                        
+                        file_info = next(state.files, None)
+                        if file_info is None:
+                            state.exhausted = True
+                            continue
+                        
+                        in_flight += 1
+                        state.in_flight += 1
+                        for dev in state.devices:
+                            device_busy[dev] += 1
+                        future = executor.submit(state.organizer.process_single_file, file_info,
+                                                 state.destination_path, state.duplicate_hashes)
+                        future.add_done_callback(
+                            lambda f, st=state, fi=file_info: on_done(st, fi, f))
+                        dispatched = True
+                        # A próxima rodada começa pela tarefa seguinte à última atendida
+                        # (rodadas sem vaga não contam, senão a vez cai sempre na mesma)
+                        turn = position + 1
+                    
+                    retrying = any(state.quarantine is not None and state.quarantine.waiting
+                                   for state in active)
+                    if (not dispatched and not completed and not prepared
+                            and (in_flight or retrying or preparing)):
+                        condition.wait(poll)
+                    finished, completed[:] = list(completed), []
+                
+                # Contabiliza resultados fora do lock
+                for state, file_info, future in finished:
+                    with condition:
+                        in_flight -= 1
+                        state.in_flight -= 1
+                        for dev in state.devices:
+                            device_busy[dev] -= 1
+                    if state.done:
+                        continue  # operação que estava presa numa tarefa já encerrada
+                    
+                    try:
+                        outcome = [(file_info, *future.result())]
+                    except Exception as e:
+                        outcome = [(file_info, False, f"❌ Erro no processamento: {e}")]
+                        self.logger.error(outcome[0][2])
+                    if state.quarantine is not None:
+                        outcome = state.quarantine.filter(outcome)
+                    record(state, outcome)
+                
+                if poll is not None:
+                    self._supervise(active, record, condition)
+                
+                # Encerra as tarefas concluídas
+                for state in [st for st in active if st.finished]:
+                    active.remove(state)
+                    state.done = True
+                    if state.quarantine is not None:
+                        record(state, state.quarantine.abandon([]))
+                    state.organizer._finish_run(state.stats, state.start_time,
+                                                state.job.source, state.job.destination)
+        finally:
+            for state in self._states:
+                if not state.done:
+                    state.organizer._seal_run()
+                    state.organizer._flush_destination(Path(state.job.destination))
+            # Threads presas não seguram o retorno
+            scanner.shutdown(wait=False)
+            executor.shutdown(wait=not self.stuck_operations())
+        
+        return {job.name: results[job.name] for job in self.jobs}
+
+
 class ModernFileOrganizerGUI:
     """Interface gráfica moderna e intuitiva para o Organizador 2025."""
     
+    POLL_INTERVAL_MS = 250  # Intervalo de atualização do painel ao vivo
+    
     def __init__(self):
         """Inicializa a interface gráfica moderna."""
         self.organizer = SmartFileOrganizer()
+        self.monitor: Optional[ThroughputMonitor] = None
+        self._progress_state = (0.0, "")
+        self._run_outcome = None
         self.setup_modern_gui()
     
     def setup_modern_gui(self):
         """Configura interface gráfica com design moderno."""
         self.root = tk.Tk()
         self.root.title(f"📁 Organizador de Arquivos Inteligente {self.organizer.version} ({self.organizer.year})")
-        self.root.geometry("800x700")
+        self.root.geometry("900x860")
         self.root.resizable(True, True)
         
         # Configuração de tema moderno
@@ -682,7 +5139,7 @@ class ModernFileOrganizerGUI:
         ttk.Label(options_frame, text="Duplicatas:").grid(row=0, column=2, sticky=tk.W, padx=(20, 0), pady=5)
         self.duplicate_var = tk.StringVar(value=self.organizer.duplicate_handling)
         duplicate_combo = ttk.Combobox(options_frame, textvariable=self.duplicate_var, width=15, state="readonly")
-        duplicate_combo['values'] = ["rename", "skip", "replace"]
+        duplicate_combo['values'] = DUPLICATE_POLICIES
         duplicate_combo.grid(row=0, column=3, padx=(10, 0), pady=5, sticky=tk.W)
         
         # Incluir subdiretórios
@@ -721,9 +5178,37 @@ class ModernFileOrganizerGUI:
         status_label = ttk.Label(progress_frame, textvariable=self.status_var)
         status_label.grid(row=1, column=0, columnspan=2, pady=5)
         
+        # Painel ao vivo (alimentado pelo EventRingBuffer, atualizado por root.after)
+        dashboard_frame = ttk.LabelFrame(main_frame, text="📈 Painel ao Vivo", padding="15")
+        dashboard_frame.grid(row=5, column=0, columnspan=3, pady=(0, 20), sticky=(tk.W, tk.E))
+        for column in range(3):
+            dashboard_frame.columnconfigure(column, weight=1)
+        
+        self.throughput_var = tk.StringVar(value="📁 0 arquivos/s | 💾 0.0 B/s")
+        ttk.Label(dashboard_frame, textvariable=self.throughput_var,
+                  style='Subtitle.TLabel').grid(row=0, column=0, columnspan=3, sticky=tk.W, pady=(0, 5))
+        
+        ttk.Label(dashboard_frame, text="📂 Por categoria").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(dashboard_frame, text="🐢 Operações mais lentas").grid(row=1, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Label(dashboard_frame, text="⚠️ Erros recentes").grid(row=1, column=2, sticky=tk.W, padx=(10, 0))
+        
+        self.category_tree = ttk.Treeview(dashboard_frame, columns=('arquivos',), height=5)
+        self.category_tree.heading('#0', text='Categoria')
+        self.category_tree.heading('arquivos', text='Arquivos')
+        self.category_tree.column('#0', width=140)
+        self.category_tree.column('arquivos', width=70, anchor=tk.E)
+        self.category_tree.grid(row=2, column=0, sticky=(tk.W, tk.E))
+        self._category_items: Dict[str, str] = {}
+        
+        self.slowest_list = tk.Listbox(dashboard_frame, height=6, font=('Consolas', 9))
+        self.slowest_list.grid(row=2, column=1, padx=(10, 0), sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.errors_list = tk.Listbox(dashboard_frame, height=6, font=('Consolas', 9), foreground='red')
+        self.errors_list.grid(row=2, column=2, padx=(10, 0), sticky=(tk.W, tk.E, tk.N, tk.S))
+        
         # Área de resultados
         results_frame = ttk.LabelFrame(main_frame, text="📋 Resultados", padding="15")
-        results_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_frame.grid(row=6, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
         results_frame.columnconfigure(0, weight=1)
         results_frame.rowconfigure(0, weight=1)
         
@@ -742,7 +5227,7 @@ class ModernFileOrganizerGUI:
         self.result_text.configure(yscrollcommand=scrollbar.set)
         
         # Configurar expansão da área de resultados
-        main_frame.rowconfigure(5, weight=1)
+        main_frame.rowconfigure(6, weight=1)
         
         # Define valores padrão
         self.set_default_folders()
@@ -808,10 +5293,62 @@ class ModernFileOrganizerGUI:
         self.duplicate_var.set(self.organizer.duplicate_handling)
     
     def update_progress(self, progress: float, status: str):
-        """Atualiza progresso e status."""
+        """
+        Registra progresso e status (chamado pela thread de organização).
+        
+        Não toca em widgets Tk: apenas guarda o último valor, que o
+        ``poll_dashboard`` aplica na thread principal.
+        """
+        self._progress_state = (progress, status)
+    
+    def reset_dashboard(self):
+        """Limpa o painel ao vivo para uma nova execução."""
+        self.throughput_var.set("📁 0 arquivos/s | 💾 0.0 B/s")
+        self.category_tree.delete(*self.category_tree.get_children())
+        self._category_items.clear()
+        self.slowest_list.delete(0, tk.END)
+        self.errors_list.delete(0, tk.END)
+    
+    def poll_dashboard(self):
+        """Consome o buffer de eventos e redesenha o painel (thread principal do Tk)."""
+        monitor = self.monitor
+        outcome = self._run_outcome
+        monitor.poll()
+        
+        progress, status = self._progress_state
         self.progress_var.set(progress)
-        self.status_var.set(status)
-        self.root.update_idletasks()
+        if status:
+            self.status_var.set(status)
+        
+        files_per_second, bytes_per_second = monitor.rates()
+        throughput = (f"📁 {files_per_second:.0f} arquivos/s | "
+                      f"💾 {self.organizer.format_size(bytes_per_second)}/s | "
+                      f"✅ {monitor.processed} processados")
+        if monitor.dropped:
+            throughput += f" | {monitor.dropped} eventos não exibidos"
+        self.throughput_var.set(throughput)
+        
+        for category, count in monitor.categories.items():
+            icon = self.organizer.file_categories.get(category, {}).get('icon', '📋')
+            item = self._category_items.get(category)
+            if item is None:
+                self._category_items[category] = self.category_tree.insert(
+                    '', tk.END, text=f"{icon} {category}", values=(count,))
+            else:
+                self.category_tree.item(item, values=(count,))
+        
+        self.slowest_list.delete(0, tk.END)
+        for duration, name in monitor.slowest_operations():
+            self.slowest_list.insert(tk.END, f"{duration:7.2f}s  {name}")
+        
+        self.errors_list.delete(0, tk.END)
+        for message in reversed(monitor.errors):
+            self.errors_list.insert(tk.END, message)
+        
+        if outcome is None:
+            self.root.after(self.POLL_INTERVAL_MS, self.poll_dashboard)
+        else:
+            self.finish_organization(*outcome)
     
     def start_organization(self):
         """Inicia processo de organização."""
@@ -850,44 +5387,58 @@ class ModernFileOrganizerGUI:
         self.result_text.delete(1.0, tk.END)
         self.progress_var.set(0)
         self.status_var.set("🚀 Iniciando organização...")
+        self.reset_dashboard()
         
         # Atualiza configurações
         self.update_organizer_config()
         
+        # Novo buffer de eventos por execução; o painel o consome via root.after
+        self.organizer.event_buffer = EventRingBuffer()
+        self.monitor = ThroughputMonitor(self.organizer.event_buffer)
+        self._progress_state = (0.0, "")
+        self._run_outcome = None
+        
         # Inicia thread de organização
         thread = threading.Thread(target=self.organize_files_thread, 
                                  args=(source, dest, self.include_subdirs_var.get()))
         thread.daemon = True
         thread.start()
+        self.root.after(self.POLL_INTERVAL_MS, self.poll_dashboard)
     
     def organize_files_thread(self, source: str, dest: str, include_subdirs: bool):
-        """Thread para organização de arquivos."""
+        """Thread para organização de arquivos (não acessa widgets Tk)."""
         try:
             # Executa organização
             stats = self.organizer.organize_files(source, dest, self.update_progress, include_subdirs)
-            
-            # Mostra resultado
-            self.show_results(stats)
-            
-            # Mensagem de sucesso
-            success_msg = (f"✅ Organização concluída!\n\n"
-                          f"📁 {stats.organized_files} de {stats.total_files} arquivos organizados\n"
-                          f"⏱️ Tempo: {stats.processing_time:.2f}s\n"
-                          f"💾 Tamanho: {self.organizer.format_size(stats.total_size)}")
-            
-            if stats.errors > 0:
-                success_msg += f"\n⚠️ {stats.errors} erro(s) encontrado(s)"
-            
-            self.root.after(0, lambda: messagebox.showinfo("Organização Concluída", success_msg))
+            self._run_outcome = (stats, None)
         
         except Exception as e:
-            error_msg = f"❌ Erro durante organização:\n\n{str(e)}"
-            self.root.after(0, lambda: messagebox.showerror("Erro", error_msg))
+            self._run_outcome = (None, e)
+    
+    def finish_organization(self, stats: Optional[OrganizationStats], error: Optional[Exception]):
+        """Mostra o resultado final e reabilita a interface (thread principal)."""
+        self.organize_btn.configure(state='normal')
+        self.status_var.set("✅ Organização concluída")
         
-        finally:
-            # Reabilita interface
-            self.root.after(0, lambda: self.organize_btn.configure(state='normal'))
-            self.root.after(0, lambda: self.status_var.set("✅ Organização concluída"))
+        if error is not None:
+            messagebox.showerror("Erro", f"❌ Erro durante organização:\n\n{str(error)}")
+            return
+        
+        self.progress_var.set(100)
+        
+        # Mostra resultado
+        self.show_results(stats)
+        
+        # Mensagem de sucesso
+        success_msg = (f"✅ Organização concluída!\n\n"
+                      f"📁 {stats.organized_files} de {stats.total_files} arquivos organizados\n"
+                      f"⏱️ Tempo: {stats.processing_time:.2f}s\n"
+                      f"💾 Tamanho: {self.organizer.format_size(stats.total_size)}")
+        
+        if stats.errors > 0:
+            success_msg += f"\n⚠️ {stats.errors} erro(s) encontrado(s)"
+        
+        messagebox.showinfo("Organização Concluída", success_msg)
     
     def show_results(self, stats: OrganizationStats):
         """Mostra resultados detalhados na interface."""
@@ -916,8 +5467,7 @@ class ModernFileOrganizerGUI:
         result_text += f"\n📝 Logs detalhados salvos na pasta 'logs/'"
         result_text += f"\n📄 Relatório JSON salvo na pasta 'reports/'"
         
-        # Atualiza interface na thread principal
-        self.root.after(0, lambda: self.result_text.insert(tk.END, result_text))
+        self.result_text.insert(tk.END, result_text)
     
     def run(self):
         """Executa a interface gráfica."""
@@ -927,6 +5477,68 @@ class ModernFileOrganizerGUI:
             self.root.quit()
 
 
+def _exit_leaving_stuck(stuck: int):
+    """
+    Encerra o processo sem esperar por operações de arquivo presas.
+    
+    O ``concurrent.futures`` aguarda as threads dos pools ao sair do
+    interpretador; com uma leitura presa num compartilhamento que não
+    responde isso nunca terminaria. O código de saída é ``STUCK_EXIT_CODE``,
+    para que scripts e cron detectem os arquivos que ficaram para trás.
+    
+    ``os._exit`` encerra na hora: handlers de ``atexit``, blocos ``finally``
+    pendentes de outras threads e o flush dos buffers de ``sys.stdout`` não
+    rodam (por isso o flush e o ``logging.shutdown`` explícitos).
+    """
+    if not stuck:
+        return
+    print(f"⏳ {stuck} operação(ões) ainda presa(s); encerrando sem esperar por elas")
+    sys.stdout.flush()
+    logging.shutdown()
+    os._exit(STUCK_EXIT_CODE)
+
+
+def _config_from_args(args) -> Dict:
+    """
+    Opções informadas na linha de comando no formato de ``apply_config``.
+    
+    Usado tanto no modo ``--cli`` quanto no ``--jobs``, em que vale para
+    todas as tarefas por cima da configuração de cada uma.
+    """
+    config: Dict = {}
+    if args.mode:
+        config['organization_mode'] = args.mode
+    if args.duplicates:
+        config['duplicate_handling'] = args.duplicates
+    if args.sniff:
+        config['content_sniffing'] = True
+    if args.content_index:
+        config['content_index'] = True
+    if args.catalog:
+        config['catalog'] = True
+    if args.incremental:
+        config['incremental_scan'] = True
+    if args.locality:
+        config['locality'] = args.locality
+    if args.scheduling:
+        config['scheduling'] = args.scheduling
+    if args.durability:
+        config['durability'] = args.durability
+    
+    throttling = {}
+    if args.max_mbps is not None:
+        throttling['max_mb_per_second'] = args.max_mbps
+    if args.max_ops is not None:
+        throttling['max_operations_per_second'] = args.max_ops
+    if args.background:
+        throttling['background'] = True
+    if throttling:
+        config['throttling'] = throttling
+    if args.timeout is not None:
+        config['advanced_settings'] = {'timeout_seconds': args.timeout}
+    return config
+
+
 def main():
     """Função principal com suporte a argumentos de linha de comando."""
     import sys
@@ -941,6 +5553,7 @@ Exemplos de uso:
   python organizer.py --cli                     # Modo linha de comando
   python organizer.py --cli --source ~/Downloads --dest ~/Organized
   python organizer.py --config config.json     # Usar configuração personalizada
+  python organizer.py --jobs tarefas.json       # Várias origens/destinos em um só processo
         """
     )
     
@@ -956,14 +5569,123 @@ Exemplos de uso:
                        choices=[mode.value for mode in OrganizationMode],
                        help='Modo de organização')
     parser.add_argument('--duplicates', type=str, 
-                       choices=['rename', 'skip', 'replace'],
+                       choices=DUPLICATE_POLICIES,
                        help='Como tratar duplicatas')
     parser.add_argument('--no-subdirs', action='store_true',
                        help='Não incluir subdiretórios')
+    parser.add_argument('--sniff', action='store_true',
+                       help='Detecta o tipo pelo conteúdo quando a extensão não identifica o arquivo')
+    parser.add_argument('--content-index', action='store_true',
+                       help='Detecta duplicatas contra todo o destino com índice persistente')
+    parser.add_argument('--rebuild-index', action='store_true',
+                       help='Recria o índice de conteúdo do destino antes de organizar')
+    parser.add_argument('--catalog', action='store_true',
+                       help='Registra os arquivos organizados no catálogo SQLite do destino')
+    parser.add_argument('--find', type=str, metavar='TEXTO',
+                       help='Busca arquivos no catálogo do destino (--dest) sem percorrer as pastas')
+    parser.add_argument('--stats', action='store_true',
+                       help='Mostra totais do catálogo do destino (--dest)')
+    parser.add_argument('--rebuild-catalog', action='store_true',
+                       help='Recria o catálogo do destino a partir das pastas')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Relista só as pastas da origem que mudaram desde a última execução')
+    parser.add_argument('--full-rescan', action='store_true',
+                       help='Força varredura completa (renova o retrato da varredura incremental)')
+    parser.add_argument('--locality', type=str, choices=LOCALITY_MODES,
+                       help='Agrupa o despacho por pasta de destino (e de origem) em lotes por worker')
+    parser.add_argument('--scheduling', type=str, choices=SCHEDULING_POLICIES,
+                       help='Ordem dos lotes: fifo ou largest_first (maiores primeiro + faixa rápida)')
+    parser.add_argument('--durability', type=str, choices=DURABILITY_MODES,
+                       help='fsync dos movimentos: none, batched (checkpoints) ou strict (por arquivo)')
+    parser.add_argument('--max-mbps', type=float, metavar='MB',
+                       help='Limita a banda de leitura/cópia em MB/s')
+    parser.add_argument('--max-ops', type=float, metavar='N',
+                       help='Limita as operações de arquivo (renomear, vincular, abrir) por segundo')
+    parser.add_argument('--background', action='store_true',
+                       help='Prioridade baixa de CPU/I/O e recuo automático quando o disco fica lento')
+    parser.add_argument('--timeout', type=float, metavar='SEGUNDOS',
+                       help='Operação sem progresso por mais que isso é dada como presa (0 = sem limite)')
+    parser.add_argument('--processes', type=int,
+                       help='Divide a origem em shards processados por N processos')
+    parser.add_argument('--shard-by', type=str, choices=['directory', 'hash'], default='directory',
+                       help='Critério de divisão em shards (com --processes)')
+    parser.add_argument('--jobs', type=str,
+                       help='Arquivo JSON de tarefas origem→destino (implica --cli); as opções '
+                            'acima valem para todas as tarefas, por cima do "config" de cada uma, '
+                            'exceto --source, --dest, --config, --no-subdirs, --processes, '
+                            '--rebuild-index e --full-rescan')
     
     args = parser.parse_args()
     
-    if args.cli:
+    if args.find is not None or args.stats or args.rebuild_catalog:
+        # Consultas ao catálogo: respondem sem percorrer o destino
+        organizer = SmartFileOrganizer(args.config, logger=logging.getLogger(__name__))
+        dest = Path(args.dest or Path.home() / "ArquivosOrganizados2025")
+        
+        if args.rebuild_catalog:
+            organizer.catalog_enabled = True
+            catalog = organizer.rebuild_catalog(str(dest))
+        else:
+            catalog = DestinationCatalog.open_existing(dest, organizer.logger)
+        if catalog is None:
+            print(f"❌ Nenhum catálogo em {dest} (organize com --catalog ou use --rebuild-catalog)")
+            sys.exit(1)
+        
+        if args.find is not None:
+            start = time.perf_counter()
+            rows = catalog.search(args.find)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"🔎 {len(rows)} resultado(s) para \"{args.find}\" em {elapsed_ms:.1f} ms")
+            for row in rows:
+                icon = organizer.file_categories.get(row['category'], {}).get('icon', '📋')
+                modified = datetime.datetime.fromtimestamp(row['modified']).strftime('%d/%m/%Y')
+                print(f"  {icon} {row['path']}  ({organizer.format_size(row['size'])}, {modified})")
+        
+        if args.stats:
+            start = time.perf_counter()
+            summary = catalog.summary()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"📊 Catálogo de {dest}: {summary['files']} arquivo(s), "
+                  f"{organizer.format_size(summary['size'])}")
+            for category, count, size in summary['categories']:
+                icon = organizer.file_categories.get(category, {}).get('icon', '📋')
+                print(f"  {icon} {category}: {count} arquivo(s), {organizer.format_size(size)}")
+            if summary['last_organized']:
+                last = datetime.datetime.fromtimestamp(summary['last_organized'])
+                print(f"🕒 Última organização: {last.strftime('%d/%m/%Y %H:%M:%S')}")
+            print(f"⏱️ Consulta em {elapsed_ms:.1f} ms")
+        
+        catalog.close()
+    
+    elif args.jobs:
+        # Modo fila de tarefas com orçamento global de workers
+        print(f"📁 Organizador de Arquivos Inteligente 2025 v2.0.0")
+        print("=" * 60)
+        
+        organizer = SmartFileOrganizer(args.config)
+        try:
+            scheduler = JobScheduler.from_job_file(args.jobs, logger=organizer.logger,
+                                                   output_dir=str(organizer.output_dir),
+                                                   lower_priority=True,
+                                                   overrides=_config_from_args(args))
+            
+            def progress_callback(progress, status):
+                print(f"\r⏳ {progress:.1f}% - {status}", end="", flush=True)
+            
+            results = scheduler.run(progress_callback)
+        except Exception as e:
+            print(f"\n❌ Erro: {e}")
+            sys.exit(1)
+        
+        print(f"\n\n✅ {len(results)} tarefa(s) concluída(s)")
+        for name, stats in results.items():
+            print(f"  📂 {name}: {stats.organized_files} de {stats.total_files} organizados"
+                  f"{f', {stats.errors} erro(s)' if stats.errors else ''}")
+        if any(stats.errors for stats in results.values()):
+            print("⚠️ Verifique os logs para detalhes dos erros")
+        _exit_leaving_stuck(scheduler.stuck_operations())
+    
+    elif args.cli:
         # Modo linha de comando
         print(f"📁 Organizador de Arquivos Inteligente 2025 v2.0.0")
         print("=" * 60)
@@ -971,10 +5693,12 @@ Exemplos de uso:
         organizer = SmartFileOrganizer(args.config)
         
         # Configura organizador baseado nos argumentos
-        if args.mode:
-            organizer.organization_mode = OrganizationMode(args.mode)
-        if args.duplicates:
-            organizer.duplicate_handling = args.duplicates
+        organizer.apply_config(_config_from_args(args))
+        if args.rebuild_index:
+            organizer.content_index = True
+        if args.full_rescan:
+            organizer.incremental_scan = True
+            organizer.force_full_rescan = True
         
         # Solicita ou usa pastas fornecidas
         source = args.source or input("📂 Pasta de origem (Enter para Downloads): ").strip()
@@ -987,6 +5711,9 @@ Exemplos de uso:
         
         include_subdirs = not args.no_subdirs
         
+        if args.rebuild_index:
+            organizer.rebuild_content_index(dest)
+        
         print(f"\n🔍 Organizando arquivos:")
         print(f"  📂 Origem: {source}")
         print(f"  📁 Destino: {dest}")
@@ -999,12 +5726,22 @@ Exemplos de uso:
             def progress_callback(progress, status):
                 print(f"\r⏳ {progress:.1f}% - {status}", end="", flush=True)
             
-            stats = organizer.organize_files(source, dest, progress_callback, include_subdirs)
+            if args.processes:
+                stats = organizer.organize_files_sharded(source, dest, args.processes, args.shard_by,
+                                                         progress_callback, include_subdirs)
+            else:
+                stats = organizer.organize_files(source, dest, progress_callback, include_subdirs)
             
             print(f"\n\n✅ Organização concluída!")
             print(f"📊 {stats.organized_files} de {stats.total_files} arquivos organizados")
             print(f"⏱️ Tempo: {stats.processing_time:.2f}s")
             print(f"💾 Tamanho: {organizer.format_size(stats.total_size)}")
+            if stats.pruned_directories:
+                print(f"🗃️ Pastas inalteradas puladas: {stats.pruned_directories}")
+            if stats.stalled_files:
+                print(f"⏳ {len(stats.stalled_files)} arquivo(s) sem resposta:")
+                for path in stats.stalled_files:
+                    print(f"  ⏳ {path}")
             
             if stats.errors > 0:
                 print(f"⚠️ {stats.errors} erro(s) - verifique os logs")
@@ -1012,6 +5749,7 @@ Exemplos de uso:
         except Exception as e:
             print(f"\n❌ Erro: {e}")
             sys.exit(1)
+        _exit_leaving_stuck(organizer.stuck_operations())
     
     else:
         # Modo interface gráfica
@@ -1021,6 +5759,7 @@ Exemplos de uso:
                 app.organizer.load_config(args.config)
                 app.update_gui_from_config()
             app.run()
+            _exit_leaving_stuck(app.organizer.stuck_operations())
         except ImportError:
             print("❌ Tkinter não disponível.")
             print("💡 Execute com --cli para modo linha de comando.")
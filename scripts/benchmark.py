@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmarks do Organizador de Arquivos Inteligente
+===================================================
+Medições reproduzíveis dos caminhos críticos do organizador.
+
+Uso:
+  python scripts/benchmark.py transfer --src-dir /tmp --dst-dir /mnt/outro_disco
+  python scripts/benchmark.py rules --files 20000
+  python scripts/benchmark.py memory --files 200000
+  python scripts/benchmark.py durability --src-dir /dados --dst-dir /mnt/nas
+  python scripts/benchmark.py ordering --dst-dir /mnt/nas --files 20000
+  python scripts/benchmark.py scheduling --workers 4
+  python scripts/benchmark.py backend --latency-ms 2 --workers 1 4 16 64
+"""
+
+import argparse
+import datetime
+import fnmatch
+import logging
+import mimetypes
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from organizer import (DURABILITY_MODES, LOCALITY_MODES, SCHEDULING_POLICIES,  # noqa: E402
+                       FileInfo, FileTransferEngine, LatencyBackend, MemoryBackend,
+                       OrganizationStats, SmartFileOrganizer)
+
+
+def make_files(directory: Path, count: int, size: int, prefix: str = "arquivo") -> list:
+    """Cria ``count`` arquivos de ``size`` bytes com conteúdo pseudoaleatório."""
+    block = os.urandom(min(size, 1024 * 1024)) or b""
+    files = []
+    for i in range(count):
+        path = directory / f"{prefix}_{i:06d}.bin"
+        with open(path, 'wb') as f:
+            remaining = size
+            while remaining > 0:
+                f.write(block[:remaining])
+                remaining -= len(block)
+        files.append(path)
+    return files
+
+
+def print_row(*columns):
+    print(" | ".join(f"{column:>14}" if i else f"{column:<34}" for i, column in enumerate(columns)))
+
+
+def bench_transfer(args):
+    """Cópia entre diretórios: caminho do shutil.move × FileTransferEngine."""
+    engine = FileTransferEngine()
+    chunk_size = args.chunk_mb * 1024 * 1024
+    scenarios = [
+        ("pequenos", args.small_count, args.small_kb * 1024),
+        ("grandes", args.large_count, args.large_mb * 1024 * 1024),
+    ]
+    methods = {
+        # shutil.move entre dispositivos = copy2 + unlink
+        "shutil.move (copy2)": lambda src, dst: (shutil.copy2(src, dst), os.unlink(src)),
+        "engine (kernel)": lambda src, dst: (engine.copy(src, dst, chunk_size=chunk_size), os.unlink(src)),
+        "engine + verificação": lambda src, dst: (engine.copy(src, dst, verify=True, chunk_size=chunk_size),
+                                                  os.unlink(src)),
+    }
+    
+    print(f"Origem: {args.src_dir} (dev {os.stat(args.src_dir).st_dev}) | "
+          f"Destino: {args.dst_dir} (dev {os.stat(args.dst_dir).st_dev})")
+    print_row("cenário / método", "arquivos", "MB", "tempo (s)", "MB/s", "arquivos/s")
+    
+    for scenario, count, size in scenarios:
+        for method, move in methods.items():
+            src_dir = Path(tempfile.mkdtemp(dir=args.src_dir))
+            dst_dir = Path(tempfile.mkdtemp(dir=args.dst_dir))
+            try:
+                files = make_files(src_dir, count, size)
+                start = time.perf_counter()
+                for path in files:
+                    move(path, dst_dir / path.name)
+                elapsed = time.perf_counter() - start
+            finally:
+                shutil.rmtree(src_dir, ignore_errors=True)
+                shutil.rmtree(dst_dir, ignore_errors=True)
+            
+            total_mb = count * size / (1024 * 1024)
+            print_row(f"{scenario} / {method}", count, f"{total_mb:.1f}", f"{elapsed:.3f}",
+                      f"{total_mb / elapsed:.1f}", f"{count / elapsed:.0f}")
+
+
+RULE_EXTENSIONS = [".pdf", ".jpg", ".png", ".docx", ".xlsx", ".mp4", ".mp3", ".zip", ".txt", ".csv",
+                   ".log", ".py", ".json", ".heic", ".mov", ".7z", ".epub", ".xml", ".odt", ".wav"]
+
+
+def make_rules(count: int, rng: random.Random) -> list:
+    """Gera ``count`` regras variadas (extensão, glob/regex de nome, pasta, tamanho, idade)."""
+    rules = []
+    for i in range(count):
+        rule = {"name": f"regra_{i}", "destination": f"roteado/{i}/{{ano}}"}
+        kind = i % 4
+        if kind != 3:
+            rule["extensions"] = rng.sample(RULE_EXTENSIONS, 2)
+        if kind in (0, 3):
+            rule["name_glob"] = f"cliente{i}_*"
+        elif kind == 1:
+            rule["name_regex"] = rf"nf-{i}-\d+.*"
+        else:
+            rule["name_glob"] = f"relatorio_{i}*"
+        if i % 3 == 0:
+            rule["path_glob"] = f"*/setor{i % 50}/*"
+        if i % 5 == 0:
+            rule["min_size"] = 1024
+        if i % 7 == 0:
+            rule["older_than_days"] = 90
+        rules.append(rule)
+    return rules
+
+
+def make_file_infos(count: int, rule_count: int, rng: random.Random) -> list:
+    """FileInfo sintéticos (sem disco): parte casa com alguma regra, parte com nenhuma."""
+    now = datetime.datetime.now()
+    infos = []
+    for i in range(count):
+        target = rng.randrange(max(rule_count, 1))
+        name = rng.choice([f"cliente{target}_{i}", f"nf-{target}-{i}", f"relatorio_{target}",
+                           f"foto_{i}", f"documento {i}"])
+        extension = rng.choice(RULE_EXTENSIONS)
+        path = Path(f"/dados/setor{rng.randrange(60)}/sub/{name}{extension}")
+        date = now - datetime.timedelta(days=rng.randrange(400))
+        infos.append(FileInfo(path, rng.randrange(4096), date, date, extension, "application/octet-stream"))
+    return infos
+
+
+def linear_match(rules: list, file_info: FileInfo, now: float):
+    """Referência ingênua: testa regra por regra com fnmatch/re a cada arquivo."""
+    name = file_info.path.name.lower()
+    folder = file_info.path.parent.as_posix().lower()
+    for rule in rules:
+        extensions = rule.get("extensions")
+        if extensions is not None and file_info.extension not in extensions:
+            continue
+        if "name_glob" in rule and not fnmatch.fnmatchcase(name, rule["name_glob"].lower()):
+            continue
+        if "name_regex" in rule and not re.fullmatch(rule["name_regex"], name, re.IGNORECASE):
+            continue
+        if "path_glob" in rule and not fnmatch.fnmatchcase(folder, rule["path_glob"].lower()):
+            continue
+        if file_info.size < rule.get("min_size", 0):
+            continue
+        if "older_than_days" in rule and \
+                now - file_info.modified_date.timestamp() < rule["older_than_days"] * 86400:
+            continue
+        return rule
+    return None
+
+
+def bench_rules(args):
+    """Roteamento por regras: custo por arquivo com 10, 100 e 1000 regras."""
+    rng = random.Random(args.seed)
+    organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"))
+    destination = Path("/destino")
+    print_row("regras / método", "compilar (ms)", "arquivos", "µs/arquivo", "roteados")
+    
+    baseline = make_file_infos(args.files, 0, rng)
+    start = time.perf_counter()
+    for file_info in baseline:
+        organizer.get_organization_path(file_info, destination)
+    elapsed = time.perf_counter() - start
+    print_row("sem regras / OrganizationMode", "-", args.files, f"{elapsed / args.files * 1e6:.2f}", 0)
+    
+    for count in args.rule_counts:
+        rules = make_rules(count, rng)
+        infos = make_file_infos(args.files, count, rng)
+        
+        start = time.perf_counter()
+        organizer.apply_config({"routing_rules": rules})
+        compile_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        routed = sum(1 for file_info in infos if organizer.routing_rules.match(file_info) is not None)
+        elapsed = time.perf_counter() - start
+        print_row(f"{count} / compilado", f"{compile_ms:.1f}", args.files,
+                  f"{elapsed / args.files * 1e6:.2f}", routed)
+        
+        now = time.time()
+        start = time.perf_counter()
+        linear_routed = sum(1 for file_info in infos if linear_match(rules, file_info, now) is not None)
+        elapsed = time.perf_counter() - start
+        print_row(f"{count} / linear (referência)", "-", args.files,
+                  f"{elapsed / args.files * 1e6:.2f}", linear_routed)
+
+
+@dataclass
+class LegacyFileInfo:
+    """Registro anterior (dataclass com Path, dois datetime e MIME), para comparação."""
+    path: Path
+    size: int
+    created_date: datetime.datetime
+    modified_date: datetime.datetime
+    extension: str
+    mime_type: str
+    hash_md5: Optional[str] = None
+    category: Optional[str] = None
+
+
+def legacy_record(path: str, stat: os.stat_result) -> LegacyFileInfo:
+    """Montagem do registro como o get_file_info anterior fazia."""
+    file_path = Path(path)
+    mime_type, _ = mimetypes.guess_type(str(file_path))
+    return LegacyFileInfo(
+        path=file_path,
+        size=stat.st_size,
+        created_date=datetime.datetime.fromtimestamp(stat.st_ctime),
+        modified_date=datetime.datetime.fromtimestamp(stat.st_mtime),
+        extension=file_path.suffix.lower(),
+        mime_type=mime_type or "application/octet-stream"
+    )
+
+
+def synthetic_entries(count: int):
+    """Caminhos e stat sintéticos (sem disco) com nomes e extensões variados."""
+    extensions = RULE_EXTENSIONS + [""]
+    base = os.stat(__file__)
+    for i in range(count):
+        path = f"/dados/usuario/pasta_{i % 997}/sub_{i % 31}/arquivo_{i:07d}{extensions[i % len(extensions)]}"
+        yield path, os.stat_result((base.st_mode, i, base.st_dev, 1, 0, 0, i * 37,
+                                    base.st_atime, 1.7e9 + i, 1.7e9 + i))
+
+
+def measure_records(build, entries) -> tuple:
+    """Monta todos os registros e retorna (segundos, pico de memória em bytes)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    records = [build(path, stat) for path, stat in entries]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return elapsed, peak
+
+
+def bench_memory(args):
+    """Pico de memória dos registros de arquivo: dataclass anterior × FileInfo compacto."""
+    print_row("registro", "arquivos", "pico (MB)", "bytes/arquivo", "MB por milhão", "tempo (s)")
+    
+    # Entradas geradas durante a medição: o caminho de cada arquivo é uma
+    # string nova, como em uma varredura real, e entra na conta
+    for label, build in (("dataclass anterior (Path+datetime)", legacy_record),
+                         ("FileInfo compacto (__slots__)", FileInfo.from_stat)):
+        elapsed, peak = measure_records(build, synthetic_entries(args.files))
+        per_file = peak / args.files
+        print_row(label, args.files, f"{peak / 1024 ** 2:.1f}", f"{per_file:.0f}",
+                  f"{per_file * 1_000_000 / 1024 ** 2:.0f}", f"{elapsed:.2f}")
+    
+    if args.scan_dir:
+        organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"))
+        tracemalloc.start()
+        start = time.perf_counter()
+        stats = OrganizationStats()
+        files = organizer.scan_source(Path(args.scan_dir), True, stats)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_file = peak / max(len(files), 1)
+        print_row(f"scan_source({args.scan_dir})", len(files), f"{peak / 1024 ** 2:.1f}",
+                  f"{per_file:.0f}", f"{per_file * 1_000_000 / 1024 ** 2:.0f}", f"{elapsed:.2f}")
+
+
+def bench_durability(args):
+    """Custo de cada modo de durabilidade em uma organização completa."""
+    print(f"Origem: {args.src_dir} (dev {os.stat(args.src_dir).st_dev}) | "
+          f"Destino: {args.dst_dir} (dev {os.stat(args.dst_dir).st_dev})")
+    print_row("modo", "arquivos", "tempo (s)", "arquivos/s", "fsyncs", "checkpoints")
+    
+    for mode in args.modes:
+        src_dir = Path(tempfile.mkdtemp(dir=args.src_dir))
+        dst_dir = Path(tempfile.mkdtemp(dir=args.dst_dir))
+        try:
+            # Arquivos espalhados em pastas, como numa origem real
+            for folder in range(args.folders):
+                (src_dir / f"pasta_{folder:03d}").mkdir()
+            per_folder = -(-args.files // args.folders)
+            for folder in range(args.folders):
+                make_files(src_dir / f"pasta_{folder:03d}",
+                           min(per_folder, args.files - folder * per_folder), args.kb * 1024)
+            
+            organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"),
+                                           report_sink=lambda report: None)
+            organizer.durability_mode = mode
+            start = time.perf_counter()
+            stats = organizer.organize_files(str(src_dir), str(dst_dir))
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            shutil.rmtree(dst_dir, ignore_errors=True)
+        
+        durability = organizer.transfer_engine.durability
+        print_row(mode, stats.organized_files, f"{elapsed:.3f}", f"{stats.organized_files / elapsed:.0f}",
+                  durability.fsyncs if durability else 0,
+                  durability.checkpoints if durability and not durability.strict else "-")
+
+
+def make_scattered_tree(root: Path, count: int, folders: int, months: int, rng: random.Random):
+    """Origem cujos arquivos se espalham por categorias × meses (centenas de pastas de destino)."""
+    now = time.time()
+    for folder in range(folders):
+        (root / f"pasta_{folder:03d}").mkdir()
+    for i in range(count):
+        path = root / f"pasta_{i % folders:03d}" / f"arquivo_{i:06d}{rng.choice(RULE_EXTENSIONS)}"
+        path.write_bytes(b"x" * 512)
+        moment = now - rng.randrange(months) * 30 * 86400
+        os.utime(path, (moment, moment))
+
+
+def bench_ordering(args):
+    """Vazão de renomeações com e sem agrupamento por pasta de destino."""
+    print(f"Origem: {args.src_dir} | Destino: {args.dst_dir} | {args.files} arquivos, "
+          f"{args.workers} workers")
+    print_row("ordem de despacho", "arquivos", "pastas destino", "tempo (s)", "arquivos/s")
+    
+    for locality in args.modes:
+        rng = random.Random(args.seed)
+        src_dir = Path(tempfile.mkdtemp(dir=args.src_dir))
+        dst_dir = Path(tempfile.mkdtemp(dir=args.dst_dir))
+        try:
+            make_scattered_tree(src_dir, args.files, args.folders, args.months, rng)
+            organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"),
+                                           report_sink=lambda report: None)
+            organizer.max_workers = args.workers
+            organizer.locality = locality
+            start = time.perf_counter()
+            stats = organizer.organize_files(str(src_dir), str(dst_dir))
+            elapsed = time.perf_counter() - start
+            target_dirs = sum(1 for _, _, files in os.walk(dst_dir) if files)
+        finally:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            shutil.rmtree(dst_dir, ignore_errors=True)
+        
+        print_row(locality, stats.organized_files, target_dirs, f"{elapsed:.3f}",
+                  f"{stats.organized_files / elapsed:.0f}")
+
+
+def bench_scheduling(args):
+    """Tempo total com tamanhos assimétricos: fifo × largest_first (com hash de tudo)."""
+    large_size = args.large_mb * 1024 * 1024
+    small_size = args.small_kb * 1024
+    total_mb = (args.large_count * large_size + args.small_count * small_size) / 1024 ** 2
+    
+    # Vazão de hash de uma thread, para o limite inferior teórico
+    probe_dir = Path(tempfile.mkdtemp(dir=args.src_dir))
+    try:
+        probe = make_files(probe_dir, 1, large_size, "sonda")[0]
+        organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"))
+        start = time.perf_counter()
+        organizer.calculate_file_hash(probe)
+        thread_mb_s = args.large_mb / (time.perf_counter() - start)
+    finally:
+        shutil.rmtree(probe_dir, ignore_errors=True)
+    parallel = min(args.workers, os.cpu_count() or 1)
+    ideal = max(total_mb / (thread_mb_s * parallel), args.large_mb / thread_mb_s)
+    
+    print(f"{args.small_count} × {args.small_kb} KB + {args.large_count} × {args.large_mb} MB "
+          f"({total_mb:.0f} MB), {args.workers} workers em {os.cpu_count()} CPU(s), "
+          f"hash {thread_mb_s:.0f} MB/s por thread")
+    print(f"Limite inferior (bytes / banda agregada): {ideal:.2f} s")
+    print_row("política", "tempo (s)", "MB/s", "× limite", "pequenos (s)")
+    
+    for policy in args.policies:
+        src_dir = Path(tempfile.mkdtemp(dir=args.src_dir))
+        dst_dir = Path(tempfile.mkdtemp(dir=args.dst_dir))
+        try:
+            # Os vídeos ficam juntos numa pasta e são listados por último
+            # (conteúdo distinto por arquivo: nenhum é descartado como duplicata)
+            (src_dir / "zz_videos").mkdir()
+            for i in range(args.small_count):
+                (src_dir / f"pequeno_{i:06d}.bin").write_bytes(os.urandom(small_size))
+            for i in range(args.large_count):
+                path = make_files(src_dir / "zz_videos", 1, large_size, f"video_{i:03d}")[0]
+                path.rename(path.with_suffix(".mp4"))
+            
+            organizer = SmartFileOrganizer(logger=logging.getLogger("benchmark"),
+                                           report_sink=lambda report: None)
+            organizer.duplicate_handling = "skip"  # lê todos os bytes (hash)
+            organizer.max_workers = args.workers
+            organizer.locality = "destination"
+            organizer.scheduling = policy
+            small_done = [0, 0.0]
+            
+            def on_progress(progress, status):
+                if "pequeno_" in status:
+                    small_done[0] += 1
+                    small_done[1] = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            organizer.organize_files(str(src_dir), str(dst_dir), on_progress)
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            shutil.rmtree(dst_dir, ignore_errors=True)
+        
+        print_row(policy, f"{elapsed:.2f}", f"{total_mb / elapsed:.0f}", f"{elapsed / ideal:.2f}",
+                  f"{small_done[1]:.2f}")
+
+
+def make_memory_tree(files: int, folders: int, months: int, seed: int) -> MemoryBackend:
+    """Origem em memória espalhada por categorias × meses (a mesma de ``ordering``)."""
+    rng = random.Random(seed)
+    backend = MemoryBackend()
+    now = time.time()
+    for i in range(files):
+        # Tamanhos variados: arquivos de mesmo tamanho disputam o mesmo lock de duplicatas
+        backend.add_file(f"/origem/pasta_{i % folders:03d}/arquivo_{i:06d}{rng.choice(RULE_EXTENSIONS)}",
+                         rng.randbytes(rng.randrange(64, 4096)),
+                         mtime=now - rng.randrange(months) * 30 * 86400)
+    return backend
+
+
+def bench_backend(args):
+    """Escala por número de workers sobre um sistema de arquivos em memória, com e sem latência."""
+    print(f"{args.files} arquivos em memória, {args.folders} pastas, duplicatas: {args.duplicates}, "
+          f"latência {args.latency_ms} ms/operação, erros {args.error_rate:.1%}")
+    print_row("backend", "workers", "tempo (s)", "arquivos/s", "operações", "× ideal", "erros")
+    # Erros injetados são contados na tabela, não registrados um a um
+    logger = logging.getLogger("benchmark.backend")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    
+    for latency_ms in ([0.0, args.latency_ms] if args.latency_ms else [0.0]):
+        for workers in args.workers:
+            backend = make_memory_tree(args.files, args.folders, args.months, args.seed)
+            if latency_ms:
+                backend = LatencyBackend(backend, latency=latency_ms / 1000, jitter=latency_ms / 2000,
+                                         error_rate=args.error_rate, seed=args.seed)
+            organizer = SmartFileOrganizer(logger=logger, report_sink=lambda report: None,
+                                           backend=backend)
+            organizer.max_workers = workers
+            organizer.duplicate_handling = args.duplicates
+            start = time.perf_counter()
+            stats = organizer.organize_files("/origem", "/destino")
+            elapsed = time.perf_counter() - start
+            
+            if latency_ms:
+                # Limite inferior: todas as esperas divididas entre os workers
+                operations = sum(backend.calls.values())
+                ideal = operations * latency_ms * 1.25 / 1000 / workers
+                print_row(f"memória + {latency_ms:g} ms", workers, f"{elapsed:.3f}",
+                          f"{stats.organized_files / elapsed:.0f}", operations,
+                          f"{elapsed / ideal:.2f}", stats.errors)
+            else:
+                print_row("memória", workers, f"{elapsed:.3f}", f"{stats.organized_files / elapsed:.0f}",
+                          "-", "-", stats.errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Organizador de Arquivos Inteligente")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    transfer = subparsers.add_parser("transfer", help="Cópia entre dispositivos (shutil × engine)")
+    transfer.add_argument("--src-dir", default=tempfile.gettempdir())
+    transfer.add_argument("--dst-dir", default=tempfile.gettempdir())
+    transfer.add_argument("--small-count", type=int, default=2000)
+    transfer.add_argument("--small-kb", type=int, default=16)
+    transfer.add_argument("--large-count", type=int, default=4)
+    transfer.add_argument("--large-mb", type=int, default=256)
+    transfer.add_argument("--chunk-mb", type=int, default=64)
+    transfer.set_defaults(func=bench_transfer)
+    
+    rules = subparsers.add_parser("rules", help="Roteamento por regras (compilado × linear)")
+    rules.add_argument("--files", type=int, default=20000)
+    rules.add_argument("--rule-counts", type=int, nargs="+", default=[10, 100, 1000])
+    rules.add_argument("--seed", type=int, default=42)
+    rules.set_defaults(func=bench_rules)
+    
+    memory = subparsers.add_parser("memory", help="Memória dos registros de arquivo (tracemalloc)")
+    memory.add_argument("--files", type=int, default=200000)
+    memory.add_argument("--scan-dir", help="Também mede scan_source em uma árvore real")
+    memory.set_defaults(func=bench_memory)
+    
+    durability = subparsers.add_parser("durability", help="Modos de durabilidade (none × batched × strict)")
+    durability.add_argument("--src-dir", default=tempfile.gettempdir())
+    durability.add_argument("--dst-dir", default=tempfile.gettempdir())
+    durability.add_argument("--files", type=int, default=5000)
+    durability.add_argument("--folders", type=int, default=50)
+    durability.add_argument("--kb", type=int, default=16)
+    durability.add_argument("--modes", nargs="+", choices=DURABILITY_MODES, default=DURABILITY_MODES)
+    durability.set_defaults(func=bench_durability)
+    
+    ordering = subparsers.add_parser("ordering", help="Despacho agrupado por pasta de destino")
+    ordering.add_argument("--src-dir", default=tempfile.gettempdir())
+    ordering.add_argument("--dst-dir", default=tempfile.gettempdir())
+    ordering.add_argument("--files", type=int, default=20000)
+    ordering.add_argument("--folders", type=int, default=100)
+    ordering.add_argument("--months", type=int, default=36)
+    ordering.add_argument("--workers", type=int, default=16)
+    ordering.add_argument("--seed", type=int, default=42)
+    ordering.add_argument("--modes", nargs="+", choices=LOCALITY_MODES, default=LOCALITY_MODES)
+    ordering.set_defaults(func=bench_ordering)
+    
+    scheduling = subparsers.add_parser("scheduling", help="Escalonamento por tamanho (fifo × largest_first)")
+    scheduling.add_argument("--src-dir", default=tempfile.gettempdir())
+    scheduling.add_argument("--dst-dir", default=tempfile.gettempdir())
+    scheduling.add_argument("--small-count", type=int, default=4000)
+    scheduling.add_argument("--small-kb", type=int, default=16)
+    scheduling.add_argument("--large-count", type=int, default=8)
+    scheduling.add_argument("--large-mb", type=int, default=128)
+    scheduling.add_argument("--workers", type=int, default=4)
+    scheduling.add_argument("--policies", nargs="+", choices=SCHEDULING_POLICIES, default=SCHEDULING_POLICIES)
+    scheduling.set_defaults(func=bench_scheduling)
+    
+    backend = subparsers.add_parser("backend", help="Escala por workers em memória, com latência simulada")
+    backend.add_argument("--files", type=int, default=5000)
+    backend.add_argument("--folders", type=int, default=100)
+    backend.add_argument("--months", type=int, default=36)
+    backend.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 64])
+    backend.add_argument("--latency-ms", type=float, default=2.0)
+    backend.add_argument("--error-rate", type=float, default=0.0)
+    backend.add_argument("--duplicates", choices=["rename", "skip"], default="rename")
+    backend.add_argument("--seed", type=int, default=42)
+    backend.set_defaults(func=bench_backend)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Configuração comum dos testes: torna ``organizer`` importável a partir da raiz do repositório."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,110 @@
+"""
+Testes do cancelamento de ``organize_files_async``.
+
+Cancelar a tarefa ou fechar o iterador no meio da execução: os lotes que
+não começaram param, o arquivo em andamento termina, as origens adiadas
+pela durabilidade são removidas e o aviso traz a contagem parcial.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+
+import pytest
+
+from organizer import ContentIndex, SmartFileOrganizer
+
+TOTAL = 30
+
+
+def criar_origem(tmp_path):
+    source = tmp_path / "origem"
+    source.mkdir()
+    for i in range(TOTAL):
+        (source / f"arquivo{i:02d}.txt").write_bytes(b"mesmo conteudo")
+    return source
+
+
+def criar_organizador():
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+    # Cópias vinculadas têm a remoção da origem adiada até o checkpoint
+    organizer.duplicate_handling = "hardlink"
+    organizer.durability_mode = "batched"
+    organizer.content_index = True
+    organizer.max_workers = 2
+    calls = []
+    lock = threading.Lock()
+    process_single_file = organizer.process_single_file
+
+    def slow_process(file_info, *args):
+        with lock:
+            calls.append(file_info.name)
+        time.sleep(0.05)
+        return process_single_file(file_info, *args)
+
+    organizer.process_single_file = slow_process
+    return organizer, calls
+
+
+async def cancelar_tarefa(organizer, source, destination, after):
+    events = []
+    started = asyncio.Event()
+
+    async def consume():
+        async for event in organizer.organize_files_async(str(source), str(destination), concurrency=2):
+            events.append(event)
+            if sum(e.kind == "file" for e in events) == after:
+                started.set()
+
+    task = asyncio.ensure_future(consume())
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    return events
+
+
+async def fechar_iterador(organizer, source, destination, after):
+    events = []
+    iterator = organizer.organize_files_async(str(source), str(destination), concurrency=2)
+    while sum(e.kind == "file" for e in events) < after:
+        events.append(await iterator.__anext__())
+    await iterator.aclose()
+    return events
+
+
+@pytest.mark.parametrize("interrupt", [cancelar_tarefa, fechar_iterador])
+def test_cancelamento_no_meio_da_execucao(tmp_path, caplog, interrupt):
+    source = criar_origem(tmp_path)
+    destination = tmp_path / "destino"
+    organizer, calls = criar_organizador()
+
+    with caplog.at_level(logging.INFO):
+        events = asyncio.run(interrupt(organizer, source, destination, after=4))
+    started = len(calls)
+    time.sleep(0.3)
+
+    # Os lotes restantes não começaram depois do cancelamento
+    assert len(calls) == started
+    assert 4 <= started < TOTAL
+    assert [e.kind for e in events] == ["scan"] + ["file"] * (len(events) - 1)
+    assert events[0].total == TOTAL
+
+    # Cada arquivo iniciado terminou; as origens vinculadas foram removidas (checkpoint final)
+    organized = {path.name for path in destination.rglob("*.txt")}
+    left = {path.name for path in source.iterdir()}
+    assert organized == set(calls)
+    assert organized.isdisjoint(left) and len(organized | left) == TOTAL
+    assert sum(path.stat().st_nlink for path in destination.rglob("*.txt")) == started ** 2
+    # O índice de conteúdo foi gravado com os arquivos organizados até o cancelamento
+    index_file = destination / ContentIndex.INDEX_DIR / ContentIndex.INDEX_FILE
+    indexed = set(re.findall(rb"arquivo\d+\.txt", index_file.read_bytes()))
+    assert indexed == {name.encode() for name in organized}
+
+    # Estatísticas parciais: o aviso conta também os arquivos que terminaram durante o cancelamento
+    warnings = re.findall(r"Organização cancelada após (\d+) de (\d+) arquivos", caplog.text)
+    assert warnings == [(str(started), str(TOTAL))]
+    assert caplog.text.count("Duplicata") == started - 1
+    assert "Organização concluída" not in caplog.text
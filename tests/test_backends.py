@@ -0,0 +1,155 @@
+"""
+Testes dos backends de sistema de arquivos.
+
+A organização roda sobre ``MemoryBackend`` (sem tocar o disco) e, com
+``LatencyBackend``, sob erros injetados como os de um NFS/SMB instável.
+"""
+
+import datetime
+import logging
+import os
+
+import pytest
+
+from organizer import (
+    FilesystemBackend,
+    LatencyBackend,
+    MemoryBackend,
+    SmartFileOrganizer,
+)
+
+MTIME = datetime.datetime(2024, 3, 5, 12, 0).timestamp()
+
+ARQUIVOS = {
+    "/origem/relatorio.pdf": b"%PDF-1.7 relatorio",
+    "/origem/fotos/praia.jpg": b"\xff\xd8\xff praia",
+    "/origem/fotos/festa.png": b"\x89PNG festa",
+    "/origem/musicas/tema.mp3": b"ID3 tema",
+    "/origem/backup.zip": b"PK\x03\x04 backup",
+}
+
+
+def listar_arquivos(backend, raiz: str) -> set:
+    """Caminhos de todos os arquivos abaixo de ``raiz``, pela interface pública do backend."""
+    encontrados = set()
+    pendentes = [raiz]
+    while pendentes:
+        pasta = pendentes.pop()
+        with backend.scandir(pasta) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir():
+                    pendentes.append(entrada.path)
+                else:
+                    encontrados.add(entrada.path)
+    return encontrados
+
+
+def criar_backend(arquivos=ARQUIVOS) -> MemoryBackend:
+    backend = MemoryBackend()
+    for caminho, conteudo in arquivos.items():
+        backend.add_file(caminho, conteudo, mtime=MTIME)
+    return backend
+
+
+def criar_organizador(backend, output_dir) -> SmartFileOrganizer:
+    logger = logging.getLogger("testes")
+    return SmartFileOrganizer(logger=logger, output_dir=str(output_dir), backend=backend)
+
+
+def test_backend_abstrato_exige_todas_as_operacoes():
+    with pytest.raises(TypeError):
+        FilesystemBackend()
+
+    class Incompleto(FilesystemBackend):
+        def scandir(self, path):
+            return iter(())
+
+    with pytest.raises(TypeError):
+        Incompleto()
+
+
+def test_organiza_em_memoria(tmp_path):
+    backend = criar_backend()
+    organizer = criar_organizador(backend, tmp_path)
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.total_files == len(ARQUIVOS)
+    assert stats.organized_files == len(ARQUIVOS)
+    assert stats.errors == 0
+    assert listar_arquivos(backend, "/origem") == set()
+    assert listar_arquivos(backend, "/destino") == {
+        "/destino/documentos/2024/03/relatorio.pdf",
+        "/destino/imagens/2024/03/praia.jpg",
+        "/destino/imagens/2024/03/festa.png",
+        "/destino/audios/2024/03/tema.mp3",
+        "/destino/compactados/2024/03/backup.zip",
+    }
+    with backend.open("/destino/imagens/2024/03/praia.jpg") as f:
+        assert f.read() == ARQUIVOS["/origem/fotos/praia.jpg"]
+    assert not os.path.exists("/origem") and not os.path.exists("/destino")
+
+
+def test_duplicatas_em_memoria(tmp_path):
+    backend = criar_backend({
+        "/origem/a/contrato.pdf": b"mesmo conteudo",
+        "/origem/b/contrato.pdf": b"mesmo conteudo",
+        "/origem/c/outro.pdf": b"conteudo diferente",
+    })
+    organizer = criar_organizador(backend, tmp_path)
+    organizer.duplicate_handling = "skip"
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.organized_files == 2
+    assert stats.duplicates_found == 1
+    assert len(listar_arquivos(backend, "/origem")) == 1
+    assert len(listar_arquivos(backend, "/destino")) == 2
+
+
+def test_backend_em_memoria_nao_grava_estado_no_output_dir(tmp_path):
+    backend = criar_backend()
+    organizer = criar_organizador(backend, tmp_path)
+    organizer.incremental_scan = True
+    organizer.content_index = True
+    organizer.catalog_enabled = True
+    organizer.durability_mode = "batched"
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.organized_files == len(ARQUIVOS)
+    # Só o relatório vai para o disco: nada de retrato da varredura, índice ou catálogo
+    assert sorted(os.listdir(tmp_path)) == ["reports"]
+    assert len(os.listdir(tmp_path / "reports")) == 1
+    assert not any("/.organizador/" in path for path in listar_arquivos(backend, "/destino"))
+
+
+def test_erros_injetados_deixam_arquivos_na_origem(tmp_path):
+    backend = LatencyBackend(criar_backend(), error_rate=1.0, error_operations=["rename"])
+    organizer = criar_organizador(backend, tmp_path)
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.organized_files == 0
+    assert stats.errors == len(ARQUIVOS)
+    assert backend.injected_errors == len(ARQUIVOS)
+    assert listar_arquivos(backend, "/origem") == set(ARQUIVOS)
+    assert listar_arquivos(backend.inner, "/destino") == set()
+
+
+def test_erros_parciais_nao_perdem_arquivos(tmp_path):
+    arquivos = {f"/origem/pasta{i % 4}/arquivo{i}.txt": f"conteudo {i}".encode() for i in range(60)}
+    backend = LatencyBackend(criar_backend(arquivos), latency=0.001, error_rate=0.3,
+                             error_operations=["rename"], seed=7)
+    organizer = criar_organizador(backend, tmp_path)
+    organizer.max_workers = 8
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    restantes = listar_arquivos(backend, "/origem")
+    organizados = listar_arquivos(backend, "/destino")
+    assert backend.injected_errors > 0
+    assert stats.errors == backend.injected_errors == len(restantes)
+    assert stats.organized_files == len(organizados)
+    assert len(restantes) + len(organizados) == len(arquivos)
+    assert backend.calls["rename"] == len(arquivos)
@@ -0,0 +1,133 @@
+"""
+Testes do catálogo SQLite do destino (``DestinationCatalog``).
+"""
+
+import logging
+import sqlite3
+
+import pytest
+
+from organizer import ContentIndex, DestinationCatalog, FileInfo, OrganizationMode, SmartFileOrganizer
+
+LOGGER = logging.getLogger("testes")
+NOMES = ["relatório anual 2024.pdf", "Relatorio mensal.docx", "foto praia.jpg",
+         "fatura_energia.pdf", "notas.txt"]
+
+
+def organizar(tmp_path, catalog):
+    source = tmp_path / "origem"
+    source.mkdir()
+    for i, name in enumerate(NOMES):
+        (source / name).write_bytes(b"conteudo %d" % i)
+    destination = tmp_path / "destino"
+    organizer = SmartFileOrganizer(logger=LOGGER, report_sink=lambda report: None)
+    organizer.organization_mode = OrganizationMode.BY_TYPE_ONLY
+    organizer.catalog_enabled = catalog
+    stats = organizer.organize_files(str(source), str(destination))
+    assert stats.organized_files == len(NOMES)
+    return destination
+
+
+def nomes(rows):
+    return sorted(row["name"] for row in rows)
+
+
+def test_catalogo_so_com_opcao(tmp_path):
+    destination = organizar(tmp_path, catalog=False)
+
+    assert not (destination / ContentIndex.INDEX_DIR).exists()
+    assert DestinationCatalog.open_existing(destination, LOGGER) is None
+    assert not (destination / ContentIndex.INDEX_DIR).exists()
+
+
+def test_busca_fts(tmp_path):
+    destination = organizar(tmp_path, catalog=True)
+    catalog = DestinationCatalog.open_existing(destination, LOGGER)
+    try:
+        assert catalog.fts
+        # Prefixo, sem acento e sem diferenciar maiúsculas
+        assert nomes(catalog.search("relat")) == ["Relatorio mensal.docx", "relatório anual 2024.pdf"]
+        # Todas as palavras precisam casar (no nome ou no caminho)
+        assert nomes(catalog.search("relatorio 2024")) == ["relatório anual 2024.pdf"]
+        assert nomes(catalog.search("imagens praia")) == ["foto praia.jpg"]
+        assert nomes(catalog.search("energia")) == ["fatura_energia.pdf"]
+        assert catalog.search("inexistente") == []
+        assert len(catalog.search("pdf", limit=1)) == 1
+
+        row = catalog.search("notas")[0]
+        assert (row["path"], row["category"], row["kind"]) == ("documentos/notas.txt", "documentos", "move")
+        assert row["source"].endswith("notas.txt")
+        assert catalog.summary()["files"] == len(NOMES)
+    finally:
+        catalog.close()
+
+
+def criar_catalogo(tmp_path, monkeypatch=None, fts=True):
+    if not fts:
+        # Como um SQLite compilado sem FTS5
+        monkeypatch.setattr(DestinationCatalog, "FTS_SCHEMA",
+                            "CREATE VIRTUAL TABLE files_fts USING modulo_inexistente(name);")
+    catalog = DestinationCatalog.open(tmp_path / "destino", LOGGER)
+    assert catalog.fts == fts
+    return catalog
+
+
+def arquivo(name, size=10):
+    return FileInfo(f"/origem/{name}", size, 0.0, 0.0, "." + name.rsplit(".", 1)[-1])
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_atualizacao_e_remocao(tmp_path, monkeypatch, fts):
+    catalog = criar_catalogo(tmp_path, monkeypatch, fts)
+    try:
+        catalog.add("docs/contrato.pdf", arquivo("contrato.pdf"), "documentos")
+        catalog.add("docs/recibo.pdf", arquivo("recibo.pdf"), "documentos")
+        catalog.add("docs/contrato.pdf", arquivo("contrato.pdf", size=99), "documentos", kind="link")
+        catalog.remove("docs/recibo.pdf")
+        catalog.flush()
+
+        rows = catalog.search("contrato")
+        assert [(row["size"], row["kind"]) for row in rows] == [(99, "link")]
+        assert catalog.search("recibo") == []
+        assert catalog.summary()["files"] == 1
+    finally:
+        catalog.close()
+
+
+def test_gravacao_em_lotes(tmp_path, monkeypatch):
+    monkeypatch.setattr(DestinationCatalog, "BATCH_SIZE", 3)
+    catalog = criar_catalogo(tmp_path)
+
+    def gravados():
+        connection = sqlite3.connect(catalog.path)
+        try:
+            return connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        finally:
+            connection.close()
+
+    try:
+        for i in range(4):
+            catalog.add(f"a{i}.txt", arquivo(f"a{i}.txt"), "documentos")
+        # O lote cheio foi gravado; o quarto registro espera o próximo lote ou o fim
+        assert gravados() == 3
+    finally:
+        catalog.close()
+    assert gravados() == 4
+
+
+def test_recriacao_a_partir_do_destino(tmp_path):
+    destination = organizar(tmp_path, catalog=False)
+    (destination / "imagens" / "externa.png").write_bytes(b"copiada por fora")
+    organizer = SmartFileOrganizer(logger=LOGGER, report_sink=lambda report: None)
+    organizer.catalog_enabled = True
+
+    catalog = organizer.rebuild_catalog(str(destination))
+    try:
+        summary = catalog.summary()
+        assert summary["files"] == len(NOMES) + 1
+        assert dict((category, count) for category, count, _ in summary["categories"]) == {
+            "documentos": 4, "imagens": 2}
+        row = catalog.search("externa")[0]
+        assert (row["kind"], row["source"], row["md5"]) == ("rebuild", None, None)
+    finally:
+        organizer.close_catalogs()
@@ -0,0 +1,175 @@
+"""
+Testes do índice persistente de conteúdo do destino (``ContentIndex``).
+"""
+
+import hashlib
+import logging
+import sqlite3
+
+import pytest
+
+from organizer import ContentIndex, DestinationCatalog, SmartFileOrganizer
+
+LOGGER = logging.getLogger("testes")
+
+
+def test_lote_com_falha_ainda_grava_indice_e_catalogo(tmp_path):
+    source = tmp_path / "origem"
+    source.mkdir()
+    for i in range(5):
+        (source / f"arquivo{i}.txt").write_bytes(b"x" * (10 + i))
+    destination = tmp_path / "destino"
+
+    organizer = SmartFileOrganizer(logger=LOGGER, report_sink=lambda report: None)
+    organizer.content_index = True
+    organizer.catalog_enabled = True
+    organizer.max_workers = 1
+    process_batch = organizer._process_batch
+    calls = []
+
+    def failing_batch(batch, *args):
+        # O último lote falha depois que os anteriores já foram organizados
+        calls.append(batch)
+        if len(calls) == 5:
+            raise RuntimeError("falha simulada no lote")
+        return process_batch(batch, *args)
+
+    organizer._process_batch = failing_batch
+
+    with pytest.raises(RuntimeError):
+        organizer.organize_files(str(source), str(destination))
+
+    organized = list(destination.rglob("*.txt"))
+    assert len(organized) == 4
+    index = ContentIndex.open(destination, LOGGER)
+    for path in organized:
+        assert index.has_size(path.stat().st_size)
+    assert not index.has_size(next(source.iterdir()).stat().st_size)
+
+    connection = sqlite3.connect(destination / ContentIndex.INDEX_DIR / DestinationCatalog.CATALOG_FILE)
+    try:
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 4
+    finally:
+        connection.close()
+    assert organizer._catalogs == {}
+
+
+def md5(path) -> str:
+    return hashlib.md5(path.read_bytes()).hexdigest()
+
+
+def criar_destino(tmp_path, arquivos):
+    destination = tmp_path / "destino"
+    for relative_path, data in arquivos.items():
+        path = destination / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    destination.mkdir(exist_ok=True)
+    return destination
+
+
+def test_log_sobrevive_a_reabertura(tmp_path):
+    destination = criar_destino(tmp_path, {})
+    index = ContentIndex.open(destination, LOGGER)
+    arquivos = {"docs/a.txt": b"conteudo a", "docs/copia de a.txt": b"conteudo a", "fotos/b.jpg": b"bb"}
+    for relative_path, data in arquivos.items():
+        path = destination / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    index.add(len(b"conteudo a"), md5(destination / "docs/a.txt"), "docs/a.txt")
+    index.add(len(b"conteudo a"), md5(destination / "docs/a.txt"), "docs/copia de a.txt")
+    index.add(2, None, "fotos/b.jpg")  # sem hash: pendente
+    index.flush()
+
+    reopened = ContentIndex.open(destination, LOGGER)
+
+    assert reopened.has_size(len(b"conteudo a")) and reopened.has_size(2)
+    assert reopened.find(len(b"conteudo a"), md5(destination / "docs/a.txt"), md5) == destination / "docs/a.txt"
+    # A entrada pendente é resolvida com a função de hash quando um candidato aparece
+    assert reopened.find(2, md5(destination / "fotos/b.jpg"), md5) == destination / "fotos/b.jpg"
+    assert reopened.find(2, hashlib.md5(b"cc").hexdigest(), md5) is None
+
+
+@pytest.mark.parametrize("torn", [
+    lambda record: record[:ContentIndex.RECORD.size - 3],  # cabeçalho cortado
+    lambda record: record[:-2],                             # caminho cortado
+])
+def test_registro_final_incompleto_e_descartado(tmp_path, torn):
+    destination = criar_destino(tmp_path, {"a.txt": b"aaa", "b.txt": b"bbbb"})
+    index = ContentIndex.open(destination, LOGGER)
+    index.add(3, md5(destination / "a.txt"), "a.txt")
+    index.flush()
+    valid_size = index.path.stat().st_size
+    encoded = "b.txt".encode()
+    record = ContentIndex.RECORD.pack(4, bytes.fromhex(md5(destination / "b.txt")), len(encoded)) + encoded
+    with open(index.path, "ab") as f:
+        f.write(torn(record))
+
+    reopened = ContentIndex.open(destination, LOGGER)
+
+    assert index.path.stat().st_size == valid_size
+    assert reopened.find(3, md5(destination / "a.txt"), md5) == destination / "a.txt"
+    # Registros novos não são anexados ao resto do registro incompleto
+    reopened.add(4, md5(destination / "b.txt"), "b.txt")
+    reopened.flush()
+    again = ContentIndex.open(destination, LOGGER)
+    assert again.find(4, md5(destination / "b.txt"), md5) == destination / "b.txt"
+    assert again.find(3, md5(destination / "a.txt"), md5) == destination / "a.txt"
+
+
+def test_indice_invalido_e_reconstruido(tmp_path):
+    destination = criar_destino(tmp_path, {"a.txt": b"aaa"})
+    path = destination / ContentIndex.INDEX_DIR / ContentIndex.INDEX_FILE
+    path.parent.mkdir()
+    path.write_bytes(b"lixo")
+
+    index = ContentIndex.open(destination, LOGGER)
+
+    assert index.path.read_bytes().startswith(ContentIndex.MAGIC)
+    assert index.find(3, md5(destination / "a.txt"), md5) == destination / "a.txt"
+
+
+def test_remocao_vale_so_para_a_copia_substituida(tmp_path):
+    # ``replace`` apaga uma cópia; as demais com o mesmo conteúdo continuam no índice
+    destination = criar_destino(tmp_path, {"a.txt": b"igual", "b.txt": b"igual"})
+    digest = md5(destination / "a.txt")
+    index = ContentIndex.open(destination, LOGGER, rebuild=True)
+    index.add(5, digest, "a.txt")
+    index.add(5, digest, "b.txt")
+    index.flush()
+
+    (destination / "a.txt").unlink()
+    index.remove(5, digest, "a.txt")
+    index.flush()
+
+    reopened = ContentIndex.open(destination, LOGGER)
+    assert reopened.find(5, digest, md5) == destination / "b.txt"
+
+    (destination / "b.txt").unlink()
+    reopened.remove(5, digest, "b.txt")
+    reopened.flush()
+    again = ContentIndex.open(destination, LOGGER)
+    assert not again.has_size(5)
+    assert again.find(5, digest, md5) is None
+
+
+def test_compactacao_regrava_so_o_estado_atual(tmp_path):
+    destination = criar_destino(tmp_path, {"a.txt": b"aaa", "b.txt": b"bbb"})
+    digest_a, digest_b = md5(destination / "a.txt"), md5(destination / "b.txt")
+    index = ContentIndex.open(destination, LOGGER, rebuild=True)
+    index.add(3, digest_a, "a.txt")
+    index.add(3, digest_b, "b.txt")
+    index.flush()
+
+    # Muito mais registros que entradas: o próximo flush compacta o log
+    for _ in range(600):
+        index.remove(3, digest_b, "b.txt")
+        index.add(3, digest_b, "b.txt")
+    index.remove(3, digest_a, "a.txt")
+    index.flush()
+
+    assert index.path.stat().st_size == len(ContentIndex.MAGIC) + ContentIndex.RECORD.size + len("b.txt")
+    assert not index.path.with_suffix(".tmp").exists()
+    reopened = ContentIndex.open(destination, LOGGER)
+    assert reopened.find(3, digest_b, md5) == destination / "b.txt"
+    assert reopened.find(3, digest_a, md5) is None
@@ -0,0 +1,151 @@
+"""
+Testes da detecção de duplicatas com vários workers.
+
+Arquivos com conteúdo diferente não podem esperar uns pelos outros (nem
+quando os tamanhos coincidem); cópias iguais em paralelo continuam sendo
+detectadas.
+"""
+
+import errno
+import logging
+import os
+import threading
+
+import pytest
+
+from organizer import LatencyBackend, MemoryBackend, SmartFileOrganizer
+
+
+class BarrierBackend(MemoryBackend):
+    """Cada rename espera os demais workers: só termina se todos moverem ao mesmo tempo."""
+
+    def __init__(self, parties: int):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def rename(self, source, target):
+        self.barrier.wait()
+        super().rename(source, target)
+
+
+def criar_organizador(backend, output_dir, policy: str, workers: int = 8) -> SmartFileOrganizer:
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"),
+                                   output_dir=str(output_dir), backend=backend)
+    organizer.duplicate_handling = policy
+    organizer.max_workers = workers
+    return organizer
+
+
+@pytest.mark.parametrize("policy", ["skip", "replace", "hardlink"])
+def test_conteudos_distintos_nao_se_serializam(tmp_path, policy):
+    # Tamanhos múltiplos de 16: cairiam todos no mesmo lock por tamanho
+    backend = BarrierBackend(parties=4)
+    for i in range(4):
+        backend.add_file(f"/origem/arquivo{i}.bin", bytes([i]) * 16 * (i + 1))
+    organizer = criar_organizador(backend, tmp_path, policy, workers=4)
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.errors == 0
+    assert stats.organized_files == 4
+
+
+@pytest.mark.parametrize("policy", ["skip", "hardlink"])
+def test_copias_iguais_em_paralelo_sao_detectadas(tmp_path, policy):
+    backend = LatencyBackend(MemoryBackend(), latency=0.002)
+    for i in range(12):
+        backend.inner.add_file(f"/origem/pasta{i % 3}/copia{i}.txt", b"mesmo conteudo")
+    backend.inner.add_file("/origem/outro.txt", b"outro conteudo")
+    organizer = criar_organizador(backend, tmp_path, policy)
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.errors == 0
+    if policy == "skip":
+        assert stats.organized_files == 2
+        assert stats.duplicates_found == 11
+    else:
+        assert stats.organized_files == 13
+        assert backend.calls["link"] == 11
+
+
+def test_copias_iguais_em_paralelo_com_indice(tmp_path):
+    # Com o índice, o primeiro arquivo de um tamanho inédito não calcula hash:
+    # os demais do mesmo tamanho precisam esperar o registro dele
+    source = tmp_path / "origem"
+    source.mkdir()
+    for i in range(12):
+        (source / f"copia{i}.txt").write_bytes(b"mesmo conteudo")
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"),
+                                   report_sink=lambda report: None)
+    organizer.duplicate_handling = "skip"
+    organizer.content_index = True
+    organizer.max_workers = 8
+
+    stats = organizer.organize_files(str(source), str(tmp_path / "destino"))
+
+    assert stats.organized_files == 1
+    assert stats.duplicates_found == 11
+
+
+def arquivos(backend, root):
+    """Caminhos dos arquivos sob ``root`` no backend."""
+    found, pending = [], [root]
+    while pending:
+        with backend.scandir(pending.pop()) as iterator:
+            for entry in iterator:
+                (pending if entry.is_dir(follow_symlinks=False) else found).append(entry.path)
+    return found
+
+
+class NoLinkBackend(MemoryBackend):
+    """Sistema de arquivos sem hardlinks (como FAT ou um compartilhamento SMB)."""
+
+    def link(self, source, target):
+        raise OSError(errno.EPERM, "hardlink não suportado")
+
+
+@pytest.mark.parametrize("policy, backend_class", [
+    ("hardlink", NoLinkBackend),
+    ("reflink", MemoryBackend),  # sem clones fora do disco local
+])
+def test_vinculo_indisponivel_ainda_conta_duplicata(tmp_path, caplog, policy, backend_class):
+    backend = backend_class()
+    organizer = criar_organizador(backend, tmp_path, policy, workers=4)
+
+    with caplog.at_level(logging.WARNING):
+        for run in range(2):
+            for i in range(6):
+                backend.add_file(f"/origem/copia{i}.txt", b"mesmo conteudo %d" % run)
+            backend.add_file("/origem/outro.txt", b"outro conteudo %d" % run)
+
+            stats = organizer.organize_files("/origem", f"/destino{run}")
+
+            assert stats.errors == 0
+            assert stats.organized_files == 7
+            assert stats.duplicates_found == 5
+            assert len(arquivos(backend, f"/destino{run}")) == 7
+
+    # Um aviso por execução, não um por arquivo
+    assert caplog.text.count("não suportado neste sistema de arquivos") == 2
+
+
+def test_vinculo_indisponivel_no_modo_multiprocesso(tmp_path, caplog, monkeypatch):
+    source = tmp_path / "origem"
+    for shard in range(3):
+        (source / f"pasta{shard}").mkdir(parents=True)
+        for i in range(2):
+            (source / f"pasta{shard}" / f"copia{i}.txt").write_bytes(b"mesmo conteudo")
+    def no_link(*args, **kwargs):
+        raise OSError(errno.EPERM, "hardlink não suportado")
+
+    monkeypatch.setattr(os, "link", no_link)
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+    organizer.duplicate_handling = "hardlink"
+
+    with caplog.at_level(logging.WARNING):
+        stats = organizer.organize_files_sharded(str(source), str(tmp_path / "destino"), processes=2)
+
+    assert (stats.organized_files, stats.duplicates_found, stats.errors) == (6, 5, 0)
+    assert len(list((tmp_path / "destino").rglob("*.txt"))) == 6
+    assert caplog.text.count("não suportado neste sistema de arquivos") == 1
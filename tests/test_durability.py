@@ -0,0 +1,197 @@
+"""
+Testes dos modos de durabilidade (``DurabilityManager``).
+
+A garantia do modo ``batched``: a origem de uma cópia ou vínculo só é
+removida depois do fsync que tornou o destino durável — também quando a
+execução termina com um lote falhando.
+"""
+
+import errno
+import logging
+import os
+
+import pytest
+
+from organizer import DurabilityManager, SmartFileOrganizer
+
+LOGGER = logging.getLogger("testes")
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Ordem dos fsyncs (arquivos e pastas) e das remoções feitas durante o teste."""
+    recorded = []
+    fsync_file, fsync_directory, unlink = DurabilityManager._fsync_file, DurabilityManager._fsync_directory, os.unlink
+
+    def record_fsync_file(manager, path):
+        recorded.append(("fsync", os.fspath(path)))
+        return fsync_file(manager, path)
+
+    def record_fsync_directory(manager, directory):
+        recorded.append(("fsync", os.fspath(directory)))
+        return fsync_directory(manager, directory)
+
+    def record_unlink(path, *args, **kwargs):
+        recorded.append(("unlink", os.fspath(path)))
+        return unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(DurabilityManager, "_fsync_file", record_fsync_file)
+    monkeypatch.setattr(DurabilityManager, "_fsync_directory", record_fsync_directory)
+    monkeypatch.setattr(os, "unlink", record_unlink)
+    return recorded
+
+
+def criar_copia(tmp_path, name="a.txt"):
+    """Origem e destino com o mesmo conteúdo, como depois de uma cópia entre discos."""
+    source = tmp_path / "origem" / name
+    target = tmp_path / "destino" / name
+    for path in (source, target):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"conteudo")
+    return source, target
+
+
+def assert_synced_before_unlink(events, source, target):
+    unlink = events.index(("unlink", str(source)))
+    assert ("fsync", str(target)) in events[:unlink]
+    assert ("fsync", str(target.parent)) in events[:unlink]
+
+
+def test_batched_adia_a_remocao_ate_o_checkpoint(tmp_path, events):
+    source, target = criar_copia(tmp_path)
+    manager = DurabilityManager("batched", logger=LOGGER)
+
+    manager.placed(target, data_written=True)
+    manager.remove_source(source)
+
+    assert source.exists()
+    assert events == []
+
+    manager.checkpoint()
+
+    assert not source.exists()
+    assert_synced_before_unlink(events, source, target)
+    assert events[-1] == ("fsync", str(source.parent))
+    assert manager.checkpoints == 1
+
+
+def test_checkpoint_por_numero_de_operacoes(tmp_path, events):
+    manager = DurabilityManager("batched", checkpoint_operations=3, logger=LOGGER)
+    sources = []
+    for i in range(3):
+        source, target = criar_copia(tmp_path, f"{i}.txt")
+        manager.placed(target, data_written=True)
+        manager.remove_source(source)
+        sources.append(source)
+
+    # O terceiro ``placed`` disparou o checkpoint; a remoção registrada depois dele espera o próximo
+    assert manager.checkpoints == 1
+    assert [source.exists() for source in sources] == [False, False, True]
+    manager.close()
+    assert not any(source.exists() for source in sources)
+
+
+def test_fsync_com_falha_mantem_a_origem(tmp_path, events, monkeypatch, caplog):
+    source, target = criar_copia(tmp_path)
+    manager = DurabilityManager("batched", logger=LOGGER)
+    manager.placed(target, data_written=True)
+    manager.remove_source(source)
+
+    def failing_fsync(fd):
+        raise OSError(errno.EIO, "erro de E/S")
+
+    monkeypatch.setattr(os, "fsync", failing_fsync)
+    with caplog.at_level(logging.WARNING):
+        manager.checkpoint()
+
+    assert source.exists() and target.exists()
+    assert not any(kind == "unlink" for kind, _ in events)
+    assert "mantida" in caplog.text
+
+
+def test_strict_sincroniza_antes_de_remover(tmp_path, events):
+    source, target = criar_copia(tmp_path)
+    manager = DurabilityManager("strict", logger=LOGGER)
+
+    manager.placed(target)
+    manager.remove_source(source)
+
+    assert not source.exists()
+    unlink = events.index(("unlink", str(source)))
+    assert ("fsync", str(target.parent)) in events[:unlink]
+
+
+def test_depois_de_close_remove_na_hora(tmp_path, events):
+    source, target = criar_copia(tmp_path)
+    manager = DurabilityManager("batched", logger=LOGGER)
+    manager.close()
+
+    manager.placed(target, data_written=True)
+    manager.remove_source(source)
+
+    assert not source.exists()
+    assert_synced_before_unlink(events, source, target)
+
+
+def criar_duplicatas(tmp_path):
+    source = tmp_path / "origem"
+    for folder in ("a", "b", "c", "d"):
+        (source / folder).mkdir(parents=True)
+        (source / folder / "relatorio.txt").write_bytes(b"mesmo conteudo")
+    (source / "outro.txt").write_bytes(b"outro conteudo")
+    return source
+
+
+def criar_organizador():
+    organizer = SmartFileOrganizer(logger=LOGGER, report_sink=lambda report: None)
+    organizer.duplicate_handling = "hardlink"
+    organizer.durability_mode = "batched"
+    organizer.max_workers = 1
+    return organizer
+
+
+def vinculos(destination):
+    """Arquivos do destino criados como vínculo de outro (st_nlink > 1)."""
+    return [path for path in destination.rglob("*.txt") if path.stat().st_nlink > 1]
+
+
+def test_organizacao_remove_origens_vinculadas_depois_do_fsync(tmp_path, events):
+    source = criar_duplicatas(tmp_path)
+    destination = tmp_path / "destino"
+
+    stats = criar_organizador().organize_files(str(source), str(destination))
+
+    assert stats.organized_files == 5
+    assert stats.duplicates_found == 3
+    assert list(source.rglob("*.txt")) == []
+    linked_dir = str(vinculos(destination)[0].parent)
+    unlinks = [i for i, event in enumerate(events) if event[0] == "unlink"]
+    assert len(unlinks) == 3
+    assert events.index(("fsync", linked_dir)) < unlinks[0]
+
+
+def test_lote_com_falha_ainda_remove_as_origens_adiadas(tmp_path, events):
+    source = criar_duplicatas(tmp_path)
+    destination = tmp_path / "destino"
+    organizer = criar_organizador()
+    process_batch = organizer._process_batch
+    calls = []
+
+    def failing_batch(batch, *args):
+        calls.append(batch)
+        if len(calls) == 5:
+            raise RuntimeError("falha simulada no lote")
+        return process_batch(batch, *args)
+
+    organizer._process_batch = failing_batch
+
+    with pytest.raises(RuntimeError):
+        organizer.organize_files(str(source), str(destination))
+
+    # Quatro arquivos organizados: os vinculados não ficam também na origem
+    assert len(list(destination.rglob("*.txt"))) == 4
+    assert len(list(source.rglob("*.txt"))) == 1
+    unlinks = [i for i, event in enumerate(events) if event[0] == "unlink"]
+    assert unlinks
+    for path in vinculos(destination):
+        assert events.index(("fsync", str(path.parent))) < unlinks[0]
@@ -0,0 +1,162 @@
+"""
+Testes da varredura incremental (``ScanSnapshot``).
+
+As pastas do teste têm o mtime recuado: alterações a menos de
+``RACY_WINDOW_NS`` da varredura nunca são consideradas estáveis.
+"""
+
+import logging
+import os
+import time
+
+from organizer import OrganizationStats, ScanSnapshot, SmartFileOrganizer
+
+ARQUIVOS = ["a.txt", "b.txt", "sub1/c.txt", "sub1/fundo/d.txt", "sub2/e.txt"]
+
+
+def criar_origem(tmp_path):
+    source = tmp_path / "origem"
+    for relative_path in ARQUIVOS:
+        path = source / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative_path)
+    envelhecer(source)
+    return source
+
+
+def envelhecer(source, seconds=3600):
+    """Recua o mtime de todas as pastas (fora da janela de mudanças simultâneas)."""
+    past = time.time() - seconds
+    for folder, _, _ in os.walk(source):
+        os.utime(folder, (past, past))
+
+
+def criar_organizador(tmp_path):
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), output_dir=str(tmp_path / "saida"),
+                                   report_sink=lambda report: None)
+    organizer.incremental_scan = True
+    return organizer
+
+
+def varrer(organizer, source, save=True):
+    """Uma varredura seguida do fim da execução (que grava o retrato)."""
+    stats = OrganizationStats()
+    files = organizer.scan_source(source, True, stats)
+    if save:
+        organizer._save_scan_snapshot(source)
+    return sorted(os.path.relpath(file_info.path_str, source) for file_info in files), stats
+
+
+def test_pastas_inalteradas_nao_sao_relistadas(tmp_path):
+    source = criar_origem(tmp_path)
+    organizer = criar_organizador(tmp_path)
+
+    files, stats = varrer(organizer, source)
+    assert files == sorted(ARQUIVOS)
+    assert stats.pruned_directories == 0
+
+    # Os arquivos que ficaram já foram vistos (ignorados ou com falha na execução anterior)
+    files, stats = varrer(organizer, source)
+    assert files == []
+    assert stats.pruned_directories == 4
+
+
+def test_so_a_pasta_alterada_e_relistada(tmp_path):
+    source = criar_origem(tmp_path)
+    organizer = criar_organizador(tmp_path)
+    varrer(organizer, source)
+
+    (source / "sub1" / "fundo" / "novo.txt").write_text("novo")
+    (source / "sub2" / "nova").mkdir()
+    (source / "sub2" / "nova" / "f.txt").write_text("f")
+
+    files, stats = varrer(organizer, source)
+
+    # A pasta alterada é relistada inteira; a pasta inalterada acima dela não,
+    # mas as subpastas dela continuam sendo visitadas
+    assert files == ["sub1/fundo/d.txt", "sub1/fundo/novo.txt", "sub2/e.txt", "sub2/nova/f.txt"]
+    assert stats.pruned_directories == 2  # raiz e sub1
+
+
+def test_pasta_removida_sai_do_retrato(tmp_path):
+    source = criar_origem(tmp_path)
+    organizer = criar_organizador(tmp_path)
+    varrer(organizer, source)
+
+    (source / "sub2" / "e.txt").unlink()
+    (source / "sub2").rmdir()
+    past = time.time() - 3600
+    os.utime(source, (past, past))
+    files, _ = varrer(organizer, source)
+    assert files == ["a.txt", "b.txt"]
+
+    files, stats = varrer(organizer, source)
+    assert files == []
+    assert stats.pruned_directories == 3
+
+
+def test_mudanca_recente_nunca_e_podada(tmp_path):
+    source = criar_origem(tmp_path)
+    envelhecer(source, seconds=0)
+    organizer = criar_organizador(tmp_path)
+    varrer(organizer, source)
+
+    files, stats = varrer(organizer, source)
+
+    assert files == sorted(ARQUIVOS)
+    assert stats.pruned_directories == 0
+
+
+def test_varredura_completa_forcada_ou_periodica(tmp_path):
+    source = criar_origem(tmp_path)
+    organizer = criar_organizador(tmp_path)
+    varrer(organizer, source)
+
+    organizer.force_full_rescan = True
+    files, stats = varrer(organizer, source)
+    assert files == sorted(ARQUIVOS) and stats.pruned_directories == 0
+
+    organizer.force_full_rescan = False
+    organizer.full_rescan_hours = 0
+    files, stats = varrer(organizer, source)
+    assert files == sorted(ARQUIVOS) and stats.pruned_directories == 0
+
+
+def test_retrato_so_vale_depois_de_uma_execucao_completa(tmp_path):
+    source = criar_origem(tmp_path)
+    organizer = criar_organizador(tmp_path)
+
+    # Execução interrompida: o retrato não é gravado e a próxima varredura é completa
+    varrer(organizer, source, save=False)
+    files, _ = varrer(organizer, source)
+    assert files == sorted(ARQUIVOS)
+
+    # Retrato corrompido ou de outra versão também leva a uma varredura completa
+    snapshot = ScanSnapshot.open(tmp_path / "saida", source, 168)
+    assert not snapshot.full_scan
+    snapshot.path.write_text("{corrompido")
+    files, stats = varrer(organizer, source)
+    assert files == sorted(ARQUIVOS) and stats.pruned_directories == 0
+
+
+def test_organizacao_grava_o_retrato_e_pula_o_que_ficou(tmp_path):
+    source = tmp_path / "origem"
+    (source / "fotos").mkdir(parents=True)
+    (source / "fotos" / "repetida.jpg").write_bytes(b"mesma foto")
+    (source / "fotos" / "copia.jpg").write_bytes(b"mesma foto")
+    envelhecer(source)
+    organizer = criar_organizador(tmp_path)
+    organizer.duplicate_handling = "skip"
+    organizer.content_index = True  # a duplicata continua sendo reconhecida entre execuções
+
+    stats = organizer.organize_files(str(source), str(tmp_path / "destino"))
+    assert (stats.organized_files, stats.duplicates_found) == (1, 1)
+    # A pasta mudou (um arquivo saiu), então a próxima execução a relista
+    envelhecer(source)
+    stats = organizer.organize_files(str(source), str(tmp_path / "destino"))
+    assert stats.total_files == 1 and stats.duplicates_found == 1
+
+    # Nada mudou desde então: a duplicata ignorada não é examinada de novo
+    stats = organizer.organize_files(str(source), str(tmp_path / "destino"))
+    assert stats.total_files == 0
+    assert stats.pruned_directories == 2
@@ -0,0 +1,160 @@
+"""
+Testes da fila de tarefas (``JobScheduler`` e ``--jobs``).
+"""
+
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from organizer import ContentIndex, DestinationCatalog, JobScheduler, OrganizationJob, SmartFileOrganizer
+
+ROOT = Path(__file__).resolve().parent.parent
+LOGGER = logging.getLogger("testes")
+
+
+def criar_origem(folder, count):
+    folder.mkdir(parents=True)
+    for i in range(count):
+        (folder / f"arquivo{i}.txt").write_bytes(b"conteudo %d de %s" % (i, folder.name.encode()))
+    return str(folder)
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    """Ordem dos arquivos processados (destino da tarefa) e pico de operações simultâneas."""
+    record = {"order": [], "running": 0, "peak": 0}
+    lock = threading.Lock()
+    process_single_file = SmartFileOrganizer.process_single_file
+
+    def slow_process(organizer, file_info, destination_path, *args):
+        with lock:
+            record["running"] += 1
+            record["peak"] = max(record["peak"], record["running"])
+        try:
+            time.sleep(0.02)
+            return process_single_file(organizer, file_info, destination_path, *args)
+        finally:
+            with lock:
+                record["running"] -= 1
+                record["order"].append(Path(destination_path).name)
+
+    monkeypatch.setattr(SmartFileOrganizer, "process_single_file", slow_process)
+    return record
+
+
+def test_limite_por_dispositivo(tmp_path, processed):
+    # Origens e destinos no mesmo disco: o limite por dispositivo manda, não o orçamento global
+    scheduler = JobScheduler(max_workers=8, per_device_limit=2, logger=LOGGER)
+    for name in ("a", "b", "c"):
+        scheduler.add_job(OrganizationJob(criar_origem(tmp_path / f"origem_{name}", 6),
+                                          str(tmp_path / f"destino_{name}"), name=name))
+
+    results = scheduler.run()
+
+    assert processed["peak"] == 2
+    assert all(stats.organized_files == 6 for stats in results.values())
+
+
+def test_orcamento_global(tmp_path, processed):
+    scheduler = JobScheduler(max_workers=3, logger=LOGGER)
+    for name in ("a", "b"):
+        scheduler.add_job(OrganizationJob(criar_origem(tmp_path / f"origem_{name}", 8),
+                                          str(tmp_path / f"destino_{name}"), name=name))
+
+    scheduler.run()
+
+    assert processed["peak"] == 3
+
+
+def test_despacho_alterna_entre_tarefas(tmp_path, processed):
+    scheduler = JobScheduler(max_workers=1, logger=LOGGER)
+    scheduler.add_job(OrganizationJob(criar_origem(tmp_path / "origem_grande", 30),
+                                      str(tmp_path / "destino_grande"), name="grande"))
+    scheduler.add_job(OrganizationJob(criar_origem(tmp_path / "origem_pequena", 4),
+                                      str(tmp_path / "destino_pequena"), name="pequena"))
+
+    results = scheduler.run()
+
+    # A tarefa pequena não espera a grande terminar: sai logo depois das primeiras rodadas
+    order = processed["order"]
+    last_small = max(i for i, name in enumerate(order) if name == "destino_pequena")
+    assert last_small < 12
+    assert results["grande"].organized_files == 30
+    assert results["pequena"].organized_files == 4
+
+
+def escrever_tarefas(tmp_path, jobs, **extra):
+    job_file = tmp_path / "tarefas.json"
+    job_file.write_text(json.dumps({"jobs": jobs, **extra}), encoding="utf-8")
+    return str(job_file)
+
+
+def test_arquivo_de_tarefas(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"organization_mode": "apenas_tipo", "duplicate_handling": "skip"}),
+                      encoding="utf-8")
+    source = tmp_path / "origem"
+    (source / "sub").mkdir(parents=True)
+    (source / "raiz.txt").write_bytes(b"raiz")
+    (source / "sub" / "funda.txt").write_bytes(b"funda")
+    other = criar_origem(tmp_path / "outra", 1)
+    job_file = escrever_tarefas(tmp_path, [
+        {"name": "com_config", "source": str(source), "destination": str(tmp_path / "d1"),
+         "config": str(config), "include_subdirs": False},
+        {"source": other, "destination": str(tmp_path / "d2")},
+    ], max_workers=5, per_device_limit=2)
+
+    scheduler = JobScheduler.from_job_file(job_file, logger=LOGGER, overrides={"durability": "strict"})
+
+    assert (scheduler.max_workers, scheduler.per_device_limit) == (5, 2)
+    assert [job.name for job in scheduler.jobs] == ["com_config", other]
+    assert scheduler.jobs[0].include_subdirs is False
+
+    scheduler.run()
+
+    organizers = {state.job.name: state.organizer for state in scheduler._states}
+    assert organizers["com_config"].organization_mode.value == "apenas_tipo"
+    assert organizers["com_config"].duplicate_handling == "skip"
+    assert organizers[other].organization_mode.value == "tipo_e_data"
+    assert all(organizer.durability_mode == "strict" for organizer in organizers.values())
+    # Sem subpastas, só o arquivo da raiz vai para a primeira tarefa
+    assert [path.name for path in (tmp_path / "d1").rglob("*.txt")] == ["raiz.txt"]
+    assert (source / "sub" / "funda.txt").exists()
+
+
+def test_tarefa_com_nome_repetido_e_rejeitada(tmp_path):
+    job_file = escrever_tarefas(tmp_path, [
+        {"name": "x", "source": "/a", "destination": "/b"},
+        {"name": "x", "source": "/c", "destination": "/d"},
+    ])
+
+    with pytest.raises(ValueError):
+        JobScheduler.from_job_file(job_file, logger=LOGGER)
+
+
+def test_opcoes_globais_valem_para_todas_as_tarefas(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"organization_mode": "apenas_tipo",
+                                  "advanced_settings": {"timeout_seconds": 0}}), encoding="utf-8")
+    jobs = [{"name": name, "source": criar_origem(tmp_path / f"origem_{name}", 2),
+             "destination": str(tmp_path / f"destino_{name}"), "config": str(config)}
+            for name in ("a", "b")]
+    job_file = escrever_tarefas(tmp_path, jobs)
+
+    result = subprocess.run([sys.executable, str(ROOT / "organizer.py"), "--jobs", job_file,
+                             "--catalog", "--mode", "apenas_data"],
+                            cwd=tmp_path, capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == 0, result.stdout + result.stderr
+    for name in ("a", "b"):
+        destination = tmp_path / f"destino_{name}"
+        assert (destination / ContentIndex.INDEX_DIR / DestinationCatalog.CATALOG_FILE).exists()
+        # --mode vence o organization_mode do config da tarefa: pastas por data, sem "documentos"
+        assert not (destination / "documentos").exists()
+        assert len(list(destination.rglob("*.txt"))) == 2
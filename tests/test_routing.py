@@ -0,0 +1,192 @@
+"""
+Testes das regras de roteamento (``RoutingRules``).
+
+A árvore de decisão (extensão → trie de prefixos → regex única) precisa dar
+sempre o mesmo resultado que percorrer a lista e ficar com a primeira
+regra que casa.
+"""
+
+import datetime
+import fnmatch
+import logging
+import os
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from organizer import FileInfo, RoutingRules, SmartFileOrganizer
+
+NOW = datetime.datetime(2024, 6, 1, 12, 0).timestamp()
+DAY = 24 * 3600
+
+
+def arquivo(path: str, size: int = 100, age_days: float = 0) -> FileInfo:
+    mtime = NOW - age_days * DAY
+    return FileInfo.from_stat(path, os.stat_result((0o100644, 0, 0, 1, 0, 0, size, mtime, mtime, mtime)))
+
+
+def regra(rules: RoutingRules, file_info: FileInfo):
+    rule = rules.match(file_info, NOW)
+    return rule.name if rule is not None else None
+
+
+def casa_linear(rules, file_info: FileInfo):
+    """Referência: primeira regra da lista cujas condições valem, testadas uma a uma."""
+    name = os.path.basename(file_info.path_str)
+    folder = os.path.dirname(file_info.path_str)
+    for rule in rules:
+        extensions = rule.get('extensions')
+        if extensions is not None:
+            if file_info.extension not in {('.' + ext.lstrip('.')).lower() for ext in extensions}:
+                continue
+        if 'name_glob' in rule and not re.fullmatch(fnmatch.translate(rule['name_glob']), name, re.I | re.S):
+            continue
+        if 'name_regex' in rule and not re.fullmatch(rule['name_regex'], name, re.I | re.S):
+            continue
+        if 'path_glob' in rule and not re.fullmatch(fnmatch.translate(rule['path_glob']), folder, re.I | re.S):
+            continue
+        if file_info.size < rule.get('min_size', 0) or file_info.size > rule.get('max_size', file_info.size):
+            continue
+        age = NOW - file_info.mtime
+        if age < rule.get('older_than_days', 0) * DAY:
+            continue
+        if 'newer_than_days' in rule and age > rule['newer_than_days'] * DAY:
+            continue
+        return rule['name']
+    return None
+
+
+@pytest.mark.parametrize("order", [
+    ["extensao", "prefixo", "regex", "pasta"],
+    ["prefixo", "extensao", "regex", "pasta"],
+    ["regex", "pasta", "prefixo", "extensao"],
+    ["pasta", "regex", "extensao", "prefixo"],
+])
+def test_primeira_regra_da_lista_vence_entre_tipos(order):
+    # Cada regra cai num ramo diferente da árvore e todas casam com o arquivo
+    definitions = {
+        "extensao": {"extensions": ["pdf"]},
+        "prefixo": {"name_glob": "fatura_*"},
+        "regex": {"name_regex": r".*_\d{4}\.pdf"},
+        "pasta": {"path_glob": "*/financeiro"},
+    }
+    rules = RoutingRules([{"name": name, "destination": name, **definitions[name]} for name in order])
+
+    assert regra(rules, arquivo("/origem/financeiro/fatura_2024.pdf")) == order[0]
+
+
+def test_condicao_reprovada_segue_para_a_proxima_regra():
+    rules = RoutingRules([
+        {"name": "grandes", "name_glob": "video*", "min_size": 1000, "destination": "a"},
+        {"name": "antigos", "extensions": ["mp4"], "older_than_days": 30, "destination": "b"},
+        {"name": "solto", "name_glob": "*.mp4", "max_size": 500, "destination": "c"},
+        {"name": "resto", "destination": "d"},
+    ])
+
+    assert regra(rules, arquivo("/o/video.mp4", size=2000)) == "grandes"
+    assert regra(rules, arquivo("/o/video.mp4", size=800, age_days=60)) == "antigos"
+    assert regra(rules, arquivo("/o/video.mp4", size=100, age_days=1)) == "solto"
+    assert regra(rules, arquivo("/o/video.mp4", size=800, age_days=1)) == "resto"
+
+
+def test_sem_regra_aplicavel():
+    rules = RoutingRules([{"name": "pdf", "extensions": [".pdf"], "destination": "docs"}])
+
+    assert regra(rules, arquivo("/o/foto.jpg")) is None
+    assert regra(rules, arquivo("/o/sem_extensao")) is None
+
+
+def test_maiusculas_e_minusculas():
+    rules = RoutingRules([
+        {"name": "extensao", "extensions": ["PDF", ".Txt"], "destination": "a"},
+        {"name": "glob", "name_glob": "Relatorio*", "destination": "b"},
+        {"name": "regex", "name_regex": "NOTA.*", "destination": "c"},
+        {"name": "pasta", "path_glob": "*/Fotos", "destination": "d"},
+    ])
+
+    assert regra(rules, arquivo("/o/x.pdf")) == "extensao"
+    assert regra(rules, arquivo("/o/x.TXT")) == "extensao"
+    assert regra(rules, arquivo("/o/RELATORIO final.doc")) == "glob"
+    assert regra(rules, arquivo("/o/nota fiscal.doc")) == "regex"
+    assert regra(rules, arquivo("/o/fotos/praia.jpg")) == "pasta"
+
+
+def test_path_glob_casa_com_a_pasta_do_arquivo():
+    rules = RoutingRules([{"name": "nfe", "path_glob": "*/nfe", "destination": "fiscal"}])
+
+    assert regra(rules, arquivo("/origem/nfe/nota.xml")) == "nfe"
+    assert regra(rules, arquivo("/origem/nfe/2024/nota.xml")) is None
+
+
+@pytest.mark.parametrize("rule", [
+    {"name_glob": "*.pdf"},
+    {"destination": "/abs/pasta"},
+    {"destination": "../fora"},
+    {"destination": "docs/../../fora"},
+    {"destination": "{desconhecido}/x"},
+    {"destination": "x", "name_glob": "a*", "name_regex": "a.*"},
+    {"destination": "x", "name_regex": "(?P<grupo>a).*"},
+])
+def test_regra_invalida_e_rejeitada_pela_configuracao(rule):
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+
+    with pytest.raises(ValueError):
+        organizer.apply_config({"routing_rules": [rule]})
+    assert organizer.routing_rules is None
+
+
+def test_destino_da_regra_com_marcadores():
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+    organizer.apply_config({"routing_rules": [
+        {"name": "faturas", "name_glob": "fatura*", "destination": "financeiro/{ano}/{mes}/{extensao}"},
+        {"name": "resto", "extensions": ["jpg"], "destination": "{categoria}/arquivo"},
+    ]})
+    mtime = datetime.datetime(2023, 2, 10, 12, 0).timestamp()
+
+    fatura = FileInfo("/o/fatura_01.pdf", 10, mtime, mtime, ".pdf")
+    foto = FileInfo("/o/foto.jpg", 10, mtime, mtime, ".jpg")
+    other = FileInfo("/o/outro.pdf", 10, mtime, mtime, ".pdf")
+    assert organizer.get_organization_path(fatura, Path("/d")) == Path("/d/financeiro/2023/02/pdf")
+    assert organizer.get_organization_path(foto, Path("/d")) == Path("/d/imagens/arquivo")
+    assert organizer.get_organization_path(other, Path("/d")) == Path("/d/documentos/2023/02")
+
+
+def test_equivale_a_busca_linear():
+    rng = random.Random(34)
+    names = ["ab", "abc", "abd", "a", "b", "ba", "abx1", "nf-1-2", "xab", "ABc", "a.b", "aab", "fatura_01"]
+    folders = ["/o", "/o/nfe", "/o/Fotos/2024"]
+    extensions = [".pdf", ".txt", ".jpg", ""]
+
+    def random_rule(position):
+        rule = {"name": f"r{position}", "destination": f"d{position}"}
+        kind = rng.randrange(4)
+        if kind == 0:
+            rule["name_glob"] = rng.choice(["a*", "ab*", "*b*", "abc*", "a?c*", "x*", "*", "ab?*", "fat*_0?"])
+        elif kind == 1:
+            rule["name_regex"] = rng.choice(["ab.*", "abc?.*", "a+b.*", r"ab\w*", r"abx\d.*", "a.b.*",
+                                             "(ab|ba).*", "ab{1,2}.*", "a*b.*", r"nf-\d-\d.*"])
+        if rng.random() < 0.2:
+            rule["path_glob"] = rng.choice(["*/nfe", "*/fotos/*", "/o"])
+        if rng.random() < 0.4:
+            rule["extensions"] = rng.sample(["pdf", "TXT", ".jpg"], rng.randrange(1, 3))
+        if rng.random() < 0.3:
+            rule["min_size"] = rng.randrange(0, 20)
+        if rng.random() < 0.2:
+            rule["max_size"] = rng.randrange(5, 20)
+        if rng.random() < 0.2:
+            rule["older_than_days"] = rng.choice([1, 10])
+        if rng.random() < 0.2:
+            rule["newer_than_days"] = rng.choice([1, 10])
+        return rule
+
+    for _ in range(400):
+        rules = [random_rule(i) for i in range(rng.randrange(1, 9))]
+        compiled = RoutingRules(rules)
+        for name in names:
+            for extension in extensions:
+                for folder in folders:
+                    file_info = arquivo(f"{folder}/{name}{extension}", size=rng.randrange(20),
+                                        age_days=rng.choice([0, 5, 30]))
+                    assert regra(compiled, file_info) == casa_linear(rules, file_info), (rules, file_info.path_str)
@@ -0,0 +1,95 @@
+"""
+Testes do modo multiprocesso (``organize_files_sharded``).
+
+O resultado tem de ser o mesmo de ``organize_files``: mesma árvore final
+e mesmas estatísticas para cada política de duplicatas, inclusive com
+cópias do mesmo conteúdo em shards diferentes (reconciliadas no fim).
+"""
+
+import logging
+import os
+import re
+from collections import Counter
+
+import pytest
+
+from organizer import DUPLICATE_POLICIES, SmartFileOrganizer
+
+EXTENSIONS = [".txt", ".jpg", ".pdf", ""]
+NUMBERED = re.compile(r" \(\d+\)(?=\.[^.]*$|$)")
+
+
+def criar_origem(root) -> int:
+    # Um shard por subpasta de primeiro nível. Cópias de um conteúdo têm sempre o
+    # mesmo nome (qual delas fica não muda a árvore); "notas.txt" tem o mesmo nome
+    # com conteúdo diferente em cada shard (colisão de nomes no destino)
+    count = 0
+    for shard in range(4):
+        for k in range(9):
+            if (k + shard) % 3 == 0:
+                continue
+            folder = root / f"shard{shard}" / ("sub" if k % 2 else "")
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / f"arquivo{k}{EXTENSIONS[k % 4]}").write_bytes(b"conteudo %d" % k)
+            count += 1
+        (root / f"shard{shard}" / "notas.txt").write_bytes(b"notas do shard %d" % shard)
+        count += 1
+    (root / "arquivo1.jpg").write_bytes(b"conteudo 1")
+    return count + 1
+
+
+def retrato(root):
+    """Arquivos por (pasta, nome sem o sufixo de colisão, conteúdo, links) — independe da ordem."""
+    found = Counter()
+    for folder, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != ".organizador"]
+        for filename in filenames:
+            path = os.path.join(folder, filename)
+            with open(path, "rb") as f:
+                data = f.read()
+            found[(os.path.relpath(folder, root), NUMBERED.sub("", filename), data,
+                   os.stat(path).st_nlink)] += 1
+    return found
+
+
+def organizar(tmp_path, policy, sharded):
+    source = tmp_path / ("origem_shards" if sharded else "origem")
+    destination = tmp_path / ("destino_shards" if sharded else "destino")
+    criar_origem(source)
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+    organizer.duplicate_handling = policy
+    if sharded:
+        stats = organizer.organize_files_sharded(str(source), str(destination), processes=2)
+    else:
+        stats = organizer.organize_files(str(source), str(destination))
+    # O que ficou na origem, sem a pasta (qual cópia fica depende da ordem)
+    left = Counter()
+    for (_, name, data, nlink), count in retrato(source).items():
+        left[(name, data, nlink)] += count
+    return stats, retrato(destination), left
+
+
+@pytest.mark.parametrize("policy", DUPLICATE_POLICIES)
+def test_shards_equivalem_a_execucao_em_um_processo(tmp_path, policy):
+    stats, tree, left = organizar(tmp_path, policy, sharded=False)
+    sharded_stats, sharded_tree, sharded_left = organizar(tmp_path, policy, sharded=True)
+
+    assert sharded_tree == tree
+    assert sharded_left == left
+    for field in ("total_files", "organized_files", "duplicates_found", "errors", "skipped_files"):
+        assert getattr(sharded_stats, field) == getattr(stats, field), field
+    assert dict(sharded_stats.categories) == dict(stats.categories)
+    assert stats.errors == 0
+
+
+def test_duplicatas_entre_shards_sao_detectadas(tmp_path):
+    total = criar_origem(tmp_path / "contagem")
+    distinct = 9 + 4  # conteúdos "arquivo" + uma "notas.txt" por shard
+
+    stats, tree, left = organizar(tmp_path, "skip", sharded=True)
+
+    assert stats.total_files == total
+    assert stats.organized_files == distinct
+    assert stats.duplicates_found == total - distinct
+    assert sum(tree.values()) == distinct
+    assert sum(left.values()) == total - distinct
@@ -0,0 +1,110 @@
+"""
+Testes da detecção de tipo pelo conteúdo (``sniff_content_type``).
+"""
+
+import logging
+
+import pytest
+
+from organizer import (
+    EXTENSIONLESS_ONLY_TYPES,
+    MAGIC_SIGNATURES,
+    SNIFF_SIZE,
+    OrganizationMode,
+    SmartFileOrganizer,
+    sniff_content_type,
+)
+
+ZIP_HEADER = b"PK\x03\x04" + b"\x00" * 26
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"%PDF-1.7\n", ("application/pdf", "documentos")),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", ("image/png", "imagens")),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", ("image/jpeg", "imagens")),
+    (b"GIF89a\x01\x00", ("image/gif", "imagens")),
+    (b"RIFF\x00\x00\x00\x00WEBPVP8 ", ("image/webp", "imagens")),
+    (b"\x00\x00\x00\x18ftypheic\x00", ("image/heic", "imagens")),
+    (b"\x00\x00\x00\x18ftypisom\x00", ("video/mp4", "videos")),
+    (b"\x00\x00\x00\x18ftypM4A \x00", ("audio/mp4", "audios")),
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", ("audio/wav", "audios")),
+    (b"ID3\x04\x00", ("audio/mpeg", "audios")),
+    (ZIP_HEADER + b"mimetypeapplication/epub+zip", ("application/epub+zip", "ebooks")),
+    (ZIP_HEADER + b"[Content_Types].xml", ("application/vnd.openxmlformats", "documentos")),
+    (ZIP_HEADER + b"word/document.xml", ("application/zip", "compactados")),
+    (b"\x1f\x8b\x08\x00", ("application/gzip", "compactados")),
+    (b"\x00" * 257 + b"ustar\x0000", ("application/x-tar", "compactados")),
+    (b"\x7fELF\x02\x01\x01", ("application/x-executable", "executaveis")),
+    (b"  \n<?xml version='1.0'?>", ("application/xml", "codigo")),
+    (b"\n<!DOCTYPE HTML>", ("text/html", "codigo")),
+    (b"wOF2\x00\x01", ("font/woff", "fontes")),
+])
+def test_assinaturas(head, expected):
+    assert sniff_content_type(head) == expected
+    assert sniff_content_type(head, extensionless=False) == expected
+
+
+def test_assinatura_mais_especifica_vem_antes():
+    # As variantes de ZIP e de ``ftyp`` só funcionam se vierem antes da genérica
+    mime_types = [mime_type for _, mime_type, _ in MAGIC_SIGNATURES]
+    assert mime_types.index("application/epub+zip") < mime_types.index("application/zip")
+    assert mime_types.index("image/heic") < mime_types.index("video/mp4")
+    assert mime_types.index("audio/mp4") < mime_types.index("video/mp4")
+
+
+@pytest.mark.parametrize("head, mime_type", [
+    (b"MZ\x90\x00\x03\x00\x00\x00", "application/x-msdownload"),
+    (b"#!/bin/sh\necho oi\n", "text/x-script"),
+])
+def test_assinaturas_curtas_so_sem_extensao(head, mime_type):
+    assert mime_type in EXTENSIONLESS_ONLY_TYPES
+    assert sniff_content_type(head, extensionless=True)[0] == mime_type
+    # Com extensão desconhecida (um ".dat" que começa com "MZ") a assinatura não vale
+    assert sniff_content_type(head, extensionless=False) is None
+
+
+def test_texto_puro():
+    assert sniff_content_type("relatório de vendas\n".encode()) == ("text/plain", "documentos")
+    # O corte em SNIFF_SIZE pode partir um caractere multibyte no fim
+    head = ("a" * (SNIFF_SIZE - 1) + "é").encode()[:SNIFF_SIZE]
+    assert sniff_content_type(head) == ("text/plain", "documentos")
+
+
+@pytest.mark.parametrize("head", [
+    b"",
+    b"texto\x00com nulo",
+    b"\xff\xfe latin-1 invalido no meio" + b"a" * 10,
+    b"\x13\x37\xbe\xef" + b"\x01" * 8,
+])
+def test_conteudo_desconhecido(head):
+    assert sniff_content_type(head) is None
+
+
+def organizar(tmp_path, sniffing):
+    source = tmp_path / "origem"
+    source.mkdir(exist_ok=True)
+    (source / "foto_sem_extensao").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+    (source / "instalador").write_bytes(b"MZ\x90\x00" + b"\x00" * 64)
+    (source / "dados.xyz").write_bytes(b"MZ\x90\x00" + b"\x00" * 64)
+    (source / "leia-me.xyz").write_bytes("só texto".encode())
+    destination = tmp_path / ("com" if sniffing else "sem")
+
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"), report_sink=lambda report: None)
+    organizer.organization_mode = OrganizationMode.BY_TYPE_ONLY
+    organizer.content_sniffing = sniffing
+    stats = organizer.organize_files(str(source), str(destination))
+    assert stats.organized_files == 4
+    return {path.name: path.parent.name for path in destination.rglob("*") if path.is_file()}
+
+
+def test_organizacao_usa_o_tipo_detectado(tmp_path):
+    assert organizar(tmp_path, sniffing=True) == {
+        "foto_sem_extensao": "imagens",
+        "instalador": "executaveis",
+        "dados.xyz": "outros",
+        "leia-me.xyz": "documentos",
+    }
+
+
+def test_sem_deteccao_fica_em_outros(tmp_path):
+    assert set(organizar(tmp_path, sniffing=False).values()) == {"outros"}
@@ -0,0 +1,167 @@
+"""
+Testes dos limites de I/O (``TokenBucket`` e ``IOThrottle``).
+
+O relógio é simulado: ``time.sleep`` só avança ``time.monotonic``.
+"""
+
+import threading
+import time
+
+import pytest
+
+from organizer import HASH_CHUNK_SIZE, IOThrottle, TokenBucket
+
+
+class Relogio:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    clock = Relogio()
+    monkeypatch.setattr(time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(time, "sleep", clock.sleep)
+    return clock
+
+
+def test_rajada_inicial_nao_espera(relogio):
+    bucket = TokenBucket(100)
+
+    assert bucket.consume(60) == 0
+    assert bucket.consume(40) == 0
+    assert bucket.consume(50) == pytest.approx(0.5)
+
+
+def test_pedido_maior_que_a_rajada_paga_a_divida(relogio):
+    bucket = TokenBucket(100, burst=10)
+
+    # Não trava esperando um saldo que nunca chegaria: dorme o tempo da dívida
+    assert bucket.consume(1000) == pytest.approx(9.9)
+    assert bucket.consume(100) == pytest.approx(1.0)
+
+
+def test_taxa_media_respeitada(relogio):
+    bucket = TokenBucket(1000)
+    start = relogio.now
+
+    for _ in range(200):
+        bucket.consume(50)
+
+    # 10.000 fichas a 1.000/s, menos a rajada inicial de um segundo
+    assert relogio.now - start == pytest.approx(9.0)
+
+
+def test_saldo_nao_passa_da_capacidade(relogio):
+    bucket = TokenBucket(100)
+    relogio.now += 60  # um minuto ocioso não vira rajada de um minuto
+
+    assert bucket.consume(100) == 0
+    assert bucket.consume(100) == pytest.approx(1.0)
+
+
+def test_limites_de_banda_e_operacoes(relogio):
+    throttle = IOThrottle(bytes_per_second=1024 * 1024, operations_per_second=10)
+
+    for _ in range(20):
+        throttle.operation()
+    throttle.account(3 * 1024 * 1024, 0.01)
+
+    assert sum(relogio.slept) == pytest.approx(1.0 + 2.0)
+    assert throttle.chunk_size(8 * 1024 * 1024) == 1024 * 1024 // 10
+    assert IOThrottle(bytes_per_second=100).chunk_size(8 * 1024 * 1024) == 64 * 1024
+    assert IOThrottle().chunk_size(8 * 1024 * 1024) == 8 * 1024 * 1024
+
+
+def test_sem_modo_adaptativo_nada_muda(relogio):
+    throttle = IOThrottle(max_concurrency=4)
+
+    throttle.observe(10.0)
+
+    assert throttle.concurrency == 4 and throttle.latency == 0
+    with throttle.slot(), throttle.slot(), throttle.slot(), throttle.slot(), throttle.slot():
+        pass
+
+
+def lento(throttle, times=1):
+    for _ in range(times):
+        throttle.observe(1.0)
+
+
+def test_recuo_multiplicativo_uma_vez_por_intervalo(relogio):
+    throttle = IOThrottle(max_concurrency=16, latency_threshold=0.05)
+
+    lento(throttle, 20)
+    assert throttle.concurrency == 8  # a média ainda alta não derruba de novo no mesmo intervalo
+    assert throttle.backoffs == 1
+
+    relogio.now += IOThrottle.BACKOFF_INTERVAL
+    lento(throttle)
+    assert throttle.concurrency == 4
+
+    for _ in range(5):
+        relogio.now += IOThrottle.BACKOFF_INTERVAL
+        lento(throttle)
+    assert throttle.concurrency == 1  # nunca abaixo de um arquivo em andamento
+    assert throttle.backoffs == 4
+
+
+def test_subida_aditiva_ate_o_maximo(relogio):
+    throttle = IOThrottle(max_concurrency=4, latency_threshold=0.05)
+    lento(throttle)
+    assert throttle.concurrency == 2
+
+    # Latência baixa: a média cai abaixo do limite e a vaga volta aos poucos
+    observations = 0
+    while throttle.latency > throttle.latency_threshold:
+        throttle.observe(0.0)
+        observations += 1
+    assert 2 < throttle.concurrency < 2 + observations * 0.5 + 0.01
+
+    for _ in range(100):
+        throttle.observe(0.0)
+    assert throttle.concurrency == 4
+
+
+def test_latencia_medida_por_mib(relogio):
+    throttle = IOThrottle(latency_threshold=0.05)
+
+    # Um bloco de 8 MiB em 0,16 s são 0,02 s por MiB: abaixo do limite
+    throttle.account(8 * HASH_CHUNK_SIZE, 0.16)
+    assert throttle.latency == pytest.approx(IOThrottle.LATENCY_SMOOTHING * 0.02)
+    # Blocos pequenos contam como um MiB inteiro
+    throttle.account(4096, 0.01)
+    assert throttle.latency > IOThrottle.LATENCY_SMOOTHING * 0.02
+
+
+def test_vaga_espera_a_concorrencia_subir():
+    throttle = IOThrottle(max_concurrency=2, latency_threshold=0.05)
+    throttle.observe(1.0)
+    assert throttle.concurrency == 1
+
+    entered = threading.Event()
+
+    def second():
+        with throttle.slot():
+            entered.set()
+
+    with throttle.slot():
+        thread = threading.Thread(target=second)
+        thread.start()
+        # Só uma vaga: a segunda espera enquanto a primeira está ocupada...
+        assert not entered.wait(0.2)
+        while throttle.latency > throttle.latency_threshold:
+            throttle.observe(0.0)
+        for _ in range(2):
+            throttle.observe(0.0)
+        # ...até a concorrência voltar a 2
+        assert entered.wait(2)
+    thread.join()
@@ -0,0 +1,177 @@
+"""
+Testes do tempo limite por operação (``OperationWatchdog`` e ``StallQuarantine``).
+
+As operações presas são simuladas no backend: renomeações que só terminam
+quando o teste libera, ou que demoram mais que o tempo limite
+(``LatencyBackend``).
+"""
+
+import logging
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+from organizer import (
+    STUCK_EXIT_CODE,
+    ContentIndex,
+    DestinationCatalog,
+    LatencyBackend,
+    LocalBackend,
+    MemoryBackend,
+    SmartFileOrganizer,
+    StallQuarantine,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class GateBackend(MemoryBackend):
+    """Renomear um arquivo cujo nome começa com ``preso`` espera ``release`` (ou falha após ``fail_after``)."""
+
+    def __init__(self, fail_after=None):
+        super().__init__()
+        self.release = threading.Event()
+        self.fail_after = fail_after
+        self.stuck_calls = 0
+
+    def rename(self, source, target):
+        if Path(source).name.startswith("preso"):
+            self.stuck_calls += 1
+            if self.fail_after is not None and self.stuck_calls == 1:
+                time.sleep(self.fail_after)
+                raise OSError("falha depois de travar")
+            self.release.wait()
+        super().rename(source, target)
+
+
+def criar_organizador(backend, output_dir, timeout=0.3, workers=2):
+    organizer = SmartFileOrganizer(logger=logging.getLogger("testes"),
+                                   output_dir=str(output_dir), backend=backend)
+    organizer.timeout_seconds = timeout
+    organizer.max_workers = workers
+    # Um lote por pasta: o resto do lote do arquivo preso precisa ser redistribuído
+    organizer.locality = "destination"
+    return organizer
+
+
+def esperar_presas(organizer, limit=10.0):
+    deadline = time.monotonic() + limit
+    while organizer.stuck_operations() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert organizer.stuck_operations() == 0
+
+
+def test_operacao_presa_vai_para_quarentena(tmp_path):
+    backend = GateBackend()
+    for i in range(10):
+        backend.add_file(f"/origem/arquivo{i}.txt", b"conteudo %d" % i)
+    backend.add_file("/origem/preso.txt", b"nunca termina")
+    organizer = criar_organizador(backend, tmp_path)
+
+    start = time.monotonic()
+    try:
+        stats = organizer.organize_files("/origem", "/destino")
+        elapsed = time.monotonic() - start
+        assert organizer.stuck_operations() == 1
+    finally:
+        backend.release.set()
+    esperar_presas(organizer)
+
+    assert elapsed < 5
+    assert stats.organized_files == 10
+    assert stats.errors == 1
+    assert stats.stalled_files == ["/origem/preso.txt"]
+
+
+def test_operacao_presa_que_falha_e_tentada_de_novo(tmp_path, monkeypatch):
+    monkeypatch.setattr(StallQuarantine, "RETRY_BACKOFF", 0.1)
+    backend = GateBackend(fail_after=0.6)
+    backend.release.set()  # a segunda tentativa não trava
+    for i in range(5):
+        backend.add_file(f"/origem/arquivo{i}.txt", b"conteudo %d" % i)
+    backend.add_file("/origem/preso.txt", b"trava uma vez")
+    organizer = criar_organizador(backend, tmp_path)
+
+    stats = organizer.organize_files("/origem", "/destino")
+
+    assert stats.organized_files == 6
+    assert stats.errors == 0
+    assert stats.retried_files == 1
+    assert stats.stalled_files == []
+    assert backend.stuck_calls == 2
+
+
+def test_operacao_atrasada_nao_toca_indice_nem_catalogo(tmp_path, caplog):
+    source = tmp_path / "origem"
+    source.mkdir()
+    for i in range(3):
+        (source / f"arquivo{i}.txt").write_bytes(b"x" * (10 + i))
+    destination = tmp_path / "destino"
+    # Todas as renomeações demoram mais que o tempo limite: a execução termina antes delas
+    backend = LatencyBackend(LocalBackend(), operation_latency={"rename": 1.5})
+    organizer = criar_organizador(backend, tmp_path / "saida", workers=4)
+    organizer.content_index = True
+    organizer.catalog_enabled = True
+
+    with caplog.at_level(logging.WARNING):
+        stats = organizer.organize_files(str(source), str(destination))
+        assert organizer.stuck_operations() == 3
+        esperar_presas(organizer)
+
+    assert stats.organized_files == 0
+    assert len(stats.stalled_files) == 3
+    # As renomeações concluíram depois do fim da execução...
+    assert len(list(destination.rglob("*.txt"))) == 3
+    # ...sem entrar no índice nem reabrir o catálogo
+    index = organizer.get_content_index(destination)
+    assert not any(index.has_size(10 + i) for i in range(3))
+    index_file = destination / ContentIndex.INDEX_DIR / ContentIndex.INDEX_FILE
+    assert not index_file.exists() or b"arquivo" not in index_file.read_bytes()
+    assert organizer._catalogs == {}
+    catalog_file = destination / ContentIndex.INDEX_DIR / DestinationCatalog.CATALOG_FILE
+    if catalog_file.exists():
+        connection = sqlite3.connect(catalog_file)
+        try:
+            assert connection.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+        finally:
+            connection.close()
+    assert caplog.text.count("terminou depois do fim da execução") == 3
+
+
+def test_cli_sai_com_codigo_3_se_sobrar_operacao_presa(tmp_path):
+    source = tmp_path / "origem"
+    source.mkdir()
+    (source / "normal.txt").write_bytes(b"normal")
+    (source / "preso.txt").write_bytes(b"preso")
+    script = textwrap.dedent(f"""
+        import os, sys, threading
+        sys.path.insert(0, {str(ROOT)!r})
+        import atexit
+        import organizer
+
+        rename = organizer.LocalBackend.rename
+        def stuck_rename(self, source, target):
+            if os.fspath(source).endswith("preso.txt"):
+                threading.Event().wait()
+            rename(self, source, target)
+        organizer.LocalBackend.rename = stuck_rename
+        atexit.register(lambda: print("atexit rodou"))
+        sys.argv = ["organizer.py", "--cli", "--source", {str(source)!r},
+                    "--dest", {str(tmp_path / "destino")!r}, "--timeout", "0.3"]
+        organizer.main()
+        print("main retornou")
+    """)
+
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path,
+                            capture_output=True, text=True, timeout=60)
+
+    assert result.returncode == STUCK_EXIT_CODE, result.stdout + result.stderr
+    assert "ainda presa" in result.stdout
+    assert "main retornou" not in result.stdout
+    assert "atexit rodou" not in result.stdout
+    assert (source / "preso.txt").exists()
+    assert not (source / "normal.txt").exists()